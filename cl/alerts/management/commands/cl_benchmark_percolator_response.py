@@ -0,0 +1,140 @@
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from elasticsearch_dsl.response import Hit
+
+from cl.alerts.models import Alert
+from cl.alerts.tasks import process_percolator_response
+from cl.lib.command_utils import VerboseCommand, logger
+from cl.search.models import SEARCH_TYPES
+from cl.users.models import UserProfile
+
+
+def make_alerts_triggered(
+    alerts_count: int, rate: str, highlight: bool
+) -> list[Hit]:
+    """Create the users, profiles and alerts triggered by a document, and
+    build the percolator hits for them.
+
+    The objects are created in bulk so that no signal sends the alerts to the
+    percolator index, since process_percolator_response only needs the hit
+    IDs and highlights.
+
+    :param alerts_count: The number of alerts to create.
+    :param rate: The rate of the alerts.
+    :param highlight: True to add highlights to the hits.
+    :return: A list of the percolator hits.
+    """
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"percolator-benchmark-{alerts_count}-{i}",
+                email=f"percolator-benchmark-{alerts_count}-{i}@example.com",
+            )
+            for i in range(alerts_count)
+        ]
+    )
+    UserProfile.objects.bulk_create(
+        [UserProfile(user=user, email_confirmed=True) for user in users]
+    )
+    alerts = Alert.objects.bulk_create(
+        [
+            Alert(
+                user=user,
+                name="Percolator Benchmark",
+                query=f"q=Benchmark&type={SEARCH_TYPES.ORAL_ARGUMENT}",
+                rate=rate,
+            )
+            for user in users
+        ]
+    )
+    hits = []
+    for alert in alerts:
+        hit = {"_id": str(alert.pk), "_index": "oral_arguments_percolator"}
+        if highlight:
+            hit["highlight"] = {"caseName": ["<mark>Benchmark</mark> v. Test"]}
+        hits.append(Hit(hit))
+    return hits
+
+
+class Command(VerboseCommand):
+    help = (
+        "Benchmark process_percolator_response with a growing number of "
+        "alerts triggered by a single document. All the objects created are "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--alerts",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000],
+            help="The numbers of alerts triggered to benchmark.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="The number of times to process each percolator response.",
+        )
+        parser.add_argument(
+            "--rate",
+            choices=[Alert.DAILY, Alert.WEEKLY, Alert.MONTHLY],
+            default=Alert.DAILY,
+            help="The rate of the alerts. Real time alerts aren't supported "
+            "since they would send emails.",
+        )
+        parser.add_argument(
+            "--highlight",
+            action="store_true",
+            default=False,
+            help="Add highlights to the percolator hits.",
+        )
+
+    def handle(self, *args, **options):
+        super().handle(*args, **options)
+        document_content = {
+            "caseName": "Benchmark v. Test",
+            "docketNumber": "21-5740",
+            "judge": "",
+            "snippet": "",
+        }
+        with transaction.atomic():
+            for alerts_count in options["alerts"]:
+                alerts_triggered = make_alerts_triggered(
+                    alerts_count, options["rate"], options["highlight"]
+                )
+                elapsed = 0.0
+                for _ in range(options["iterations"]):
+                    # Roll back the hits created by each iteration, so none of
+                    # them reaches the scheduled hits limit.
+                    with transaction.atomic():
+                        with CaptureQueriesContext(connection) as ctx:
+                            start = time.perf_counter()
+                            process_percolator_response(
+                                (alerts_triggered, document_content)
+                            )
+                            elapsed += time.perf_counter() - start
+                        transaction.set_rollback(True)
+                self.report(
+                    alerts_count,
+                    options["iterations"],
+                    elapsed,
+                    len(ctx.captured_queries),
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def report(
+        alerts_count: int, iterations: int, elapsed: float, queries: int
+    ) -> None:
+        logger.info(
+            "%s alerts: %.2fms per response, %.3fms per alert, %s queries",
+            alerts_count,
+            elapsed / iterations * 1000,
+            elapsed / iterations / alerts_count * 1000,
+            queries,
+        )
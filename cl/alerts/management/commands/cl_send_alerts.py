@@ -1,20 +1,24 @@
 import datetime
+import time
 import traceback
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
 
 import waffle
 from asgiref.sync import async_to_sync
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.mail import EmailMultiAlternatives
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.http import QueryDict
 from django.template import loader
 from django.utils.timezone import now
+from requests.adapters import HTTPAdapter
 
 from cl.alerts.models import Alert, RealTimeQueue
 from cl.alerts.utils import InvalidDateError
-from cl.api.models import WebhookEventType
+from cl.api.models import Webhook, WebhookEventType
 from cl.api.webhooks import send_search_alert_webhook
 from cl.lib import search_utils
 from cl.lib.command_utils import VerboseCommand, logger
@@ -28,6 +32,10 @@ from cl.stats.utils import tally_stat
 # handled in the next run of this script.
 MAX_RT_ITEM_QUERY = 1000
 
+# The number of users whose alert queries are submitted to the worker pool
+# together before their emails and webhooks are sent.
+USERS_PER_BATCH = 100
+
 
 def get_cut_off_date(rate, d=datetime.date.today()):
     """Given a rate of dly, wly or mly and a date, returns the date after which
@@ -105,10 +113,19 @@ class Command(VerboseCommand):
             choices=Alert.ALL_FREQUENCIES,
             help=f"The rate to send emails ({', '.join(Alert.ALL_FREQUENCIES)})",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="The number of threads used to run the alert queries "
+            "concurrently. By default, queries are run one after another.",
+        )
 
     def handle(self, *args, **options):
         super().handle(*args, **options)
         self.options = options
+        if options["workers"] > 1:
+            self.mount_connection_pools(options["workers"])
         if options["rate"] == Alert.REAL_TIME:
             self.remove_stale_rt_items()
             self.valid_ids = self.get_new_ids()
@@ -117,9 +134,26 @@ class Command(VerboseCommand):
         if options["rate"] == Alert.REAL_TIME:
             self.clean_rt_queue()
 
-    def run_query(self, alert, rate):
-        results = []
-        cd = {}
+    def mount_connection_pools(self, pool_size):
+        """Mount HTTP adapters on the Solr sessions so that each worker thread
+        reuses a pooled connection instead of waiting for a free one.
+
+        :param pool_size: The maximum number of connections to keep per host.
+        :return: None
+        """
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        for si in self.sis.values():
+            si.conn.http_connection.mount("http://", adapter)
+            si.conn.http_connection.mount("https://", adapter)
+
+    def build_query(self, alert, rate):
+        """Build the Solr params to run an alert query.
+
+        :param alert: The Alert to run.
+        :param rate: The rate of the alerts being sent.
+        :return: A three tuple, the QueryDict of the alert, the query type and
+        the Solr params to run, or None if the query can't return any results.
+        """
         logger.info(f"Now running the query: {alert.query}\n")
 
         # Make a dict from the query string.
@@ -139,108 +173,204 @@ class Command(VerboseCommand):
             if waffle.switch_is_active("oa-es-alerts-active"):
                 # Return empty results for OA alerts. They are now handled
                 # by Elasticsearch.
-                return query_type, results
+                return qd, query_type, None
 
         logger.info(f"Data sent to SearchForm is: {qd}\n")
         search_form = SearchForm(qd)
-        if search_form.is_valid():
-            cd = search_form.cleaned_data
+        if not search_form.is_valid():
+            return qd, query_type, None
+
+        cd = search_form.cleaned_data
+        if rate == Alert.REAL_TIME and len(self.valid_ids[query_type]) == 0:
+            # Bail out. No results will be found if no valid_ids.
+            return qd, query_type, None
+
+        main_params = search_utils.build_main_query(
+            cd,
+            highlight="text",  # Required to show all field as in Search API
+            facet=False,
+        )
+        main_params.update(
+            {
+                "rows": "20",
+                "start": "0",
+                "hl.tag.pre": "<em><strong>",
+                "hl.tag.post": "</strong></em>",
+                "caller": f"cl_send_alerts:{query_type}",
+            }
+        )
 
-            if (
-                rate == Alert.REAL_TIME
-                and len(self.valid_ids[query_type]) == 0
-            ):
-                # Bail out. No results will be found if no valid_ids.
-                return query_type, results
+        if rate == Alert.REAL_TIME:
+            main_params["fq"].append(
+                f"id:({' OR '.join([str(i) for i in self.valid_ids[query_type]])})"
+            )
+        return qd, query_type, main_params
+
+    def execute_query(self, query_type, main_params):
+        """Run the Solr params of an alert query.
 
-            main_params = search_utils.build_main_query(
-                cd,
-                highlight="text",  # Required to show all field as in Search API
-                facet=False,
+        This is called from the worker threads, so it must not touch the DB.
+
+        :param query_type: The search type of the query.
+        :param main_params: The Solr params built by build_query.
+        :return: A two tuple, the Solr results and the seconds the query took.
+        """
+        start_time = time.perf_counter()
+        # Ignore warnings from this bit of code. Otherwise, it complains
+        # about the query URL being too long and having to POST it instead
+        # of being able to GET it.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = (
+                self.sis[query_type].query().add_extra(**main_params).execute()
             )
-            main_params.update(
-                {
-                    "rows": "20",
-                    "start": "0",
-                    "hl.tag.pre": "<em><strong>",
-                    "hl.tag.post": "</strong></em>",
-                    "caller": f"cl_send_alerts:{query_type}",
-                }
+        regroup_snippets(results)
+        return results, time.perf_counter() - start_time
+
+    def submit_user_queries(self, executor, user, rate):
+        """Build the alert queries of a user and submit them to the worker
+        pool.
+
+        :param executor: The ThreadPoolExecutor that runs the queries.
+        :param user: The User whose alerts to run.
+        :param rate: The rate of the alerts being sent.
+        :return: A list of three tuples, the alert, its QueryDict and the
+        Future of its query.
+        """
+        logger.info(f"Running alerts for user '{user}': {user.rate_alerts}")
+        user_queries = []
+        for alert in user.rate_alerts:
+            try:
+                qd, query_type, main_params = self.build_query(alert, rate)
+            except:
+                traceback.print_exc()
+                logger.info(f"Search for this alert failed: {alert.query}\n")
+                continue
+            if main_params is None:
+                continue
+            future = executor.submit(
+                self.execute_query, query_type, main_params
             )
+            user_queries.append((alert, qd, future))
+        return user_queries
 
-            if rate == Alert.REAL_TIME:
-                main_params["fq"].append(
-                    f"id:({' OR '.join([str(i) for i in self.valid_ids[query_type]])})"
-                )
+    def collect_user_hits(self, user, user_queries):
+        """Wait for the alert queries of a user and send a webhook event for
+        every alert with hits.
 
-            # Ignore warnings from this bit of code. Otherwise, it complains
-            # about the query URL being too long and having to POST it instead
-            # of being able to GET it.
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                results = (
-                    self.sis[query_type]
-                    .query()
-                    .add_extra(**main_params)
-                    .execute()
-                )
-            regroup_snippets(results)
+        The alerts with hits get their query_run, date_last_hit and
+        date_modified updated, but they're not saved, so they can be updated
+        in bulk.
 
-        logger.info(f"There were {len(results)} results.")
-        return qd, results
+        :param user: The User whose alerts were run.
+        :param user_queries: The list returned by submit_user_queries.
+        :return: A two tuple, the user hits and the list of the seconds each
+        query took.
+        """
+        hits = []
+        query_times = []
+        for alert, qd, future in user_queries:
+            try:
+                results, query_time = future.result()
+            except:
+                traceback.print_exc()
+                logger.info(f"Search for this alert failed: {alert.query}\n")
+                continue
+            query_times.append(query_time)
+            logger.info(f"There were {len(results)} results.")
+
+            # hits is a multi-dimensional array. It consists of alerts,
+            # paired with a list of document dicts, of the form:
+            # [[alert1, [{hit1}, {hit2}, {hit3}]], [alert2, ...]]
+            if len(results) > 0:
+                search_type = qd.get("type", SEARCH_TYPES.OPINION)
+                hits.append([alert, search_type, results])
+                alert.query_run = qd.urlencode()
+                alert.date_last_hit = now()
+                # bulk_update doesn't set auto_now fields.
+                alert.date_modified = alert.date_last_hit
+
+                # Send webhook event if the user has a SEARCH_ALERT
+                # endpoint enabled.
+                for user_webhook in user.search_alert_webhooks:
+                    send_search_alert_webhook(
+                        self.sis[search_type], results, user_webhook, alert
+                    )
+        return hits, query_times
 
     def send_emails_and_webhooks(self, rate):
         """Send out an email and webhook events to every user whose alert has a
         new hit for a rate.
+
+        Alert queries are run on a pool of worker threads, a batch of users at
+        a time, while emails and webhooks are sent from the main thread.
         """
-        users = User.objects.filter(alerts__rate=rate).distinct()
+        start_time = time.perf_counter()
+        users = (
+            User.objects.filter(alerts__rate=rate)
+            .distinct()
+            .select_related("profile")
+            .prefetch_related(
+                Prefetch(
+                    "alerts",
+                    queryset=Alert.objects.filter(rate=rate),
+                    to_attr="rate_alerts",
+                ),
+                Prefetch(
+                    "webhooks",
+                    queryset=Webhook.objects.filter(
+                        event_type=WebhookEventType.SEARCH_ALERT, enabled=True
+                    ),
+                    to_attr="search_alert_webhooks",
+                ),
+            )
+        )
 
         alerts_sent_count = 0
-        for user in users:
-            alerts = user.alerts.filter(rate=rate)
-            logger.info(f"Running alerts for user '{user}': {alerts}")
-
-            if rate == Alert.REAL_TIME:
-                if not user.profile.is_member:
-                    continue
+        queries_run = 0
+        queries_time = 0.0
+        with ThreadPoolExecutor(
+            max_workers=self.options.get("workers", 1)
+        ) as executor:
+            for users_batch in batched(
+                users.iterator(chunk_size=USERS_PER_BATCH), USERS_PER_BATCH
+            ):
+                if rate == Alert.REAL_TIME:
+                    users_batch = [
+                        user for user in users_batch if user.profile.is_member
+                    ]
+                users_queries = [
+                    (user, self.submit_user_queries(executor, user, rate))
+                    for user in users_batch
+                ]
 
-            hits = []
-            for alert in alerts:
+                alerts_to_update = []
                 try:
-                    qd, results = self.run_query(alert, rate)
-                except:
-                    traceback.print_exc()
-                    logger.info(
-                        f"Search for this alert failed: {alert.query}\n"
-                    )
-                    continue
-
-                # hits is a multi-dimensional array. It consists of alerts,
-                # paired with a list of document dicts, of the form:
-                # [[alert1, [{hit1}, {hit2}, {hit3}]], [alert2, ...]]
-                if len(results) > 0:
-                    search_type = qd.get("type", SEARCH_TYPES.OPINION)
-                    hits.append([alert, search_type, results])
-                    alert.query_run = qd.urlencode()
-                    alert.date_last_hit = now()
-                    alert.save()
-
-                    # Send webhook event if the user has a SEARCH_ALERT
-                    # endpoint enabled.
-                    user_webhooks = user.webhooks.filter(
-                        event_type=WebhookEventType.SEARCH_ALERT, enabled=True
-                    )
-                    for user_webhook in user_webhooks:
-                        send_search_alert_webhook(
-                            self.sis[search_type], results, user_webhook, alert
+                    for user, user_queries in users_queries:
+                        hits, query_times = self.collect_user_hits(
+                            user, user_queries
                         )
-
-            if len(hits) > 0:
-                alerts_sent_count += 1
-                send_alert(user.profile, hits)
+                        queries_run += len(query_times)
+                        queries_time += sum(query_times)
+                        alerts_to_update.extend(alert for alert, _, _ in hits)
+                        if len(hits) > 0:
+                            alerts_sent_count += 1
+                            send_alert(user.profile, hits)
+                finally:
+                    Alert.objects.bulk_update(
+                        alerts_to_update,
+                        ["query_run", "date_last_hit", "date_modified"],
+                    )
 
         async_to_sync(tally_stat)(f"alerts.sent.{rate}", inc=alerts_sent_count)
         logger.info(f"Sent {alerts_sent_count} {rate} email alerts.")
+        elapsed = time.perf_counter() - start_time
+        avg_query_time = queries_time / queries_run if queries_run else 0
+        logger.info(
+            f"Ran {queries_run} {rate} alert queries in {elapsed:.2f}s, "
+            f"average query time: {avg_query_time:.3f}s, total query time: "
+            f"{queries_time:.2f}s."
+        )
 
     def clean_rt_queue(self):
         """Clean out any items in the RealTime queue once they've been run or
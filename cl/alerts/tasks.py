@@ -1,4 +1,5 @@
 import copy
+import pickle
 from dataclasses import dataclass
 from datetime import datetime
 from importlib import import_module
@@ -10,17 +11,20 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
 from django.db import transaction
+from django.db.models import Prefetch
 from django.template import loader
 from django.utils.timezone import now
 from elasticsearch.exceptions import ConnectionError
 
 from cl.alerts.models import Alert, DocketAlert, ScheduledAlertHit
 from cl.alerts.utils import (
-    alert_hits_limit_reached,
+    alerts_hits_limit_reached,
     override_alert_query,
     percolate_document,
+    percolate_documents,
+    split_percolator_hits_by_document,
 )
-from cl.api.models import WebhookEventType
+from cl.api.models import Webhook, WebhookEventType
 from cl.api.tasks import (
     send_docket_alert_webhook_events,
     send_es_search_alert_webhook,
@@ -33,7 +37,11 @@ from cl.lib.elasticsearch_utils import (
     fetch_all_search_results,
     merge_highlights_into_result,
 )
-from cl.lib.redis_utils import create_redis_semaphore, delete_redis_semaphore
+from cl.lib.redis_utils import (
+    create_redis_semaphore,
+    delete_redis_semaphore,
+    make_redis_interface,
+)
 from cl.lib.string_utils import trunc
 from cl.recap.constants import COURT_TIMEZONES
 from cl.search.models import Docket, DocketEntry
@@ -437,20 +445,27 @@ def send_recap_email_user_not_found(recap_email_recipients: list[str]) -> None:
 
 
 def send_webhook_alert_hits(
-    alert_user: UserProfile.user, hits: list[SearchAlertHitType]
+    alert_user: UserProfile.user,
+    hits: list[SearchAlertHitType],
+    user_webhooks: list[Webhook] | None = None,
 ) -> None:
     """Send webhook alerts for search hits.
 
     :param alert_user: The user profile object associated with the webhooks.
     :param hits: A list of tuples, each containing information about an alert,
     its associated search type, documents found, and the number of documents.
+    :param user_webhooks: Optional, the user's enabled search alert webhooks
+    if they were already fetched. Otherwise, they're queried.
     :return: None
     """
 
-    for alert, search_type, documents, num_docs in hits:
-        user_webhooks = alert_user.webhooks.filter(
-            event_type=WebhookEventType.SEARCH_ALERT, enabled=True
+    if user_webhooks is None:
+        user_webhooks = list(
+            alert_user.webhooks.filter(
+                event_type=WebhookEventType.SEARCH_ALERT, enabled=True
+            )
         )
+    for alert, search_type, documents, num_docs in hits:
         for user_webhook in user_webhooks:
             send_es_search_alert_webhook.delay(
                 documents,
@@ -515,23 +530,45 @@ def process_percolator_response(response: PercolatorResponseType) -> None:
     email_alerts_to_send = []
     rt_alerts_to_send = []
     alerts_triggered, document_content = response
-    for hit in alerts_triggered:
-        # Create a deep copy of the original 'document_content' to allow
-        # independent highlighting for each alert triggered.
-        document_content_copy = copy.deepcopy(document_content)
-
-        alert_triggered = (
-            Alert.objects.filter(pk=hit.meta.id).select_related("user").first()
+    # Fetch all the alerts triggered along with their users, profiles and
+    # search alert webhooks at once.
+    alerts = (
+        Alert.objects.filter(pk__in=[hit.meta.id for hit in alerts_triggered])
+        .select_related("user__profile")
+        .prefetch_related(
+            Prefetch(
+                "user__webhooks",
+                queryset=Webhook.objects.filter(
+                    event_type=WebhookEventType.SEARCH_ALERT, enabled=True
+                ),
+                to_attr="search_alert_webhooks",
+            )
         )
+    )
+    alerts_by_id = {str(alert.pk): alert for alert in alerts}
+    # Check the hits limit for all the scheduled alerts in a single query.
+    alerts_limit_reached = alerts_hits_limit_reached(
+        [
+            alert
+            for alert in alerts_by_id.values()
+            if alert.rate != Alert.REAL_TIME
+        ]
+    )
+    for hit in alerts_triggered:
+        alert_triggered = alerts_by_id.get(str(hit.meta.id))
         if not alert_triggered:
             continue
 
         alert_user: UserProfile.user = alert_triggered.user
+        document_content_alert = document_content
         # Set highlight if available in response.
         if hasattr(hit.meta, "highlight"):
+            # Create a deep copy of the original 'document_content' to allow
+            # independent highlighting for each alert triggered.
+            document_content_alert = copy.deepcopy(document_content)
             merge_highlights_into_result(
                 hit.meta.highlight.to_dict(),
-                document_content_copy,
+                document_content_alert,
             )
 
         # Override order_by to show the latest items when clicking the
@@ -544,13 +581,15 @@ def process_percolator_response(response: PercolatorResponseType) -> None:
             (
                 alert_triggered,
                 alert_triggered.alert_type,
-                [document_content_copy],
+                [document_content_alert],
                 1,
             )
         ]
         # Send real time Webhooks for all users regardless of alert rate and
         # user's donations.
-        send_webhook_alert_hits(alert_user, hits)
+        send_webhook_alert_hits(
+            alert_user, hits, alert_user.search_alert_webhooks
+        )
 
         # Send RT Alerts
         if alert_triggered.rate == Alert.REAL_TIME:
@@ -563,9 +602,7 @@ def process_percolator_response(response: PercolatorResponseType) -> None:
 
         else:
             # Schedule DAILY, WEEKLY and MONTHLY Alerts
-            if alert_hits_limit_reached(
-                alert_triggered.pk, alert_triggered.user.pk
-            ):
+            if alert_triggered.pk in alerts_limit_reached:
                 # Skip storing hits for this alert-user combination because
                 # the SCHEDULED_ALERT_HITS_LIMIT has been reached.
                 continue
@@ -573,7 +610,7 @@ def process_percolator_response(response: PercolatorResponseType) -> None:
                 ScheduledAlertHit(
                     user=alert_triggered.user,
                     alert=alert_triggered,
-                    document_content=document_content_copy,
+                    document_content=document_content_alert,
                 )
             )
 
@@ -649,6 +686,96 @@ def send_or_schedule_alerts(
     return alerts_triggered, document_content
 
 
+def make_percolator_buffer_key(document_index: str) -> str:
+    return f"alert.percolator.buffer:{document_index}"
+
+
+@app.task(ignore_result=True)
+def buffer_document_for_percolation(
+    response: SaveDocumentResponseType, document_index: str
+) -> None:
+    """Add a newly indexed document to the percolation buffer of its index
+    and schedule the buffer to be percolated, unless it's already scheduled.
+
+    :param response: A two tuple, the document ID to be percolated in
+    ES index and the document data that triggered the alert.
+    :param document_index: The ES document index where the document lives.
+    :return: None
+    """
+
+    if not response:
+        return None
+
+    buffer_key = make_percolator_buffer_key(document_index)
+    window = settings.ELASTICSEARCH_PERCOLATOR_BATCH_WINDOW
+    r = make_redis_interface("CACHE", decode_responses=False)
+    pipe = r.pipeline()
+    pipe.rpush(buffer_key, pickle.dumps(response))
+    pipe.expire(buffer_key, 60 * 60)
+    pipe.execute()
+    # The semaphore expires in case the scheduled task is lost, so that a new
+    # one can be scheduled.
+    if create_redis_semaphore(
+        "CACHE", f"{buffer_key}:scheduled", ttl=window + 60 * 5
+    ):
+        percolate_buffered_documents.apply_async(
+            args=(document_index,), countdown=window
+        )
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(ConnectionError,),
+    max_retries=3,
+    interval_start=5,
+    ignore_result=True,
+)
+def percolate_buffered_documents(self: Task, document_index: str) -> None:
+    """Percolate the documents buffered for an index using multi-document
+    percolator requests, and process the alerts triggered by each document.
+
+    :param self: The celery task
+    :param document_index: The ES document index where the documents live.
+    :return: None
+    """
+
+    buffer_key = make_percolator_buffer_key(document_index)
+    # Allow new documents to schedule the next batch.
+    delete_redis_semaphore("CACHE", f"{buffer_key}:scheduled")
+    r = make_redis_interface("CACHE", decode_responses=False)
+    batch_size = settings.ELASTICSEARCH_PERCOLATOR_BATCH_SIZE
+    while True:
+        pipe = r.pipeline()
+        pipe.lrange(buffer_key, 0, batch_size - 1)
+        pipe.ltrim(buffer_key, batch_size, -1)
+        items, _ = pipe.execute()
+        if not items:
+            break
+
+        documents: list[SaveDocumentResponseType] = [
+            pickle.loads(item) for item in items
+        ]
+        documents_content = [content for _, content in documents]
+        try:
+            percolator_response = percolate_documents(documents_content)
+            alerts_triggered = fetch_all_search_results(
+                percolate_documents, percolator_response, documents_content
+            )
+        except ConnectionError:
+            # Put the documents back in the buffer before retrying.
+            r.rpush(buffer_key, *items)
+            raise
+
+        hits_by_document = split_percolator_hits_by_document(
+            alerts_triggered, len(documents)
+        )
+        for document_content, document_hits in zip(
+            documents_content, hits_by_document
+        ):
+            if document_hits:
+                process_percolator_response((document_hits, document_content))
+
+
 # New task
 @app.task(
     bind=True,
@@ -11,10 +11,13 @@ from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.core import mail
 from django.core.management import call_command
+from django.db import connection
 from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.timezone import now
+from elasticsearch.exceptions import ConnectionError
 from lxml import html
 from rest_framework.status import (
     HTTP_200_OK,
@@ -44,9 +47,17 @@ from cl.alerts.models import (
 )
 from cl.alerts.tasks import (
     get_docket_notes_and_tags_by_user,
+    make_percolator_buffer_key,
+    percolate_buffered_documents,
+    process_percolator_response,
     send_alert_and_webhook,
 )
-from cl.alerts.utils import InvalidDateError, percolate_document
+from cl.alerts.utils import (
+    InvalidDateError,
+    percolate_document,
+    percolate_documents,
+    split_percolator_hits_by_document,
+)
 from cl.api.factories import WebhookFactory
 from cl.api.models import (
     WEBHOOK_EVENT_STATUS,
@@ -59,6 +70,8 @@ from cl.audio.models import Audio
 from cl.donate.factories import DonationFactory
 from cl.donate.models import Donation, NeonMembership
 from cl.favorites.factories import NoteFactory, UserTagFactory
+from cl.lib.elasticsearch_utils import fetch_all_search_results
+from cl.lib.redis_utils import make_redis_interface
 from cl.lib.test_helpers import EmptySolrTestCase, SimpleUserDataMixin
 from cl.search.documents import AudioDocument, AudioPercolator
 from cl.search.factories import (
@@ -708,6 +721,31 @@ class SearchAlertsWebhooksTest(ESIndexTestCase, EmptySolrTestCase):
                 alert_data_compare["result"].case_name,
             )
 
+    def test_send_search_alerts_with_workers(self):
+        """Can we run the alert queries on a pool of workers and update the
+        alerts with hits in bulk?
+        """
+        with mock.patch(
+            "cl.api.webhooks.requests.post",
+            side_effect=lambda *args, **kwargs: MockResponse(
+                200, mock_raw=True
+            ),
+        ), time_machine.travel(self.mock_date, tick=False):
+            call_command("cl_send_alerts", rate="dly", workers=2)
+
+        # One opinion alert email to user_profile and one to user_profile_2.
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to[0], self.user_profile.user.email)
+        self.assertEqual(mail.outbox[1].to[0], self.user_profile_2.user.email)
+        # Only user_profile has an enabled webhook.
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+        for alert in [self.search_alert, self.search_alert_2]:
+            alert.refresh_from_db()
+            self.assertEqual(alert.date_last_hit, self.mock_date)
+            self.assertEqual(alert.date_modified, self.mock_date)
+            self.assertIn("filed_after", alert.query_run)
+
     def test_send_search_alert_webhooks_rates(self):
         """Can we send search alert webhooks for different alert rates?"""
         with time_machine.travel(
@@ -2371,6 +2409,212 @@ class SearchAlertsOAESTests(ESIndexTestCase, TestCase):
             self.assertNotIn(result.id, ids_in_results)
             ids_in_results.append(result.id)
 
+    def test_percolate_documents_in_batch(self, mock_abort_audio):
+        """Confirm many documents can be percolated in a single request and
+        the alerts they triggered are split by document."""
+
+        alert_1 = AlertFactory(
+            user=self.user_profile.user,
+            rate=Alert.REAL_TIME,
+            name="Test Alert Batch 1",
+            query="q=Batch+Percolator+One&type=oa",
+        )
+        alert_2 = AlertFactory(
+            user=self.user_profile_2.user,
+            rate=Alert.REAL_TIME,
+            name="Test Alert Batch 2",
+            query="q=Batch+Percolator&type=oa",
+        )
+        with mock.patch(
+            "cl.api.webhooks.requests.post",
+            side_effect=lambda *args, **kwargs: MockResponse(
+                200, mock_raw=True
+            ),
+        ):
+            oral_argument_1 = AudioWithParentsFactory.create(
+                case_name="Batch Percolator One",
+                docket__court=self.court_1,
+                docket__date_argued=now().date(),
+                docket__docket_number="21-5741",
+            )
+            oral_argument_2 = AudioWithParentsFactory.create(
+                case_name="Batch Percolator Two",
+                docket__court=self.court_1,
+                docket__date_argued=now().date(),
+                docket__docket_number="21-5742",
+            )
+
+        documents = [
+            AudioDocument().prepare(oral_argument_1),
+            AudioDocument().prepare(oral_argument_2),
+        ]
+        percolator_response = percolate_documents(documents)
+        alerts_triggered = fetch_all_search_results(
+            percolate_documents, percolator_response, documents
+        )
+        hits_by_document = split_percolator_hits_by_document(
+            alerts_triggered, len(documents)
+        )
+
+        self.assertEqual(
+            {hit.meta.id for hit in hits_by_document[0]},
+            {str(alert_1.pk), str(alert_2.pk)},
+        )
+        self.assertEqual(
+            {hit.meta.id for hit in hits_by_document[1]},
+            {str(alert_2.pk)},
+        )
+        # Highlights are split by document.
+        for hit in hits_by_document[1]:
+            self.assertIn("Two", str(hit.meta.highlight.to_dict()))
+
+        oral_argument_1.delete()
+        oral_argument_2.delete()
+        alert_1.delete()
+        alert_2.delete()
+
+    @override_settings(ELASTICSEARCH_PERCOLATOR_BATCH_WINDOW=30)
+    def test_percolate_buffered_documents(self, mock_abort_audio):
+        """Confirm documents buffered for percolation are percolated together
+        when the buffer is flushed, and each alert is sent for the document
+        that triggered it."""
+
+        alert_1 = AlertFactory(
+            user=self.user_profile.user,
+            rate=Alert.REAL_TIME,
+            name="Test Alert Buffer 1",
+            query="q=Buffered+Percolator+Alpha&type=oa",
+        )
+        alert_2 = AlertFactory(
+            user=self.user_profile_2.user,
+            rate=Alert.REAL_TIME,
+            name="Test Alert Buffer 2",
+            query="q=Buffered+Percolator+Bravo&type=oa",
+        )
+        document_index = AudioDocument._index._name
+        buffer_key = make_percolator_buffer_key(document_index)
+        r = make_redis_interface("CACHE")
+        r.delete(buffer_key, f"{buffer_key}:scheduled")
+
+        with mock.patch(
+            "cl.api.webhooks.requests.post",
+            side_effect=lambda *args, **kwargs: MockResponse(
+                200, mock_raw=True
+            ),
+        ), mock.patch(
+            "cl.alerts.tasks.percolate_buffered_documents.apply_async"
+        ) as mock_schedule, self.captureOnCommitCallbacks(
+            execute=True
+        ):
+            oral_argument_1 = AudioWithParentsFactory.create(
+                case_name="Buffered Percolator Alpha",
+                docket__court=self.court_1,
+                docket__date_argued=now().date(),
+                docket__docket_number="21-5751",
+            )
+            oral_argument_2 = AudioWithParentsFactory.create(
+                case_name="Buffered Percolator Bravo",
+                docket__court=self.court_1,
+                docket__date_argued=now().date(),
+                docket__docket_number="21-5752",
+            )
+
+        # Both documents are buffered and the flush is scheduled only once.
+        self.assertEqual(r.llen(buffer_key), 2)
+        self.assertEqual(mock_schedule.call_count, 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        # The documents are put back in the buffer if ES is unreachable.
+        with mock.patch(
+            "cl.alerts.tasks.percolate_documents",
+            side_effect=ConnectionError("Connection refused"),
+        ), self.assertRaises(ConnectionError):
+            percolate_buffered_documents(document_index)
+        self.assertEqual(r.llen(buffer_key), 2)
+
+        with mock.patch(
+            "cl.api.webhooks.requests.post",
+            side_effect=lambda *args, **kwargs: MockResponse(
+                200, mock_raw=True
+            ),
+        ), mock.patch(
+            "cl.alerts.tasks.percolate_documents",
+            wraps=percolate_documents,
+        ) as mock_percolate:
+            percolate_buffered_documents(document_index)
+
+        # Both documents were percolated in a single request.
+        self.assertEqual(mock_percolate.call_count, 1)
+        self.assertEqual(r.llen(buffer_key), 0)
+        self.assertFalse(r.exists(f"{buffer_key}:scheduled"))
+
+        # Each alert was sent for the document that triggered it.
+        self.assertEqual(len(mail.outbox), 2)
+        emails = {email.to[0]: email.body for email in mail.outbox}
+        body_1 = emails[self.user_profile.user.email]
+        self.assertIn(oral_argument_1.case_name, body_1)
+        self.assertNotIn(oral_argument_2.case_name, body_1)
+        body_2 = emails[self.user_profile_2.user.email]
+        self.assertIn(oral_argument_2.case_name, body_2)
+        self.assertNotIn(oral_argument_1.case_name, body_2)
+
+        oral_argument_1.delete()
+        oral_argument_2.delete()
+        alert_1.delete()
+        alert_2.delete()
+
+    def test_process_percolator_response_queries(self, mock_abort_audio):
+        """Confirm the number of queries performed to process the percolator
+        hits doesn't grow with the number of alerts triggered."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            oral_argument = AudioWithParentsFactory.create(
+                case_name="Fan Out Test",
+                docket__court=self.court_1,
+                docket__date_argued=now().date(),
+                docket__docket_number="21-5740",
+            )
+        document_index = AudioDocument._index._name
+        document_content = {"caseName": "Fan Out Test"}
+
+        alerts_created = []
+        queries_count = []
+        for alerts_count in (2, 6):
+            while len(alerts_created) < alerts_count:
+                user_profile = UserProfileWithParentsFactory.create()
+                alerts_created.append(
+                    AlertFactory.create(
+                        user=user_profile.user,
+                        rate=Alert.DAILY,
+                        name="Test Alert Fan Out",
+                        query="q=Fan+Out+Test+21-5740&type=oa",
+                    )
+                )
+            percolator_response = percolate_document(
+                str(oral_argument.pk), document_index
+            )
+            alerts_triggered = fetch_all_search_results(
+                percolate_document,
+                percolator_response,
+                str(oral_argument.pk),
+                document_index,
+            )
+            with CaptureQueriesContext(connection) as ctx:
+                process_percolator_response(
+                    (alerts_triggered, document_content)
+                )
+            queries_count.append(len(ctx.captured_queries))
+
+        self.assertEqual(queries_count[0], queries_count[1])
+        self.assertEqual(
+            ScheduledAlertHit.objects.filter(alert__in=alerts_created).count(),
+            2 + 6,
+        )
+
+        oral_argument.delete()
+        for alert in alerts_created:
+            alert.delete()
+
     def test_avoid_sending_or_scheduling_disabled_alerts(
         self, mock_abort_audio
     ):
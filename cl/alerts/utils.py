@@ -2,9 +2,10 @@ from dataclasses import dataclass
 from datetime import date
 
 from django.conf import settings
+from django.db.models import Count
 from django.http import QueryDict
 from elasticsearch_dsl import Q, Search
-from elasticsearch_dsl.response import Response
+from elasticsearch_dsl.response import Hit, Response
 
 from cl.alerts.models import (
     SCHEDULED_ALERT_HIT_STATUS,
@@ -16,6 +17,7 @@ from cl.lib.command_utils import logger
 from cl.lib.elasticsearch_utils import add_es_highlighting
 from cl.search.documents import AudioPercolator
 from cl.search.models import SEARCH_TYPES, Docket
+from cl.search.types import ESDictDocument
 from cl.users.models import UserProfile
 
 
@@ -55,26 +57,18 @@ class InvalidDateError(Exception):
     pass
 
 
-def percolate_document(
-    document_id: str,
-    document_index: str,
-    search_after: int = 0,
-) -> Response:
-    """Percolate a document against a defined Elasticsearch Percolator query.
+def build_percolator_search(
+    percolate_query: Q, search_after: int = 0
+) -> Search:
+    """Build the search used to percolate documents against the alerts
+    percolator queries.
 
-    :param document_id: The document ID in ES index to be percolated.
-    :param document_index: The ES document index where the document lives.
+    :param percolate_query: The ES percolate query.
     :param search_after: The ES search_after param for deep pagination.
-    :return: The response from the Elasticsearch query.
+    :return: The ES Search object.
     """
 
     s = Search(index=AudioPercolator._index._name)
-    percolate_query = Q(
-        "percolate",
-        field="percolator_query",
-        index=document_index,
-        id=document_id,
-    )
     exclude_rate_off = Q("term", rate=Alert.OFF)
     final_query = Q(
         "bool",
@@ -90,9 +84,102 @@ def percolate_document(
     s = s[: settings.ELASTICSEARCH_PAGINATION_BATCH_SIZE]
     if search_after:
         s = s.extra(search_after=search_after)
+    return s
+
+
+def percolate_document(
+    document_id: str,
+    document_index: str,
+    search_after: int = 0,
+) -> Response:
+    """Percolate a document against a defined Elasticsearch Percolator query.
+
+    :param document_id: The document ID in ES index to be percolated.
+    :param document_index: The ES document index where the document lives.
+    :param search_after: The ES search_after param for deep pagination.
+    :return: The response from the Elasticsearch query.
+    """
+
+    percolate_query = Q(
+        "percolate",
+        field="percolator_query",
+        index=document_index,
+        id=document_id,
+    )
+    s = build_percolator_search(percolate_query, search_after)
+    return s.execute()
+
+
+def percolate_documents(
+    documents: list[ESDictDocument],
+    search_after: int = 0,
+) -> Response:
+    """Percolate many documents in a single request against a defined
+    Elasticsearch Percolator query.
+
+    :param documents: A list of ES documents to percolate.
+    :param search_after: The ES search_after param for deep pagination.
+    :return: The response from the Elasticsearch query. Each hit contains the
+    slots of the documents that matched it.
+    """
+
+    percolate_query = Q(
+        "percolate",
+        field="percolator_query",
+        documents=documents,
+    )
+    s = build_percolator_search(percolate_query, search_after)
     return s.execute()
 
 
+def split_percolator_hits_by_document(
+    hits: list[Hit], documents_count: int
+) -> list[list[Hit]]:
+    """Split the hits of a multi-document percolator query into the hits
+    triggered by each document.
+
+    ES returns the documents that matched each hit in the
+    _percolator_document_slot field, and prefixes the highlighted fields with
+    the document slot.
+
+    :param hits: The hits returned by percolate_documents.
+    :param documents_count: The number of documents percolated.
+    :return: A list containing the hits triggered by each document, in the
+    same order as the percolated documents.
+    """
+
+    hits_by_document: list[list[Hit]] = [[] for _ in range(documents_count)]
+    for hit in hits:
+        meta = hit.meta.to_dict()
+        slots = meta.get("fields", {}).get("_percolator_document_slot", [0])
+        highlights = meta.get("highlight", {})
+        source = {
+            key: value
+            for key, value in hit.to_dict().items()
+            if key != "_percolator_document_slot"
+        }
+        for slot in slots:
+            slot_highlights = {}
+            for field, fragments in highlights.items():
+                slot_prefix, _, field_name = field.partition("_")
+                if slot_prefix == str(slot):
+                    slot_highlights[field_name] = fragments
+                elif not slot_prefix.isdigit():
+                    # Highlights are not prefixed for a single document.
+                    slot_highlights[field] = fragments
+            document = {
+                "_index": meta.get("index"),
+                "_id": meta.get("id"),
+                "_score": meta.get("score"),
+                "_source": source,
+                "sort": meta.get("sort"),
+            }
+            if slot_highlights:
+                document["highlight"] = slot_highlights
+            hits_by_document[slot].append(Hit(document))
+    return hits_by_document
+
+
 def override_alert_query(
     alert: Alert, cut_off_date: date | None = None
 ) -> QueryDict:
@@ -117,24 +204,34 @@ def override_alert_query(
     return qd
 
 
-def alert_hits_limit_reached(alert_pk: int, user_pk: int) -> bool:
-    """Check if the alert hits limit has been reached for a specific alert-user
-     combination.
+def alerts_hits_limit_reached(alerts: list[Alert]) -> set[int]:
+    """Get the alerts for which the hits limit has been reached, using a
+    single aggregated query for all of them.
 
-    :param alert_pk: The alert_id.
-    :param user_pk: The user_id.
-    :return: True if the limit has been reached, otherwise False.
+    :param alerts: A list of Alert objects to check.
+    :return: A set of the alert IDs that reached the limit.
     """
 
-    stored_hits = ScheduledAlertHit.objects.filter(
-        alert_id=alert_pk,
-        user_id=user_pk,
-        hit_status=SCHEDULED_ALERT_HIT_STATUS.SCHEDULED,
+    if not alerts:
+        return set()
+
+    alert_users = {alert.pk: alert.user_id for alert in alerts}
+    hits_counts = (
+        ScheduledAlertHit.objects.filter(
+            alert_id__in=alert_users.keys(),
+            hit_status=SCHEDULED_ALERT_HIT_STATUS.SCHEDULED,
+        )
+        .values("alert_id", "user_id")
+        .annotate(hits_count=Count("id"))
+        .filter(hits_count__gte=settings.SCHEDULED_ALERT_HITS_LIMIT)
     )
-    hits_count = stored_hits.count()
-    if hits_count >= settings.SCHEDULED_ALERT_HITS_LIMIT:
+    alerts_limit_reached = set()
+    for row in hits_counts:
+        if alert_users[row["alert_id"]] != row["user_id"]:
+            continue
         logger.info(
-            f"Skipping hit for Alert ID: {alert_pk}, there are {hits_count} hits stored for this alert."
+            f"Skipping hit for Alert ID: {row['alert_id']}, there are "
+            f"{row['hits_count']} hits stored for this alert."
         )
-        return True
-    return False
+        alerts_limit_reached.add(row["alert_id"])
+    return alerts_limit_reached
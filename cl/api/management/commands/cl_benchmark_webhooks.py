@@ -0,0 +1,135 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+
+from cl.api.models import Webhook, WebhookEvent
+from cl.api.webhooks import (
+    WebhookDelivery,
+    deliver_webhook_events,
+    get_webhook_headers,
+    get_webhook_proxy_url,
+)
+from cl.lib.command_utils import VerboseCommand, logger
+
+
+def make_stub_handler(delay: float) -> type[BaseHTTPRequestHandler]:
+    """Make a request handler that acts as the egress proxy and the webhook
+    endpoints at once, answering every POST with a 200.
+
+    :param delay: The seconds to wait before answering, to simulate slow
+    endpoints.
+    :return: The request handler class.
+    """
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return StubHandler
+
+
+class Command(VerboseCommand):
+    help = (
+        "Benchmark webhook delivery against a local stub server, comparing "
+        "sequential requests with the concurrent delivery engine."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=500,
+            help="The number of webhook events to send.",
+        )
+        parser.add_argument(
+            "--webhooks",
+            type=int,
+            default=10,
+            help="The number of webhooks to spread the events across.",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.01,
+            help="The seconds the stub server waits before answering.",
+        )
+
+    def handle(self, *args, **options):
+        super().handle(*args, **options)
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), make_stub_handler(options["delay"])
+        )
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        proxy = f"http://127.0.0.1:{server.server_port}"
+
+        # Unsaved objects are enough, since the delivery doesn't touch the DB.
+        webhooks = [
+            Webhook(pk=i, url=f"https://webhook-{i}.example.com/hook")
+            for i in range(1, options["webhooks"] + 1)
+        ]
+        content = b'{"webhook": {}, "payload": {"results": []}}'
+        deliveries = []
+        for i in range(options["events"]):
+            webhook_event = WebhookEvent(webhook=webhooks[i % len(webhooks)])
+            deliveries.append(
+                WebhookDelivery(
+                    webhook_event=webhook_event,
+                    content=content,
+                    url=get_webhook_proxy_url(webhook_event),
+                )
+            )
+
+        try:
+            start = time.perf_counter()
+            for delivery in deliveries:
+                requests.post(
+                    delivery.url,
+                    proxies={"http": proxy},
+                    data=delivery.content,
+                    timeout=(3, 3),
+                    headers=get_webhook_headers(delivery.webhook_event),
+                    allow_redirects=False,
+                ).close()
+            self.report("Sequential", len(deliveries), start)
+
+            start = time.perf_counter()
+            with override_settings(EGRESS_PROXY_HOST=proxy):
+                async_to_sync(deliver_webhook_events)(deliveries)
+            self.report("Concurrent", len(deliveries), start)
+            errors = [d.error for d in deliveries if d.error]
+            if errors:
+                logger.warning(
+                    "%s concurrent deliveries failed, e.g.: %s",
+                    len(errors),
+                    errors[0],
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @staticmethod
+    def report(label: str, count: int, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        logger.info(
+            "%s: %s events in %.2fs, %.1f events/sec",
+            label,
+            count,
+            elapsed,
+            count / elapsed,
+        )
@@ -1,6 +1,73 @@
-from django.core.paginator import InvalidPage
+import json
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from rest_framework.exceptions import NotFound
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+def get_estimated_count(queryset: QuerySet) -> int:
+    """Get the number of rows the Postgres planner estimates a queryset will
+    return, without running it.
+
+    :param queryset: The queryset to estimate.
+    :return: The estimated number of rows.
+    """
+    sql, params = queryset.values("pk").order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def wants_exact_count(request) -> bool:
+    return request.query_params.get("count") == "exact"
+
+
+def get_api_count(queryset, request) -> int:
+    """Count the results of an API list request.
+
+    If API_COUNT_ESTIMATE_THRESHOLD is set, querysets the planner estimates at
+    or above it aren't counted, and the estimate is used instead. Smaller
+    querysets, and requests with count=exact, get an exact count.
+
+    :param queryset: The queryset or list to count.
+    :param request: The API request.
+    :return: The number of results.
+    """
+    threshold = settings.API_COUNT_ESTIMATE_THRESHOLD
+    if (
+        threshold
+        and isinstance(queryset, QuerySet)
+        and not wants_exact_count(request)
+    ):
+        estimate = get_estimated_count(queryset)
+        if estimate >= threshold:
+            return estimate
+    if isinstance(queryset, QuerySet):
+        return queryset.count()
+    return len(queryset)
+
+
+class EstimatedCountPaginator(Paginator):
+    """A Django paginator that counts its object list with get_api_count"""
+
+    def __init__(self, object_list, per_page, request=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.request = request
+
+    @cached_property
+    def count(self) -> int:
+        if self.request is None:
+            return super().count
+        return get_api_count(self.object_list, self.request)
 
 
 class ShallowOnlyPageNumberPagination(PageNumberPagination):
@@ -10,6 +77,7 @@ class ShallowOnlyPageNumberPagination(PageNumberPagination):
     """
 
     max_pagination_depth = 100
+    django_paginator_class = EstimatedCountPaginator
 
     def paginate_queryset(self, queryset, request, view=None):
         """
@@ -20,7 +88,9 @@ class ShallowOnlyPageNumberPagination(PageNumberPagination):
         if not page_size:
             return None
 
-        paginator = self.django_paginator_class(queryset, page_size)
+        paginator = self.django_paginator_class(
+            queryset, page_size, request=request
+        )
         page_number = self.get_page_number(request, paginator)
 
         try:
@@ -49,6 +119,84 @@ class ShallowOnlyPageNumberPagination(PageNumberPagination):
         return list(self.page)
 
 
+class IDCursorPagination(CursorPagination):
+    """A keyset paginator that orders by the ordering requested with the
+    order_by param, or by descending ID otherwise.
+
+    Each page is fetched with a WHERE clause on the ordering field of the last
+    item of the previous page, so its cost doesn't grow with depth.
+    """
+
+    ordering = "-id"
+
+    def get_ordering(self, request, queryset, view):
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return self.add_id_tiebreaker(ordering)
+        return (self.ordering,)
+
+    @staticmethod
+    def add_id_tiebreaker(ordering: list[str] | tuple[str, ...]) -> tuple:
+        """Append the ID to an ordering that doesn't contain it, in the
+        direction of its first field.
+
+        Fields like date_modified have many rows with the same value, and
+        without a unique field to break the ties, the rows of a page could
+        change from one request to the next.
+
+        :param ordering: The ordering requested with the order_by param.
+        :return: The ordering with the ID tiebreaker.
+        """
+        if any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            return tuple(ordering)
+        tiebreaker = "-id" if ordering[0].startswith("-") else "id"
+        return (*ordering, tiebreaker)
+
+
+class CursorOrPageNumberPagination(ShallowOnlyPageNumberPagination):
+    """A paginator for big tables that supports keyset pagination of
+    unlimited depth, next to the shallow page number pagination.
+
+    Clients opt into keyset pagination with the cursor param, sending it
+    empty for the first page and following the next links after that.
+    """
+
+    cursor_query_param = "cursor"
+
+    def __init__(self) -> None:
+        self.cursor_paginator: IDCursorPagination | None = None
+        self.count: int | None = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor_paginator = IDCursorPagination()
+        self.cursor_paginator.page_size = self.get_page_size(request)
+        self.cursor_paginator.cursor_query_param = self.cursor_query_param
+        # Counting the whole table would cost more than the page itself, so
+        # the count is estimated unless an exact one is requested.
+        if wants_exact_count(request):
+            self.count = queryset.count()
+        else:
+            self.count = get_estimated_count(queryset)
+        return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "count": self.count,
+                "next": self.cursor_paginator.get_next_link(),
+                "previous": self.cursor_paginator.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
 class TinyAdjustablePagination(ShallowOnlyPageNumberPagination):
     page_size = 5
     page_size_query_param = "page_size"
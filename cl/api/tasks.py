@@ -7,7 +7,7 @@ from cl.alerts.api_serializers import SearchAlertSerializerModel
 from cl.alerts.models import Alert
 from cl.api.models import Webhook, WebhookEvent, WebhookEventType
 from cl.api.utils import generate_webhook_key_content
-from cl.api.webhooks import send_webhook_event
+from cl.api.webhooks import send_webhook_event, send_webhook_events
 from cl.celery_init import app
 from cl.corpus_importer.api_serializers import DocketEntrySerializer
 from cl.search.api_serializers import OAESResultSerializer
@@ -57,6 +57,7 @@ def send_docket_alert_webhook_events(
     for de in docket_entries:
         serialized_docket_entries.append(DocketEntrySerializer(de).data)
 
+    webhook_events = []
     for webhook in webhooks:
         post_content = {
             "webhook": generate_webhook_key_content(webhook),
@@ -74,7 +75,8 @@ def send_docket_alert_webhook_events(
             webhook=webhook,
             content=post_content,
         )
-        send_webhook_event(webhook_event, json_bytes)
+        webhook_events.append((webhook_event, json_bytes))
+    send_webhook_events(webhook_events)
 
 
 @app.task()
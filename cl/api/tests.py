@@ -2,6 +2,7 @@ import json
 from datetime import date, timedelta
 from typing import Any, Dict
 from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
 from asgiref.sync import async_to_sync, sync_to_async
 from django.contrib.auth.hashers import make_password
@@ -10,18 +11,24 @@ from django.contrib.humanize.templatetags.humanize import intcomma, ordinal
 from django.db import connection
 from django.http import HttpRequest, JsonResponse
 from django.test.client import AsyncClient, AsyncRequestFactory
-from django.test.utils import CaptureQueriesContext
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
+from django.utils.timezone import now
 from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
 from rest_framework.request import Request
 from rest_framework.status import HTTP_200_OK, HTTP_403_FORBIDDEN
 from rest_framework.test import APIRequestFactory
 
 from cl.api.factories import WebhookEventFactory, WebhookFactory
 from cl.api.models import WEBHOOK_EVENT_STATUS, WebhookEvent, WebhookEventType
-from cl.api.pagination import ShallowOnlyPageNumberPagination
+from cl.api.pagination import (
+    CursorOrPageNumberPagination,
+    IDCursorPagination,
+    ShallowOnlyPageNumberPagination,
+)
 from cl.api.views import coverage_data
-from cl.api.webhooks import send_webhook_event
+from cl.api.webhooks import send_webhook_event, send_webhook_events
 from cl.audio.api_views import AudioViewSet
 from cl.audio.factories import AudioFactory
 from cl.lib.redis_utils import make_redis_interface
@@ -31,7 +38,8 @@ from cl.lib.test_helpers import (
     SimpleUserDataMixin,
 )
 from cl.recap.factories import ProcessingQueueFactory
-from cl.search.models import SOURCES, Opinion
+from cl.search.factories import CourtFactory
+from cl.search.models import SOURCES, Court, Opinion
 from cl.stats.models import Event
 from cl.tests.cases import SimpleTestCase, TestCase, TransactionTestCase
 from cl.tests.utils import MockResponse
@@ -325,6 +333,33 @@ class ApiEventCreationTestCase(TestCase):
             int(self.r.get("api:Test.timing")), 10, delta=2000
         )
 
+    @override_settings(
+        API_USAGE_FLUSH_REQUESTS=3, API_USAGE_FLUSH_INTERVAL=60 * 1000
+    )
+    @mock.patch(
+        "cl.api.utils.get_logging_prefix",
+        return_value="api:Test",
+    )
+    async def test_api_usage_is_buffered(self, mock_logging_prefix) -> None:
+        """Are the API stats written to Redis once every few requests, and
+        are the milestones reached in between detected?
+        """
+        await self.hit_the_api()
+        await self.hit_the_api()
+        self.assertIsNone(self.r.get("api:Test.count"))
+        self.assertEqual(await Event.objects.acount(), 0)
+
+        await self.hit_the_api()
+        self.assertEqual(int(self.r.get("api:Test.count")), 3)
+        self.assertEqual(
+            self.r.zscore("api:Test.user.counts", self.user.pk), 3.0
+        )
+        self.assertEqual(
+            self.r.zscore("api:Test.endpoint.counts", self.endpoint_name), 3
+        )
+        # The first request milestone.
+        self.assertEqual(await Event.objects.acount(), 1)
+
 
 class DRFOrderingTests(TestCase):
     """Does ordering work generally and specifically?"""
@@ -949,6 +984,80 @@ class DRFPaginationTest(SimpleTestCase):
             self.paginate_queryset(request)
 
 
+class CursorPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.court_ids = sorted(
+            CourtFactory.create(id=court_id).pk
+            for court_id in ["ca1", "ca2", "ca3", "ca4", "ca5"]
+        )
+        cls.queryset = Court.objects.filter(pk__in=cls.court_ids)
+
+    class CourtView:
+        filter_backends = [OrderingFilter]
+        ordering_fields = ["id", "date_modified"]
+
+    def paginate(self, params: dict[str, str]) -> tuple[list[str], dict]:
+        pagination = CursorOrPageNumberPagination()
+        pagination.page_size = 2
+        request = Request(APIRequestFactory().get("/", params))
+        page = pagination.paginate_queryset(
+            self.queryset, request, self.CourtView()
+        )
+        data = pagination.get_paginated_response([]).data
+        return [court.pk for court in page], data
+
+    def walk_pages(self, params: dict[str, str]) -> list[str]:
+        court_ids, data = self.paginate({"cursor": "", **params})
+        while data["next"]:
+            cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+            page, data = self.paginate({"cursor": cursor, **params})
+            court_ids.extend(page)
+        return court_ids
+
+    def test_cursor_pagination(self) -> None:
+        """Can we walk all the pages with the cursor, without counting?"""
+        with CaptureQueriesContext(connection) as ctx:
+            _, data = self.paginate({"cursor": ""})
+        self.assertFalse(
+            any("COUNT(" in q["sql"] for q in ctx.captured_queries)
+        )
+        self.assertIsInstance(data["count"], int)
+        self.assertIsNone(data["previous"])
+
+        self.assertEqual(self.walk_pages({}), self.court_ids[::-1])
+
+    def test_cursor_pagination_breaks_ties_by_id(self) -> None:
+        """Are the rows with the same value in the ordering field paginated
+        by ID?
+        """
+        self.assertEqual(
+            IDCursorPagination.add_id_tiebreaker(["-date_modified"]),
+            ("-date_modified", "-id"),
+        )
+        self.assertEqual(
+            IDCursorPagination.add_id_tiebreaker(["date_modified", "-id"]),
+            ("date_modified", "-id"),
+        )
+
+        self.queryset.update(date_modified=now())
+        court_ids = self.walk_pages({"order_by": "date_modified"})
+        self.assertEqual(court_ids, self.court_ids)
+        court_ids = self.walk_pages({"order_by": "-date_modified"})
+        self.assertEqual(court_ids, self.court_ids[::-1])
+
+    def test_exact_count_on_request(self) -> None:
+        """Is the count exact when requested?"""
+        _, data = self.paginate({"cursor": "", "count": "exact"})
+        self.assertEqual(data["count"], 5)
+
+    def test_page_number_pagination_is_kept(self) -> None:
+        """Do requests without a cursor still use page numbers?"""
+        page, data = self.paginate({"page": "2"})
+        self.assertEqual(page, self.court_ids[2:4])
+        self.assertEqual(data["count"], 5)
+
+
 class DRFRecapPermissionTest(TestCase):
     @classmethod
     def setUpTestData(cls) -> None:
@@ -1085,6 +1194,29 @@ class WebhooksProxySecurityTest(TestCase):
             HTTP_403_FORBIDDEN,
         )
 
+    @override_settings(WEBHOOK_ASYNC_DELIVERY=True)
+    def test_concurrent_delivery_goes_through_the_proxy(self):
+        """Does the concurrent delivery engine send webhooks through the
+        proxy and update their events in batch?"""
+
+        webhook_events = [
+            WebhookEventFactory(
+                webhook=webhook,
+                content="{'message': 'ok_1'}",
+                event_status=WEBHOOK_EVENT_STATUS.IN_PROGRESS,
+            )
+            for webhook in [self.webhook_https, self.webhook_0_0_0_0]
+        ]
+        send_webhook_events([(event, None) for event in webhook_events])
+        for webhook_event, ip in zip(webhook_events, ["127.0.0.1", "0.0.0.0"]):
+            webhook_event.refresh_from_db()
+            self.assertIn(f"IP {ip} is blocked", webhook_event.response)
+            self.assertEqual(webhook_event.status_code, HTTP_403_FORBIDDEN)
+            self.assertEqual(
+                webhook_event.event_status,
+                WEBHOOK_EVENT_STATUS.ENQUEUED_RETRY,
+            )
+
 
 class WebhooksMilestoneEventsTest(TestCase):
     """Test Webhook milestone events tracking"""
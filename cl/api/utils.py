@@ -1,5 +1,10 @@
+import atexit
 import logging
+import os
+import threading
+import time
 from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from typing import Dict, List, Set, TypedDict, Union
 
@@ -190,6 +195,162 @@ def get_logging_prefix() -> str:
     return "api:v3"
 
 
+@dataclass
+class APIUsage:
+    """The API usage stats of one or more requests, to be added to the stats
+    in Redis.
+    """
+
+    # Redis keys mapped to the amount to increment them by.
+    counters: defaultdict[str, int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    # (Sorted set key, member) tuples mapped to the amount to increment the
+    # score of the member by.
+    scores: defaultdict[tuple[str, str | int], int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    # Hash keys mapped to the client IP to user pk maps to set.
+    ip_maps: defaultdict[str, dict[str, str | int]] = field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    # The pks of the authenticated users mapped to their username and the
+    # milestones of requests to create events for.
+    users: dict[int, tuple[str, list[float]]] = field(default_factory=dict)
+    # The logging prefixes of the requests.
+    api_prefixes: set[str] = field(default_factory=set)
+    requests: int = 0
+
+    def merge(self, other: "APIUsage") -> None:
+        """Add the stats of another APIUsage to this one."""
+        for key, amount in other.counters.items():
+            self.counters[key] += amount
+        for key, amount in other.scores.items():
+            self.scores[key] += amount
+        for key, ip_map in other.ip_maps.items():
+            self.ip_maps[key].update(ip_map)
+        self.users.update(other.users)
+        self.api_prefixes |= other.api_prefixes
+        self.requests += other.requests
+
+
+# The API usage buffered by the current process, and when it was last flushed.
+_api_usage = APIUsage()
+_api_usage_flushed_at = time.monotonic()
+_api_usage_pid: int | None = None
+_api_usage_lock = threading.Lock()
+
+
+def buffer_api_usage(usage: APIUsage) -> None:
+    """Add the usage stats of a request to the buffer of the current process,
+    and flush the buffer to Redis every API_USAGE_FLUSH_REQUESTS requests or
+    API_USAGE_FLUSH_INTERVAL milliseconds.
+
+    The buffer of a parent process is discarded after a fork, so it's not
+    flushed twice.
+
+    :param usage: The APIUsage of the request.
+    :return: None
+    """
+    global _api_usage, _api_usage_flushed_at, _api_usage_pid
+    with _api_usage_lock:
+        if _api_usage_pid != os.getpid():
+            _api_usage = APIUsage()
+            _api_usage_flushed_at = time.monotonic()
+            _api_usage_pid = os.getpid()
+
+        _api_usage.merge(usage)
+        elapsed_ms = (time.monotonic() - _api_usage_flushed_at) * 1000
+        if (
+            _api_usage.requests < settings.API_USAGE_FLUSH_REQUESTS
+            and elapsed_ms < settings.API_USAGE_FLUSH_INTERVAL
+        ):
+            return
+        usage_to_flush = _api_usage
+        _api_usage = APIUsage()
+        _api_usage_flushed_at = time.monotonic()
+
+    flush_api_usage(usage_to_flush)
+
+
+def get_crossed_milestones(
+    previous_count: float, count: float, milestones: list[float]
+) -> list[int]:
+    """Get the milestones a count reached since its previous value.
+
+    :param previous_count: The previous value of the count.
+    :param count: The current value of the count.
+    :param milestones: The milestones to check.
+    :return: A list of the milestones reached.
+    """
+    return [int(m) for m in milestones if previous_count < m <= count]
+
+
+def flush_api_usage(usage: APIUsage) -> None:
+    """Write buffered API usage stats to Redis in a single pipeline, and create
+    the events of the milestones reached by the API and its users.
+
+    :param usage: The APIUsage to write.
+    :return: None
+    """
+    r = make_redis_interface("STATS")
+    pipe = r.pipeline()
+    for key, amount in usage.counters.items():
+        pipe.incr(key, amount)
+    for (key, member), amount in usage.scores.items():
+        pipe.zincrby(key, amount, member)
+    for key, ip_map in usage.ip_maps.items():
+        pipe.hset(key, mapping=ip_map)
+        pipe.expire(key, 60 * 60 * 24 * 14)  # Two weeks
+    results = pipe.execute()
+
+    counts = dict(zip(usage.counters, results))
+    scores = dict(zip(usage.scores, results[len(usage.counters) :]))
+    for api_prefix in usage.api_prefixes:
+        total_count_key = f"{api_prefix}.count"
+        total_count = counts[total_count_key]
+        previous_count = total_count - usage.counters[total_count_key]
+        for milestone in get_crossed_milestones(
+            previous_count, total_count, MILESTONES_FLAT
+        ):
+            Event.objects.create(
+                description=f"API has logged {milestone} total requests."
+            )
+
+        for user_pk, (username, milestones) in usage.users.items():
+            score_key = (f"{api_prefix}.user.counts", user_pk)
+            if score_key not in scores:
+                continue
+            user_count = scores[score_key]
+            previous_count = user_count - usage.scores[score_key]
+            for milestone in get_crossed_milestones(
+                previous_count, user_count, milestones
+            ):
+                Event.objects.create(
+                    description="User '%s' has placed their %s API request."
+                    % (username, intcomma(ordinal(milestone))),
+                    user_id=user_pk,
+                )
+
+
+def flush_buffered_api_usage() -> None:
+    """Flush the API usage buffered by the current process. Called when the
+    process exits, so the requests since the last flush aren't lost.
+
+    :return: None
+    """
+    global _api_usage
+    with _api_usage_lock:
+        if _api_usage_pid != os.getpid() or not _api_usage.requests:
+            return
+        usage_to_flush = _api_usage
+        _api_usage = APIUsage()
+    flush_api_usage(usage_to_flush)
+
+
+atexit.register(flush_buffered_api_usage)
+
+
 class LoggingMixin(object):
     """Log requests to Redis
 
@@ -223,8 +384,7 @@ class LoggingMixin(object):
             # Don't log things like 401, 403, etc.,
             # noinspection PyBroadException
             try:
-                results = self._log_request(request)
-                self._handle_events(results, request.user)
+                self._log_request(request)
             except Exception as e:
                 logger.exception(
                     "Unable to log API response timing info: %s", e
@@ -249,60 +409,41 @@ class LoggingMixin(object):
         )[0]
         endpoint = resolve(request.path_info).url_name
         response_ms = self._get_response_ms()
-
-        r = make_redis_interface("STATS")
-        pipe = r.pipeline()
         api_prefix = get_logging_prefix()
 
         # Global and daily tallies for all URLs.
-        pipe.incr(f"{api_prefix}.count")
-        pipe.incr(f"{api_prefix}.d:{d}.count")
-        pipe.incr(f"{api_prefix}.timing", response_ms)
-        pipe.incr(f"{api_prefix}.d:{d}.timing", response_ms)
+        usage = APIUsage(api_prefixes={api_prefix}, requests=1)
+        usage.counters[f"{api_prefix}.count"] += 1
+        usage.counters[f"{api_prefix}.d:{d}.count"] += 1
+        usage.counters[f"{api_prefix}.timing"] += response_ms
+        usage.counters[f"{api_prefix}.d:{d}.timing"] += response_ms
 
         # Use a sorted set to store the user stats, with the score representing
         # the number of queries the user made total or on a given day.
         user_pk = user.pk or "AnonymousUser"
-        pipe.zincrby(f"{api_prefix}.user.counts", 1, user_pk)
-        pipe.zincrby(f"{api_prefix}.user.d:{d}.counts", 1, user_pk)
+        usage.scores[(f"{api_prefix}.user.counts", user_pk)] += 1
+        usage.scores[(f"{api_prefix}.user.d:{d}.counts", user_pk)] += 1
+        if user.is_authenticated:
+            usage.users[user_pk] = (user.username, self.milestones)
 
         # Use a hash to store a per-day map between IP addresses and user pks
         # Get a user pk with: `hget api:v3.d:2022-05-18.ip_map 172.19.0.1`
         if client_ip is not None:
-            ip_key = f"{api_prefix}.d:{d}.ip_map"
-            pipe.hset(ip_key, client_ip, user_pk)
-            pipe.expire(ip_key, 60 * 60 * 24 * 14)  # Two weeks
+            usage.ip_maps[f"{api_prefix}.d:{d}.ip_map"][client_ip] = user_pk
 
         # Use a sorted set to store all the endpoints with score representing
         # the number of queries the endpoint received total or on a given day.
-        pipe.zincrby(f"{api_prefix}.endpoint.counts", 1, endpoint)
-        pipe.zincrby(f"{api_prefix}.endpoint.d:{d}.counts", 1, endpoint)
+        usage.scores[(f"{api_prefix}.endpoint.counts", endpoint)] += 1
+        usage.scores[(f"{api_prefix}.endpoint.d:{d}.counts", endpoint)] += 1
 
         # We create a per-day key in redis for timings. Inside the key we have
         # members for every endpoint, with score of the total time. So to get
         # the average for an endpoint you need to get the number of requests
         # and the total time for the endpoint and divide.
         timing_key = f"{api_prefix}.endpoint.d:{d}.timings"
-        pipe.zincrby(timing_key, response_ms, endpoint)
+        usage.scores[(timing_key, endpoint)] += response_ms
 
-        results = pipe.execute()
-        return results
-
-    def _handle_events(self, results, user):
-        total_count = results[0]
-        user_count = results[4]
-
-        if total_count in MILESTONES_FLAT:
-            Event.objects.create(
-                description=f"API has logged {total_count} total requests."
-            )
-        if user.is_authenticated:
-            if user_count in self.milestones:
-                Event.objects.create(
-                    description="User '%s' has placed their %s API request."
-                    % (user.username, intcomma(ordinal(user_count))),
-                    user=user,
-                )
+        buffer_api_usage(usage)
 
 
 class CacheListMixin(object):
@@ -667,7 +808,6 @@ def update_webhook_event_after_request(
     :return: None
     """
 
-    failed_request = False
     data = ""
     status_code = None
     if response is not None:
@@ -679,42 +819,170 @@ def update_webhook_event_after_request(
             break
         response.close()
         status_code = response.status_code
-        # If the response status code is not 2xx. It's considered a failed
-        # attempt, and it'll be enqueued for retry.
-        if not 200 <= response.status_code < 300:
-            failed_request = True
+
+    if is_failed_webhook_request(status_code, error):
+        update_failed_webhook_event(webhook_event, status_code, data, error)
+        return
+
+    mark_webhook_event_successful(webhook_event, status_code, data)
+    if not webhook_event.debug:
+        # Only log successful webhook events and not debug.
+        results = log_webhook_event(webhook_event.webhook.user.pk)
+        handle_webhook_events(results, webhook_event.webhook.user)
+    webhook_event.save()
+
+
+def is_failed_webhook_request(
+    status_code: int | None, error: str | None
+) -> bool:
+    """Check if a webhook request failed. If the response status code is not
+    2xx it's considered a failed attempt, and it'll be enqueued for retry.
+
+    :param status_code: The status code of the response, if any.
+    :param error: The error of the request, if any.
+    :return: True if the request failed, otherwise False.
+    """
+    return bool(error) or not (
+        status_code is not None and 200 <= status_code < 300
+    )
+
+
+def mark_webhook_event_successful(
+    webhook_event: WebhookEvent, status_code: int | None, data: str
+) -> None:
+    """Set the fields of a successful webhook event, without saving it.
+
+    :param webhook_event: The WebhookEvent to update.
+    :param status_code: The status code of the response.
+    :param data: The first 4KB of the response.
+    :return: None
+    """
     webhook_event.status_code = status_code
     webhook_event.response = data
+    webhook_event.event_status = WEBHOOK_EVENT_STATUS.SUCCESSFUL
 
-    if failed_request or error:
-        if error is None:
-            error = ""
-        webhook_event.error_message = error
-        check_webhook_failure_count_and_notify(webhook_event)
-        if webhook_event.retry_counter >= WEBHOOK_MAX_RETRY_COUNTER:
-            # If the webhook has reached the max retry counter, mark as failed
-            webhook_event.event_status = WEBHOOK_EVENT_STATUS.FAILED
-            webhook_event.retry_counter = F("retry_counter") + 1
-            webhook_event.save()
-            return
 
-        webhook_event.next_retry_date = get_next_webhook_retry_date(
-            webhook_event.retry_counter
-        )
+def update_failed_webhook_event(
+    webhook_event: WebhookEvent,
+    status_code: int | None,
+    data: str,
+    error: str | None,
+) -> None:
+    """Update a webhook event after a failed request. Increase its retry
+    counter, next retry date and its parent webhook failure count, or mark it
+    as Failed if it reached the max retry counter.
+
+    :param webhook_event: The WebhookEvent to update.
+    :param status_code: The status code of the response, if any.
+    :param data: The first 4KB of the response.
+    :param error: The error of the request, if any.
+    :return: None
+    """
+    webhook_event.status_code = status_code
+    webhook_event.response = data
+    if error is None:
+        error = ""
+    webhook_event.error_message = error
+    check_webhook_failure_count_and_notify(webhook_event)
+    if webhook_event.retry_counter >= WEBHOOK_MAX_RETRY_COUNTER:
+        # If the webhook has reached the max retry counter, mark as failed
+        webhook_event.event_status = WEBHOOK_EVENT_STATUS.FAILED
         webhook_event.retry_counter = F("retry_counter") + 1
-        webhook_event.event_status = WEBHOOK_EVENT_STATUS.ENQUEUED_RETRY
-        if webhook_event.debug:
-            # Test events are not enqueued for retry.
-            webhook_event.event_status = WEBHOOK_EVENT_STATUS.FAILED
-    else:
-        webhook_event.event_status = WEBHOOK_EVENT_STATUS.SUCCESSFUL
-        if not webhook_event.debug:
-            # Only log successful webhook events and not debug.
-            results = log_webhook_event(webhook_event.webhook.user.pk)
-            handle_webhook_events(results, webhook_event.webhook.user)
+        webhook_event.save()
+        return
+
+    webhook_event.next_retry_date = get_next_webhook_retry_date(
+        webhook_event.retry_counter
+    )
+    webhook_event.retry_counter = F("retry_counter") + 1
+    webhook_event.event_status = WEBHOOK_EVENT_STATUS.ENQUEUED_RETRY
+    if webhook_event.debug:
+        # Test events are not enqueued for retry.
+        webhook_event.event_status = WEBHOOK_EVENT_STATUS.FAILED
     webhook_event.save()
 
 
+def update_webhook_events_after_requests(
+    results: list[tuple[WebhookEvent, int | None, str, str]],
+) -> None:
+    """Update a batch of webhook events after sending their POST requests.
+
+    Failed events are updated one by one, like in
+    update_webhook_event_after_request, since each of them can disable its
+    webhook. Successful events are saved with a single query, and logged to
+    redis with a single pipeline.
+
+    :param results: A list of (WebhookEvent, status code, first 4KB of the
+    response, error) tuples.
+    :return: None
+    """
+    successful_events = []
+    for webhook_event, status_code, data, error in results:
+        if is_failed_webhook_request(status_code, error):
+            update_failed_webhook_event(
+                webhook_event, status_code, data, error
+            )
+            continue
+        mark_webhook_event_successful(webhook_event, status_code, data)
+        webhook_event.date_modified = now()
+        successful_events.append(webhook_event)
+    if not successful_events:
+        return
+
+    WebhookEvent.objects.bulk_update(
+        successful_events,
+        ["status_code", "response", "event_status", "date_modified"],
+    )
+    # Only log successful webhook events and not debug.
+    users = {}
+    user_counts: defaultdict[int, int] = defaultdict(int)
+    for webhook_event in successful_events:
+        if not webhook_event.debug:
+            users[webhook_event.webhook.user_id] = webhook_event.webhook.user
+            user_counts[webhook_event.webhook.user_id] += 1
+    if user_counts:
+        log_webhook_events(user_counts, users)
+
+
+def log_webhook_events(
+    user_counts: dict[int, int], users: dict[int, User]
+) -> None:
+    """Log a batch of successful webhook events to redis, and create the
+    events of the milestones reached by webhooks and their users.
+
+    :param user_counts: A dict mapping user IDs to their number of successful
+    webhook events.
+    :param users: A dict mapping user IDs to the users.
+    :return: None
+    """
+    r = make_redis_interface("STATS")
+    pipe = r.pipeline()
+    webhook_prefix = get_webhook_logging_prefix()
+    total = sum(user_counts.values())
+    pipe.incr(f"{webhook_prefix}.count", total)
+    for user_id, count in user_counts.items():
+        pipe.zincrby(f"{webhook_prefix}.user.counts", count, user_id)
+    total_count, *counts = pipe.execute()
+
+    for milestone in get_crossed_milestones(
+        total_count - total, total_count, MILESTONES_FLAT
+    ):
+        Event.objects.create(
+            description=f"Webhooks have logged {milestone} total successful "
+            f"events."
+        )
+    for (user_id, count), user_count in zip(user_counts.items(), counts):
+        for milestone in get_crossed_milestones(
+            user_count - count, user_count, MILESTONES_FLAT
+        ):
+            user = users[user_id]
+            Event.objects.create(
+                description=f"User '{user.username}' has placed their "
+                f"{intcomma(ordinal(milestone))} webhook event.",
+                user=user,
+            )
+
+
 class WebhookKeyType(TypedDict):
     event_type: int
     version: int
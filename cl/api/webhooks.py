@@ -1,6 +1,11 @@
-import json
+import asyncio
+import re
+from dataclasses import dataclass
+from urllib.parse import urlsplit
 
+import httpx
 import requests
+from asgiref.sync import async_to_sync
 from django.conf import settings
 from rest_framework.renderers import JSONRenderer
 from scorched.response import SolrResponse
@@ -15,6 +20,7 @@ from cl.api.models import Webhook, WebhookEvent, WebhookEventType
 from cl.api.utils import (
     generate_webhook_key_content,
     update_webhook_event_after_request,
+    update_webhook_events_after_requests,
 )
 from cl.lib.scorched_utils import ExtraSolrInterface
 from cl.lib.string_utils import trunc
@@ -23,24 +29,31 @@ from cl.recap.models import PROCESSING_STATUS, PacerFetchQueue
 from cl.search.api_serializers import SearchResultSerializer
 from cl.search.api_utils import ResultObject
 
+# Matches payloads that are an empty JSON object, without parsing them.
+EMPTY_PAYLOAD_RE = re.compile(rb"\s*\{\s*\}\s*")
 
-def send_webhook_event(
+
+@dataclass
+class WebhookDelivery:
+    """A webhook event to POST, and the result of the request."""
+
+    webhook_event: WebhookEvent
+    content: bytes
+    url: str
+    status_code: int | None = None
+    response: str = ""
+    error: str = ""
+
+
+def render_webhook_event(
     webhook_event: WebhookEvent, content_bytes: bytes | None = None
-) -> None:
-    """Send the webhook POST request.
+) -> bytes:
+    """Render the JSON content of a webhook event.
 
-    :param webhook_event: An WebhookEvent to send.
-    :param content_bytes: Optional, the bytes JSON content to send the first time
-    the webhook is sent.
+    :param webhook_event: The WebhookEvent to render.
+    :param content_bytes: Optional, the JSON content already rendered.
+    :return: The JSON bytes to POST.
     """
-    proxy_server = {
-        "http": settings.EGRESS_PROXY_HOST,  # type: ignore
-    }
-    headers = {
-        "Content-type": "application/json",
-        "Idempotency-Key": str(webhook_event.event_id),
-        "X-WhSentry-TLS": "true",
-    }
     if content_bytes:
         json_bytes = content_bytes
     else:
@@ -49,30 +62,163 @@ def send_webhook_event(
             webhook_event.content,
             accepted_media_type="application/json;",
         )
-
-    json_data = json.loads(json_bytes)
-    if json_data == {}:
+    if EMPTY_PAYLOAD_RE.fullmatch(json_bytes):
         raise ValueError("Webhook payload is empty.")
+    return json_bytes
+
+
+def get_webhook_headers(webhook_event: WebhookEvent) -> dict[str, str]:
+    return {
+        "Content-type": "application/json",
+        "Idempotency-Key": str(webhook_event.event_id),
+        "X-WhSentry-TLS": "true",
+    }
+
+
+def get_webhook_proxy_url(webhook_event: WebhookEvent) -> str:
+    # To send a POST to an HTTPS target and using webhook-sentry as proxy,
+    # you needed to change the protocol to HTTP and set the X-WhSentry-TLS
+    # header to true. See https://github.com/juggernaut/webhook-sentry#https-target
+    return webhook_event.webhook.url.replace("https://", "http://")
+
+
+def send_webhook_event(
+    webhook_event: WebhookEvent, content_bytes: bytes | None = None
+) -> None:
+    """Send the webhook POST request.
+
+    :param webhook_event: An WebhookEvent to send.
+    :param content_bytes: Optional, the bytes JSON content to send the first time
+    the webhook is sent.
+    """
+    proxy_server = {
+        "http": settings.EGRESS_PROXY_HOST,  # type: ignore
+    }
+    json_bytes = render_webhook_event(webhook_event, content_bytes)
     try:
-        # To send a POST to an HTTPS target and using webhook-sentry as proxy,
-        # you needed to change the protocol to HTTP and set the X-WhSentry-TLS
-        # header to true. See https://github.com/juggernaut/webhook-sentry#https-target
-        url = webhook_event.webhook.url.replace("https://", "http://")
         response = requests.post(
-            url,
+            get_webhook_proxy_url(webhook_event),
             proxies=proxy_server,
-            json=json_data,
+            data=json_bytes,
             timeout=(3, 3),
-            headers=headers,
+            headers=get_webhook_headers(webhook_event),
             allow_redirects=False,
         )
         update_webhook_event_after_request(webhook_event, response)
     except (requests.ConnectionError, requests.Timeout) as exc:
-        error_str = f"{type(exc).__name__}: {exc}"
-        trunc(error_str, 500)
+        error_str = trunc(f"{type(exc).__name__}: {exc}", 500)
         update_webhook_event_after_request(webhook_event, error=error_str)
 
 
+async def post_webhook_delivery(
+    delivery: WebhookDelivery,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """POST a webhook event and store the result of the request in its
+    delivery. Only the first 4KB of the response are read.
+
+    :param delivery: The WebhookDelivery to send.
+    :param client: The client of the host of the webhook.
+    :param semaphore: The semaphore that caps the concurrent requests to the
+    webhook.
+    :return: None
+    """
+    async with semaphore:
+        try:
+            async with client.stream(
+                "POST",
+                delivery.url,
+                content=delivery.content,
+                headers=get_webhook_headers(delivery.webhook_event),
+                follow_redirects=False,
+            ) as response:
+                delivery.status_code = response.status_code
+                async for chunk in response.aiter_text(1024 * 4):
+                    delivery.response = chunk
+                    break
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            delivery.error = trunc(f"{type(exc).__name__}: {exc}", 500)
+
+
+async def deliver_webhook_events(deliveries: list[WebhookDelivery]) -> None:
+    """POST webhook events concurrently.
+
+    Requests to the same host share a pool of keep-alive connections, and the
+    concurrent requests of each webhook are capped, so a slow endpoint can
+    only hold up its own events.
+
+    :param deliveries: The WebhookDeliveries to send. Their results are
+    stored in them.
+    :return: None
+    """
+    max_connections = settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST
+    clients: dict[str, httpx.AsyncClient] = {}
+    semaphores: dict[int, asyncio.Semaphore] = {}
+    requests_to_send = []
+    for delivery in deliveries:
+        host = urlsplit(delivery.url).netloc
+        if host not in clients:
+            clients[host] = httpx.AsyncClient(
+                proxy=settings.EGRESS_PROXY_HOST,
+                timeout=3.0,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            )
+        webhook_id = delivery.webhook_event.webhook_id
+        if webhook_id not in semaphores:
+            semaphores[webhook_id] = asyncio.Semaphore(
+                settings.WEBHOOK_MAX_CONCURRENCY_PER_WEBHOOK
+            )
+        requests_to_send.append(
+            post_webhook_delivery(
+                delivery, clients[host], semaphores[webhook_id]
+            )
+        )
+    try:
+        await asyncio.gather(*requests_to_send)
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients.values()))
+
+
+def send_webhook_events(
+    webhook_events: list[tuple[WebhookEvent, bytes | None]],
+) -> None:
+    """Send a batch of webhook events.
+
+    If WEBHOOK_ASYNC_DELIVERY is enabled, the events are POSTed concurrently
+    and updated in batch afterward. Otherwise, they're sent one by one.
+
+    :param webhook_events: A list of (WebhookEvent, content bytes) tuples.
+    The content bytes are optional, like in send_webhook_event.
+    :return: None
+    """
+    if not settings.WEBHOOK_ASYNC_DELIVERY:
+        for webhook_event, content_bytes in webhook_events:
+            send_webhook_event(webhook_event, content_bytes)
+        return
+
+    # Render the events and read their webhooks before leaving the sync
+    # context, since the delivery can't query the DB.
+    deliveries = [
+        WebhookDelivery(
+            webhook_event=webhook_event,
+            content=render_webhook_event(webhook_event, content_bytes),
+            url=get_webhook_proxy_url(webhook_event),
+        )
+        for webhook_event, content_bytes in webhook_events
+    ]
+    async_to_sync(deliver_webhook_events)(deliveries)
+    update_webhook_events_after_requests(
+        [
+            (d.webhook_event, d.status_code, d.response, d.error)
+            for d in deliveries
+        ]
+    )
+
+
 def send_old_alerts_webhook_event(
     webhook: Webhook, report: OldAlertReport
 ) -> None:
@@ -133,6 +279,7 @@ def send_recap_fetch_webhooks(fq: PacerFetchQueue) -> None:
         user_webhooks = fq.user.webhooks.filter(
             event_type=WebhookEventType.RECAP_FETCH, enabled=True
         )
+        webhook_events = []
         for webhook in user_webhooks:
             payload = PacerFetchQueueSerializer(fq).data
             post_content = {
@@ -148,7 +295,8 @@ def send_recap_fetch_webhooks(fq: PacerFetchQueue) -> None:
                 webhook=webhook,
                 content=post_content,
             )
-            send_webhook_event(webhook_event, json_bytes)
+            webhook_events.append((webhook_event, json_bytes))
+        send_webhook_events(webhook_events)
 
 
 def send_search_alert_webhook(
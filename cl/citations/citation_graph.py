@@ -0,0 +1,239 @@
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from django.db.models import Max
+
+from cl.search.models import OpinionsCited
+
+INDPTR_FILE = "indptr.npy"
+INDICES_FILE = "indices.npy"
+METADATA_FILE = "metadata.json"
+EDGES_CHUNK_SIZE = 1_000_000
+
+
+@dataclass
+class CitationGraph:
+    """A directed citation graph between opinions stored in CSR format.
+
+    The opinions cited by the opinion with ID `pk` are:
+    indices[indptr[pk]:indptr[pk + 1]]
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    last_citation_id: int = 0
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def out_degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def sources(self) -> np.ndarray:
+        """Expand the CSR row pointers into the citing opinion of every edge.
+
+        :return: An array with the citing opinion ID of every edge.
+        """
+        return np.repeat(
+            np.arange(self.num_nodes, dtype=np.int32), self.out_degrees()
+        )
+
+
+def empty_citation_graph() -> CitationGraph:
+    return CitationGraph(
+        indptr=np.zeros(1, dtype=np.int64),
+        indices=np.zeros(0, dtype=np.int32),
+    )
+
+
+def build_csr(
+    sources: np.ndarray, targets: np.ndarray, num_nodes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build the CSR arrays of a graph from its edges.
+
+    :param sources: An array with the source node of every edge.
+    :param targets: An array with the target node of every edge.
+    :param num_nodes: The number of nodes in the graph.
+    :return: A two tuple, the indptr and the indices arrays.
+    """
+    order = np.argsort(sources, kind="stable")
+    indices = targets[order].astype(np.int32)
+    counts = np.bincount(sources, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+
+def load_citation_graph(graph_dir: str) -> CitationGraph:
+    """Load a citation graph from disk. The arrays are memory-mapped, so only
+    the pages used are read.
+
+    :param graph_dir: The directory where the graph is stored.
+    :return: The CitationGraph, which is empty if it hasn't been built yet.
+    """
+    metadata_path = os.path.join(graph_dir, METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        return empty_citation_graph()
+
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    return CitationGraph(
+        indptr=np.load(os.path.join(graph_dir, INDPTR_FILE), mmap_mode="r"),
+        indices=np.load(os.path.join(graph_dir, INDICES_FILE), mmap_mode="r"),
+        last_citation_id=metadata["last_citation_id"],
+    )
+
+
+def save_citation_graph(graph: CitationGraph, graph_dir: str) -> None:
+    """Write a citation graph to disk. Every file is written to a temporary
+    path and then renamed, so readers never see a partial graph.
+
+    :param graph: The CitationGraph to save.
+    :param graph_dir: The directory where the graph is stored.
+    :return: None
+    """
+    os.makedirs(graph_dir, exist_ok=True)
+    for file_name, array in (
+        (INDPTR_FILE, graph.indptr),
+        (INDICES_FILE, graph.indices),
+    ):
+        path = os.path.join(graph_dir, file_name)
+        with open(f"{path}.tmp", "wb") as f:
+            np.save(f, array)
+        os.replace(f"{path}.tmp", path)
+
+    # The metadata is written last, it's the marker of a complete graph.
+    path = os.path.join(graph_dir, METADATA_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(
+            {
+                "last_citation_id": graph.last_citation_id,
+                "num_nodes": graph.num_nodes,
+                "num_edges": graph.num_edges,
+            },
+            f,
+        )
+    os.replace(f"{path}.tmp", path)
+
+
+def fetch_new_citations(
+    last_citation_id: int,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Fetch the OpinionsCited rows created after a given row.
+
+    :param last_citation_id: The ID of the last OpinionsCited row already in
+    the graph.
+    :return: A three tuple, the citing opinion IDs, the cited opinion IDs
+    and the ID of the last OpinionsCited row fetched.
+    """
+    chunks = []
+    while True:
+        rows = (
+            OpinionsCited.objects.filter(pk__gt=last_citation_id)
+            .order_by("pk")
+            .values_list("pk", "citing_opinion_id", "cited_opinion_id")
+        )[:EDGES_CHUNK_SIZE]
+        chunk = np.array(list(rows), dtype=np.int64).reshape(-1, 3)
+        if not len(chunk):
+            break
+        chunks.append(chunk)
+        last_citation_id = int(chunk[-1, 0])
+
+    if not chunks:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, last_citation_id
+    edges = np.concatenate(chunks)
+    return edges[:, 1], edges[:, 2], last_citation_id
+
+
+def update_citation_graph(
+    graph_dir: str, rebuild: bool = False
+) -> CitationGraph:
+    """Merge the OpinionsCited rows created since the last update into the
+    citation graph stored on disk.
+
+    Deleted citations are only dropped when the graph is rebuilt.
+
+    :param graph_dir: The directory where the graph is stored.
+    :param rebuild: Whether to discard the stored graph and build it from
+    scratch.
+    :return: The updated CitationGraph.
+    """
+    graph = empty_citation_graph()
+    if not rebuild:
+        graph = load_citation_graph(graph_dir)
+        max_citation_id = OpinionsCited.objects.aggregate(max_id=Max("pk"))[
+            "max_id"
+        ]
+        if graph.last_citation_id > (max_citation_id or 0):
+            # The stored graph doesn't belong to this DB. Start over.
+            graph = empty_citation_graph()
+
+    citing, cited, last_citation_id = fetch_new_citations(
+        graph.last_citation_id
+    )
+    if not len(citing):
+        return graph
+
+    sources = np.concatenate([graph.sources(), citing]).astype(np.int32)
+    targets = np.concatenate([graph.indices, cited]).astype(np.int32)
+    num_nodes = max(graph.num_nodes, int(sources.max()) + 1)
+    if len(targets):
+        num_nodes = max(num_nodes, int(targets.max()) + 1)
+    indptr, indices = build_csr(sources, targets, num_nodes)
+    graph = CitationGraph(
+        indptr=indptr, indices=indices, last_citation_id=last_citation_id
+    )
+    save_citation_graph(graph, graph_dir)
+    return graph
+
+
+def compute_pagerank(
+    graph: CitationGraph,
+    damping: float = 0.85,
+    max_iterations: int = 100,
+    tolerance: float = 1e-10,
+) -> np.ndarray:
+    """Compute the PageRank of every node of a citation graph by power
+    iteration.
+
+    Dangling nodes, the ones that don't cite anything, spread their rank
+    uniformly across the graph, as igraph does.
+
+    :param graph: The CitationGraph.
+    :param damping: The damping factor.
+    :param max_iterations: The maximum number of iterations to run.
+    :param tolerance: Stop when the L1 change between iterations is below
+    this value.
+    :return: An array with the PageRank of every node, indexed by opinion ID.
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return np.zeros(0)
+
+    out_degrees = graph.out_degrees()
+    dangling = out_degrees == 0
+    # Avoid dividing by zero. Dangling nodes are handled separately.
+    safe_degrees = np.where(dangling, 1, out_degrees)
+    indices = np.asarray(graph.indices)
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        contributions = np.repeat(ranks / safe_degrees, out_degrees)
+        new_ranks = np.bincount(indices, weights=contributions, minlength=n)
+        dangling_rank = ranks[dangling].sum()
+        new_ranks = (
+            damping * (new_ranks + dangling_rank / n) + (1 - damping) / n
+        )
+        new_ranks /= new_ranks.sum()
+        delta = np.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        if delta < tolerance:
+            break
+    return ranks
@@ -11,6 +11,8 @@ often described so that we can rank them higher in the results.
 The main outward-facing function is :get_parenthetical_groups, which takes in
 a list of Parenthetical objects and returns a list of ComputedParentheticalGroup
 objects containing those parentheticals and certain metadata about the groups.
+:compute_parenthetical_group_updates does the same incrementally, only
+regrouping the parentheticals that are connected to new ones.
 
 Implementation-wise, we are doing an approximation of Jaccard similarity
 (https://en.wikipedia.org/wiki/Jaccard_index) between the tokens of every
@@ -30,12 +32,14 @@ https://github.com/freelawproject/courtlistener/pull/1941
 """
 
 import re
+from collections import defaultdict
 from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from math import ceil
-from typing import Dict, List, Set
+from typing import Dict, Hashable, Iterable, List, Optional, Set
 
-from datasketch import MinHash, MinHashLSH
+import numpy as np
+from datasketch import LeanMinHash, MinHash, MinHashLSH
 from Stemmer import Stemmer
 
 from cl.lib.stop_words import STOP_WORDS
@@ -71,6 +75,113 @@ class ComputedParentheticalGroup:
     score: float
 
 
+@dataclass
+class ParentheticalGroupUpdates:
+    # The groups computed for the parentheticals connected to new ones
+    new_groups: List[ComputedParentheticalGroup] = field(default_factory=list)
+    # The IDs of the existing groups that the new groups replace
+    replaced_group_ids: Set[int] = field(default_factory=set)
+    # The updated scores of the existing groups that are kept
+    group_scores: Dict[int, float] = field(default_factory=dict)
+
+
+class UnionFind:
+    """A disjoint-set forest, with path compression and union by size, used
+    to find the connected components of the similarity graph without
+    recursion.
+    """
+
+    def __init__(self, nodes: Iterable[Hashable] = ()) -> None:
+        self.parents: Dict[Hashable, Hashable] = {}
+        self.sizes: Dict[Hashable, int] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: Hashable) -> None:
+        if node not in self.parents:
+            self.parents[node] = node
+            self.sizes[node] = 1
+
+    def find(self, node: Hashable) -> Hashable:
+        root = node
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # Compress the path, so the next lookups are O(1)
+        while self.parents[node] != root:
+            self.parents[node], node = root, self.parents[node]
+        return root
+
+    def union(self, node_a: Hashable, node_b: Hashable) -> None:
+        root_a, root_b = self.find(node_a), self.find(node_b)
+        if root_a == root_b:
+            return
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] += self.sizes[root_b]
+
+    def components(self) -> List[List[Hashable]]:
+        """Get the connected components, in the order their nodes were added.
+
+        :return: A list of the components, each one a list of nodes.
+        """
+        components: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for node in self.parents:
+            components[self.find(node)].append(node)
+        return list(components.values())
+
+
+def compute_minhash_signature(text: str) -> bytes:
+    """Compute the MinHash signature of a parenthetical text as a compact
+    array of bytes, so it can be stored and reused.
+
+    :param text: The parenthetical text.
+    :return: The MinHash hash values as bytes.
+    """
+    mhash = deepcopy(_EMPTY_MHASH)
+    tokens = get_parenthetical_tokens(text)
+    mhash.update_batch([gram.encode("utf-8") for gram in tokens])
+    return mhash.hashvalues.astype(np.uint64).tobytes()
+
+
+def get_parenthetical_minhash(par: Parenthetical) -> LeanMinHash:
+    """Get the MinHash of a parenthetical from its stored signature, or
+    compute it if it doesn't have one.
+
+    :param par: The parenthetical.
+    :return: A LeanMinHash that can be inserted in or queried from a
+    MinHashLSH.
+    """
+    signature = getattr(par, "minhash", None)
+    if not signature:
+        signature = compute_minhash_signature(par.text)
+    return LeanMinHash(
+        seed=_EMPTY_MHASH.seed,
+        hashvalues=np.frombuffer(signature, dtype=np.uint64),
+    )
+
+
+def build_similarity_index(
+    parentheticals: List[Parenthetical],
+) -> tuple[MinHashLSH, Dict[str, Parenthetical], Dict[str, LeanMinHash]]:
+    """Insert the MinHashes of a list of parentheticals in a new MinHashLSH.
+
+    :param parentheticals: A list of parentheticals.
+    :return: A three tuple, the MinHashLSH, a dict mapping parenthetical IDs
+    to parentheticals and a dict mapping parenthetical IDs to MinHashes.
+    """
+    similarity_index = deepcopy(_EMPTY_SIMILARITY_INDEX)
+    parenthetical_objects: Dict[str, Parenthetical] = {}
+    parenthetical_minhashes: Dict[str, LeanMinHash] = {}
+    for par in parentheticals:
+        mhash = get_parenthetical_minhash(par)
+        par_key = str(par.id)
+        parenthetical_objects[par_key] = par
+        parenthetical_minhashes[par_key] = mhash
+        similarity_index.insert(par_key, mhash)
+    return similarity_index, parenthetical_objects, parenthetical_minhashes
+
+
 def compute_parenthetical_groups(
     parentheticals: List[Parenthetical],
 ) -> List[ComputedParentheticalGroup]:
@@ -92,44 +203,111 @@ def compute_parenthetical_groups(
     if len(parentheticals) == 0:
         return []
 
-    similarity_index = deepcopy(_EMPTY_SIMILARITY_INDEX)
-    parenthetical_objects: Dict[str, Parenthetical] = {}
-    parenthetical_minhashes: Dict[str, MinHash] = {}
-
-    for par in parentheticals:
-        mhash = deepcopy(_EMPTY_MHASH)
-        tokens = get_parenthetical_tokens(par.text)
-        mhash.update_batch([gram.encode("utf-8") for gram in tokens])
-
-        par_key = str(par.id)
-        parenthetical_objects[par_key] = par
-        parenthetical_minhashes[par_key] = mhash
-        similarity_index.insert(par_key, mhash)
-
+    (
+        similarity_index,
+        parenthetical_objects,
+        parenthetical_minhashes,
+    ) = build_similarity_index(parentheticals)
     similarity_graph = get_similarity_graph(
         parenthetical_minhashes, similarity_index
     )
 
-    parenthetical_groups: List[ComputedParentheticalGroup] = []
-    visited_nodes: Set[str] = set()
-    for node, neighbors in similarity_graph.items():
-        if component := get_graph_component(
-            node, similarity_graph, visited_nodes
-        ):
-            parenthetical_groups.append(
-                get_group_from_component(
-                    component,
-                    parenthetical_objects,
-                    similarity_graph,
-                )
-            )
+    parenthetical_groups: List[ComputedParentheticalGroup] = [
+        get_group_from_component(
+            component,
+            parenthetical_objects,
+            similarity_graph,
+        )
+        for component in get_graph_components(similarity_graph)
+    ]
     return sorted(
         parenthetical_groups, key=lambda group: group.score, reverse=True
     )
 
 
+def compute_parenthetical_group_updates(
+    parentheticals: List[Parenthetical],
+    group_ids: Dict[int, Optional[int]],
+) -> ParentheticalGroupUpdates:
+    """
+    Given all the parentheticals for a case and the groups they already
+    belong to, insert the ungrouped parentheticals into the existing groups.
+
+    Existing groups are taken as connected components of the similarity
+    graph, so only the ungrouped parentheticals are queried for neighbors
+    and merged into them using union-find. Only the groups that end up
+    connected to an ungrouped parenthetical are recomputed, the rest are
+    kept as they are.
+
+    :param parentheticals: A list of all the parentheticals of a case
+    :param group_ids: A dictionary mapping parenthetical IDs to the ID of the
+    existing group they belong to, or None if they're not grouped
+    :return: A ParentheticalGroupUpdates with the groups to create, the
+    existing groups they replace and the new scores of the kept groups.
+    """
+    updates = ParentheticalGroupUpdates()
+    if len(parentheticals) == 0:
+        return updates
+
+    (
+        similarity_index,
+        parenthetical_objects,
+        parenthetical_minhashes,
+    ) = build_similarity_index(parentheticals)
+    union_find = UnionFind(parenthetical_objects)
+
+    # Existing groups are connected components already.
+    group_members: Dict[int, List[str]] = defaultdict(list)
+    new_keys = []
+    for par in parentheticals:
+        par_key = str(par.id)
+        if (group_id := group_ids.get(par.id)) is None:
+            new_keys.append(par_key)
+        else:
+            group_members[group_id].append(par_key)
+    for members in group_members.values():
+        for par_key in members[1:]:
+            union_find.union(members[0], par_key)
+
+    similarity_graph: Graph = {}
+    for par_key in new_keys:
+        neighbors = similarity_index.query(parenthetical_minhashes[par_key])
+        similarity_graph[par_key] = neighbors
+        for neighbor in neighbors:
+            union_find.union(par_key, neighbor)
+
+    affected_roots = {union_find.find(par_key) for par_key in new_keys}
+    for component in union_find.components():
+        if union_find.find(component[0]) not in affected_roots:
+            # An existing group with no new parentheticals. Only its score
+            # changes, since the total number of parentheticals did.
+            group_id = group_ids[int(component[0])]
+            top_score = max(
+                parenthetical_objects[par_key].score for par_key in component
+            )
+            updates.group_scores[group_id] = top_score * (
+                len(component) / len(parenthetical_objects)
+            )
+            continue
+
+        for par_key in component:
+            if par_key not in similarity_graph:
+                similarity_graph[par_key] = similarity_index.query(
+                    parenthetical_minhashes[par_key]
+                )
+            if (group_id := group_ids.get(int(par_key))) is not None:
+                updates.replaced_group_ids.add(group_id)
+        updates.new_groups.append(
+            get_group_from_component(
+                component, parenthetical_objects, similarity_graph
+            )
+        )
+    return updates
+
+
 def get_similarity_graph(
-    parenthetical_minhashes: Dict[str, MinHash], similarity_index: MinHashLSH
+    parenthetical_minhashes: Dict[str, LeanMinHash],
+    similarity_index: MinHashLSH,
 ) -> Graph:
     """
     From the MinHashLSH index, create a dictionary representation of a graph
@@ -166,17 +344,34 @@ def get_graph_component(
     :return: A list of all nodes in param :node's component
     """
     current_cluster = []
-    # Perform a depth-first search to find all nodes in the component
-    if node not in visited:
+    # Perform an iterative depth-first search to find all nodes in the
+    # component, so large components don't exceed the recursion limit.
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
         visited.add(node)
         current_cluster.append(node)
-        for neighbor in graph[node]:
-            current_cluster.extend(
-                get_graph_component(neighbor, graph, visited)
-            )
+        stack.extend(graph[node])
     return current_cluster
 
 
+def get_graph_components(graph: Graph) -> List[List[str]]:
+    """
+    Find all the connected components of a graph using union-find.
+
+    :param graph: A dictionary encoding the graph with key: node and value:
+    list of neighbors
+    :return: A list of the components, each one a list of nodes
+    """
+    union_find = UnionFind(graph)
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            union_find.union(node, neighbor)
+    return union_find.components()
+
+
 def get_group_from_component(
     component: List[str],
     parenthetical_objects: Dict[str, Parenthetical],
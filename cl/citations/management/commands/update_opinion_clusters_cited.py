@@ -0,0 +1,54 @@
+from django.db import connection, transaction
+
+from cl.lib.command_utils import VerboseCommand, logger
+from cl.search.models import OpinionCluster
+
+REBUILD_QUERY = """
+INSERT INTO search_opinionclusterscited
+    (citing_cluster_id, cited_cluster_id, depth)
+SELECT citing.cluster_id, cited.cluster_id, SUM(oc.depth)
+FROM search_opinionscited oc
+    JOIN search_opinion citing ON citing.id = oc.citing_opinion_id
+    JOIN search_opinion cited ON cited.id = oc.cited_opinion_id
+WHERE citing.cluster_id >= %s AND citing.cluster_id < %s
+GROUP BY citing.cluster_id, cited.cluster_id
+"""
+
+
+class Command(VerboseCommand):
+    help = (
+        "Rebuild the cluster-level citations used for the tables of "
+        "authorities from the citations between opinions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=0,
+            help="The cluster ID to start from, to resume a rebuild.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="The number of cluster IDs to rebuild in each transaction.",
+        )
+
+    def handle(self, *args, **options):
+        super().handle(*args, **options)
+        last = OpinionCluster.objects.order_by("-pk").first()
+        if last is None:
+            return
+
+        chunk_size = options["chunk_size"]
+        for start in range(options["start_id"], last.pk + 1, chunk_size):
+            end = start + chunk_size
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM search_opinionclusterscited "
+                    "WHERE citing_cluster_id >= %s AND citing_cluster_id < %s",
+                    [start, end],
+                )
+                cursor.execute(REBUILD_QUERY, [start, end])
+            logger.info("Rebuilt cluster citations up to ID %s", end - 1)
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 
+from collections import defaultdict
 from datetime import datetime
+from functools import partial
 from typing import Dict, Iterable, List, Optional, no_type_check
 
 import waffle
 from django.conf import settings
+from django.db.models import Q
 from elasticsearch_dsl.response import Hit
 from eyecite import resolve_citations
 from eyecite.models import (
@@ -29,19 +32,26 @@ from cl.citations.types import (
 )
 from cl.citations.utils import (
     QUERY_LENGTH,
-    get_years_from_reporter,
+    get_citation_year_range,
     make_name_param,
 )
 from cl.custom_filters.templatetags.text_filters import best_case_name
 from cl.lib.scorched_utils import ExtraSolrInterface, ExtraSolrSearch
 from cl.lib.types import SearchParam
-from cl.search.models import Opinion, RECAPDocument
+from cl.search.models import (
+    PRECEDENTIAL_STATUS,
+    Citation,
+    Opinion,
+    RECAPDocument,
+)
 
 DEBUG = True
 
 
 NO_MATCH_RESOURCE = Resource(case_citation(source_text="UNMATCHED_CITATION"))
 
+CitationKey = tuple[int, str, str]
+
 
 def build_date_range(start_year: int, end_year: int) -> str:
     """Build a date range to be handed off to a solr query."""
@@ -130,18 +140,7 @@ def search_db_for_fullcitation(
             # Eliminate self-cites.
             main_params["fq"].append(f"-id:{full_citation.citing_opinion.pk}")
         # Set up filter parameters
-        if full_citation.year:
-            start_year = end_year = full_citation.year
-        else:
-            start_year, end_year = get_years_from_reporter(full_citation)
-            if (
-                full_citation.citing_opinion is not None
-                and full_citation.citing_opinion.cluster.date_filed
-            ):
-                end_year = min(
-                    end_year,
-                    full_citation.citing_opinion.cluster.date_filed.year,
-                )
+        start_year, end_year = get_citation_year_range(full_citation)
         main_params["fq"].append(
             f"dateFiled:{build_date_range(start_year, end_year)}"
         )
@@ -194,11 +193,117 @@ def filter_by_matching_antecedent(
     return candidates[0] if len(candidates) == 1 else None
 
 
+def get_citation_key(full_citation: FullCaseCitation) -> CitationKey | None:
+    """Get the normalized (volume, reporter, page) of a citation, as it's
+    stored in the Citation table.
+
+    :param full_citation: A FullCaseCitation instance.
+    :return: A three tuple with the volume, reporter and page, or None if the
+    citation can't be looked up in the Citation table.
+    """
+    volume = full_citation.groups.get("volume")
+    page = full_citation.groups.get("page")
+    if not volume or not volume.isdigit() or not page:
+        return None
+    return int(volume), full_citation.corrected_reporter(), page
+
+
+def fetch_citation_candidates(
+    full_citations: Iterable[FullCaseCitation],
+) -> Dict[CitationKey, List[Opinion]]:
+    """Look up the opinions cited by a batch of citations in the Citation
+    table, which is kept in sync with the clusters and indexed on
+    (volume, reporter, page).
+
+    :param full_citations: The FullCaseCitations of a document.
+    :return: A dict mapping citation keys to the opinions whose cluster has
+    that citation.
+    """
+    keys = {
+        key for c in full_citations if (key := get_citation_key(c)) is not None
+    }
+    if not keys:
+        return {}
+
+    lookup = Q()
+    for volume, reporter, page in keys:
+        lookup |= Q(volume=volume, reporter=reporter, page=page)
+    cluster_keys: Dict[int, List[CitationKey]] = defaultdict(list)
+    for volume, reporter, page, cluster_id in Citation.objects.filter(
+        lookup
+    ).values_list("volume", "reporter", "page", "cluster_id"):
+        cluster_keys[cluster_id].append((volume, reporter, page))
+    if not cluster_keys:
+        return {}
+
+    candidates: Dict[CitationKey, List[Opinion]] = defaultdict(list)
+    opinions = (
+        Opinion.objects.filter(cluster_id__in=cluster_keys)
+        .select_related("cluster__docket")
+        # Short form citations are resolved against the citations of the
+        # matched clusters.
+        .prefetch_related("cluster__citations")
+        .order_by("pk")
+    )
+    for opinion in opinions:
+        for key in cluster_keys[opinion.cluster_id]:
+            candidates[key].append(opinion)
+    return candidates
+
+
+def filter_citation_candidates(
+    full_citation: FullCaseCitation,
+    candidates: List[Opinion],
+) -> List[Opinion]:
+    """Apply the same filters used by the citation search queries to the
+    candidate opinions of a citation, in memory.
+
+    :param full_citation: A FullCaseCitation instance.
+    :param candidates: The opinions whose cluster has the citation.
+    :return: The candidates that could be cited by the citation.
+    """
+    citing_opinion = getattr(full_citation, "citing_opinion", None)
+    start_year, end_year = get_citation_year_range(full_citation)
+    court_id = full_citation.metadata.court
+    return [
+        o
+        for o in candidates
+        # Non-precedential documents aren't cited
+        if o.cluster.precedential_status == PRECEDENTIAL_STATUS.PUBLISHED
+        # Eliminate self-cites.
+        and (citing_opinion is None or o.pk != citing_opinion.pk)
+        and o.cluster.date_filed
+        and start_year <= o.cluster.date_filed.year <= end_year
+        and (not court_id or o.cluster.docket.court_id == court_id)
+    ]
+
+
 def resolve_fullcase_citation(
     full_citation: FullCaseCitation,
+    citation_candidates: Dict[CitationKey, List[Opinion]] | None = None,
 ) -> MatchedResourceType:
+    """Resolve a full citation to an Opinion.
+
+    :param full_citation: The citation to resolve.
+    :param citation_candidates: Optional, the candidates of the document
+    citations, as returned by fetch_citation_candidates. If provided, the
+    citation is resolved from them, and search is only used when more than
+    one candidate matches.
+    :return: The cited Opinion, or NO_MATCH_RESOURCE.
+    """
     # Case 1: FullCaseCitation
     if type(full_citation) is FullCaseCitation:
+        key = get_citation_key(full_citation)
+        if citation_candidates is not None and key is not None:
+            matches = filter_citation_candidates(
+                full_citation, citation_candidates.get(key, [])
+            )
+            if len(matches) == 1:
+                return matches[0]
+            if not matches:
+                return NO_MATCH_RESOURCE
+            # Ambiguous, let search refine it using the case name.
+
         db_search_results: SolrResponse | list[Hit]
         if waffle.switch_is_active("es_resolve_citations"):
             # Revolve citations using ES; enable once all the opinions are
@@ -284,10 +389,17 @@ def do_resolve_citations(
             else:
                 raise "Unknown citing type."
 
+    # Look up every full citation in a single batch
+    citation_candidates = fetch_citation_candidates(
+        c for c in citations if type(c) is FullCaseCitation
+    )
+
     # Call and return eyecite's resolve_citations() function
     return resolve_citations(
         citations=citations,
-        resolve_full_citation=resolve_fullcase_citation,
+        resolve_full_citation=partial(
+            resolve_fullcase_citation, citation_candidates=citation_candidates
+        ),
         resolve_shortcase_citation=resolve_shortcase_citation,
         resolve_supra_citation=resolve_supra_citation,
     )
@@ -9,7 +9,7 @@ from eyecite.models import FullCaseCitation
 from cl.citations.types import SupportedCitationType
 from cl.citations.utils import (
     QUERY_LENGTH,
-    get_years_from_reporter,
+    get_citation_year_range,
     make_name_param,
 )
 from cl.search.documents import OpinionDocument
@@ -147,18 +147,7 @@ def es_search_db_for_full_citation(
         # Eliminate self-cites.
         must_not.append(Q("match", id=full_citation.citing_opinion.pk))
     # Set up filter parameters
-    if full_citation.year:
-        start_year = end_year = full_citation.year
-    else:
-        start_year, end_year = get_years_from_reporter(full_citation)
-        if (
-            full_citation.citing_opinion is not None
-            and full_citation.citing_opinion.cluster.date_filed
-        ):
-            end_year = min(
-                end_year,
-                full_citation.citing_opinion.cluster.date_filed.year,
-            )
+    start_year, end_year = get_citation_year_range(full_citation)
 
     filters.append(
         Q(
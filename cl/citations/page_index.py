@@ -0,0 +1,145 @@
+import bisect
+import re
+
+import natsort
+from django.core.cache import caches
+
+from cl.lib.crypto import sha256
+from cl.search.models import Citation, Opinion
+
+VOLUME_PAGE_INDEX_TTL = 60 * 60 * 24 * 7
+PAGE_MARKERS_TTL = 60 * 60 * 24 * 30
+
+# Star pagination markers, like *123 or *45a, in the opinion HTML.
+PAGE_MARKER_RE = re.compile(r"\*(\w+)")
+
+natsort_key = natsort.natsort_keygen()
+
+
+def make_volume_page_index_cache_key(reporter: str, volume: int | str) -> str:
+    # Reporters contain spaces and dots, which aren't valid in cache keys.
+    return f"volume-page-index:{sha256(f'{reporter}:{volume}')}"
+
+
+def make_page_markers_cache_key(opinion_id: int) -> str:
+    return f"opinion-page-markers:{opinion_id}"
+
+
+async def get_volume_page_index(
+    reporter: str, volume: int | str
+) -> list[tuple[str, int]]:
+    """Get the pages of the citations in a reporter volume, naturally sorted
+    by page, with the cluster they belong to.
+
+    The index is cached until a citation of the volume changes.
+
+    :param reporter: The reporter of the volume.
+    :param volume: The volume number.
+    :return: A list of (page, cluster ID) tuples.
+    """
+    cache_key = make_volume_page_index_cache_key(reporter, volume)
+    cache = caches["db_cache"]
+    page_index = await cache.aget(cache_key)
+    if page_index is not None:
+        return page_index
+
+    citations = Citation.objects.filter(
+        reporter=reporter, volume=volume
+    ).values_list("page", "cluster_id")
+    page_index = natsort.natsorted(
+        [row async for row in citations], key=lambda row: row[0]
+    )
+    await cache.aset(cache_key, page_index, VOLUME_PAGE_INDEX_TTL)
+    return page_index
+
+
+def invalidate_volume_page_index(reporter: str, volume: int | str) -> None:
+    """Remove the cached page index of a reporter volume.
+
+    :param reporter: The reporter of the volume.
+    :param volume: The volume number.
+    :return: None
+    """
+    caches["db_cache"].delete(
+        make_volume_page_index_cache_key(reporter, volume)
+    )
+
+
+async def find_preceding_cluster_id(
+    reporter: str, volume: int | str, page: str
+) -> int | None:
+    """Find the cluster of the citation at or immediately before a page in a
+    reporter volume. That's the cluster a pincite to the page most likely
+    belongs to.
+
+    :param reporter: The reporter of the volume.
+    :param volume: The volume number.
+    :param page: The page cited.
+    :return: The ID of the cluster, or None if no citation of the volume
+    starts at or before the page.
+    """
+    page_index = await get_volume_page_index(reporter, volume)
+    position = bisect.bisect_right(
+        page_index, natsort_key(page), key=lambda row: natsort_key(row[0])
+    )
+    if position == 0:
+        return None
+    return page_index[position - 1][1]
+
+
+def extract_page_markers(html: str) -> set[str]:
+    """Extract the star pagination markers of an opinion.
+
+    :param html: The HTML of the opinion.
+    :return: A set with the pages of the markers.
+    """
+    return set(PAGE_MARKER_RE.findall(html))
+
+
+def invalidate_page_markers(opinion_id: int) -> None:
+    """Remove the cached star pagination markers of an opinion.
+
+    :param opinion_id: The ID of the opinion.
+    :return: None
+    """
+    caches["db_cache"].delete(make_page_markers_cache_key(opinion_id))
+
+
+async def cluster_has_page_marker(cluster_id: int, page: str) -> bool:
+    """Check if any of the opinions of a cluster has a star pagination marker
+    for a page.
+
+    The markers of an opinion are extracted and cached the first time they're
+    needed, and invalidated when citations are found in the opinion again.
+
+    :param cluster_id: The ID of the cluster.
+    :param page: The page to look for.
+    :return: True if the cluster has a marker for the page, otherwise False.
+    """
+    cache = caches["db_cache"]
+    opinion_ids = [
+        pk
+        async for pk in Opinion.objects.filter(
+            cluster_id=cluster_id
+        ).values_list("pk", flat=True)
+    ]
+    cache_keys = {make_page_markers_cache_key(pk): pk for pk in opinion_ids}
+    cached_markers = await cache.aget_many(cache_keys)
+    if any(page in markers for markers in cached_markers.values()):
+        return True
+
+    missing_ids = [
+        pk for key, pk in cache_keys.items() if key not in cached_markers
+    ]
+    async for opinion in Opinion.objects.filter(pk__in=missing_ids).only(
+        "pk", "html_with_citations"
+    ):
+        page_markers = extract_page_markers(opinion.html_with_citations)
+        await cache.aset(
+            make_page_markers_cache_key(opinion.pk),
+            page_markers,
+            PAGE_MARKERS_TTL,
+        )
+        if page in page_markers:
+            return True
+    return False
@@ -2,8 +2,12 @@ from asgiref.sync import sync_to_async
 from django.db import transaction
 from django.db.models import QuerySet
 
-from cl.citations.group_parentheticals import compute_parenthetical_groups
-from cl.search.models import OpinionCluster, ParentheticalGroup
+from cl.citations.group_parentheticals import (
+    compute_minhash_signature,
+    compute_parenthetical_group_updates,
+)
+from cl.search.models import OpinionCluster, Parenthetical, ParentheticalGroup
+from cl.search.tasks import update_parenthetical_group_scores
 
 
 async def get_or_create_parenthetical_groups(
@@ -29,21 +33,67 @@ def atomic_create_parenthetical_groups(cluster: OpinionCluster) -> None:
 
 def create_parenthetical_groups(cluster: OpinionCluster) -> None:
     """
-    Given a cluster, (re)computes the parenthetical groups for its parentheticals
-    and stores them in the database
+    Given a cluster, inserts its ungrouped parentheticals into its existing
+    parenthetical groups and stores the changes in the database
+
+    Parentheticals without a stored MinHash signature get one, so the next
+    time the cluster is grouped their text doesn't need to be hashed again.
+    Groups whose size doesn't match their parentheticals anymore, because
+    some were deleted, are recomputed from scratch.
 
     :param cluster: An OpinionCluster object
     """
     parentheticals = list(cluster.parentheticals)
-    computed_groups = compute_parenthetical_groups(parentheticals)
-    # Delete existing parenthetical groups for this cluster
-    cluster.parenthetical_groups.delete()
-    for cg in computed_groups:
+    missing_signatures = []
+    for par in parentheticals:
+        if not par.minhash:
+            par.minhash = compute_minhash_signature(par.text)
+            missing_signatures.append(par)
+    Parenthetical.objects.bulk_update(
+        missing_signatures, ["minhash"], batch_size=1000
+    )
+
+    group_sizes = dict(cluster.parenthetical_groups.values_list("pk", "size"))
+    group_counts: dict[int, int] = {}
+    for par in parentheticals:
+        if par.group_id is not None:
+            group_counts[par.group_id] = group_counts.get(par.group_id, 0) + 1
+    stale_group_ids = {
+        group_id
+        for group_id, size in group_sizes.items()
+        if group_counts.get(group_id) != size
+    }
+    group_ids = {
+        par.id: None if par.group_id in stale_group_ids else par.group_id
+        for par in parentheticals
+    }
+    updates = compute_parenthetical_group_updates(parentheticals, group_ids)
+
+    # Delete the parenthetical groups that are recomputed
+    ParentheticalGroup.objects.filter(
+        pk__in=updates.replaced_group_ids | stale_group_ids
+    ).delete()
+    for cg in updates.new_groups:
         group_to_create = ParentheticalGroup(
-            opinion=cg.representative.described_opinion,
+            opinion_id=cg.representative.described_opinion_id,
             representative=cg.representative,
             score=cg.score,
             size=cg.size,
         )
         group_to_create.save()
         group_to_create.parentheticals.set(cg.parentheticals)
+
+    ParentheticalGroup.objects.bulk_update(
+        [
+            ParentheticalGroup(pk=group_id, score=score)
+            for group_id, score in updates.group_scores.items()
+        ],
+        ["score"],
+        batch_size=1000,
+    )
+    if updates.group_scores:
+        # bulk_update doesn't trigger the ES signal processor.
+        group_ids = list(updates.group_scores)
+        transaction.on_commit(
+            lambda: update_parenthetical_group_scores.delay(group_ids)
+        )
@@ -16,14 +16,17 @@ from cl.citations.filter_parentheticals import (
     clean_parenthetical_text,
     is_parenthetical_descriptive,
 )
+from cl.citations.group_parentheticals import compute_minhash_signature
 from cl.citations.match_citations import (
     NO_MATCH_RESOURCE,
     do_resolve_citations,
 )
+from cl.citations.page_index import invalidate_page_markers
 from cl.citations.parenthetical_utils import create_parenthetical_groups
 from cl.citations.recap_citations import store_recap_citations
 from cl.citations.score_parentheticals import parenthetical_score
 from cl.citations.types import MatchedResourceType, SupportedCitationType
+from cl.citations.utils import update_opinion_clusters_cited
 from cl.search.models import (
     Opinion,
     OpinionCluster,
@@ -204,6 +207,7 @@ def store_opinion_citations_and_update_parentheticals(
                         described_opinion_id=_opinion.pk,
                         text=clean,
                         score=parenthetical_score(clean, opinion.cluster),
+                        minhash=compute_minhash_signature(clean),
                     )
                 )
 
@@ -240,16 +244,26 @@ def store_opinion_citations_and_update_parentheticals(
         )
         Parenthetical.objects.bulk_create(parentheticals)
 
-        # Update parenthetical groups for clusters that we have added
-        # parentheticals for from this opinion
-        for cluster_id in clusters_to_update_par_groups_for:
-            create_parenthetical_groups(
-                OpinionCluster.objects.get(pk=cluster_id)
-            )
+        # Rebuild the cluster-level citations of the citing cluster, used for
+        # its table of authorities.
+        update_opinion_clusters_cited(opinion.cluster_id)
 
         # Save all the changes to the citing opinion (send to solr later)
         opinion.save(index=False)
 
+    # The star pagination markers of the old HTML, used to confirm pincites
+    # to the opinion, are extracted again when they're needed.
+    invalidate_page_markers(opinion.pk)
+
+    # Update parenthetical groups for clusters that we have added
+    # parentheticals for from this opinion. This is done outside the
+    # transaction above, so the citation rows aren't locked while grouping.
+    for cluster in OpinionCluster.objects.filter(
+        pk__in=clusters_to_update_par_groups_for
+    ):
+        with transaction.atomic():
+            create_parenthetical_groups(cluster)
+
     # Update changes in ES.
     cluster_ids_to_update = list(
         opinion_clusters_to_update.values_list("id", flat=True)
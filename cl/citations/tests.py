@@ -2,8 +2,9 @@ import itertools
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import List, Tuple
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from asgiref.sync import async_to_sync
 from django.core.management import call_command
 from django.urls import reverse
 from eyecite import get_citations
@@ -27,6 +28,7 @@ from cl.citations.filter_parentheticals import (
     is_parenthetical_descriptive,
 )
 from cl.citations.group_parentheticals import (
+    compute_parenthetical_group_updates,
     compute_parenthetical_groups,
     get_graph_component,
     get_parenthetical_tokens,
@@ -46,6 +48,7 @@ from cl.citations.tasks import (
     find_citations_and_parentheticals_for_opinion_by_pks,
     store_recap_citations,
 )
+from cl.citations.utils import get_citation_depth_between_clusters
 from cl.lib.test_helpers import (
     CourtTestCase,
     IndexedSolrTestCase,
@@ -65,6 +68,7 @@ from cl.search.models import (
     SEARCH_TYPES,
     Opinion,
     OpinionCluster,
+    OpinionClustersCited,
     OpinionsCited,
     OpinionsCitedByRECAPDocument,
     Parenthetical,
@@ -794,6 +798,42 @@ class CitationObjectTest(ESIndexTestCase, TestCase):
         results = resolve_fullcase_citation(citation)
         self.assertEqual(NO_MATCH_RESOURCE, results)
 
+    def test_resolve_citations_in_batch(self) -> None:
+        """Are full citations resolved from the Citation table in a single
+        batch, without search queries?
+        """
+        opinion1 = Opinion.objects.get(cluster__pk=self.citation1.cluster_id)
+        opinion2 = Opinion.objects.get(cluster__pk=self.citation2.cluster_id)
+        full1 = case_citation(
+            volume="1",
+            reporter="U.S.",
+            page="1",
+            index=1,
+            reporter_found="U.S.",
+            metadata={"court": "scotus"},
+        )
+        full2 = case_citation(
+            volume="2",
+            reporter="F.3d",
+            page="2",
+            index=1,
+            reporter_found="F.3d",
+            metadata={"court": "ca1"},
+        )
+        citing_opinion = Opinion.objects.select_related("cluster").get(
+            cluster__pk=self.citation3.cluster_id
+        )
+        with patch(
+            "cl.citations.match_citations.search_db_for_fullcitation"
+        ) as search_mock, self.assertNumQueries(3):
+            citation_resolutions = do_resolve_citations(
+                [full1, full2], citing_opinion
+            )
+        search_mock.assert_not_called()
+        self.assertEqual(
+            citation_resolutions, {opinion1: [full1], opinion2: [full2]}
+        )
+
     def test_citation_increment(self) -> None:
         """Make sure that found citations update the increment on the cited
         opinion's citation count"""
@@ -884,6 +924,36 @@ class CitationObjectTest(ESIndexTestCase, TestCase):
                         1,
                     )
 
+    def test_opinion_clusters_cited_creation(self) -> None:
+        """Are the cluster-level citations stored with the summed depth, and
+        used for the table of authorities?"""
+        opinion1 = Opinion.objects.get(cluster__pk=self.citation1.cluster_id)
+        opinion2 = Opinion.objects.get(cluster__pk=self.citation2.cluster_id)
+        opinion5 = Opinion.objects.get(cluster__pk=self.citation5.cluster_id)
+        find_citations_and_parentheticals_for_opinion_by_pks.delay(
+            [opinion5.pk]
+        )
+
+        self.assertEqual(
+            OpinionClustersCited.objects.get(
+                citing_cluster=opinion5.cluster,
+                cited_cluster=opinion1.cluster,
+            ).depth,
+            3,
+        )
+        cluster = opinion5.cluster
+        with self.assertNumQueries(1):
+            authorities = async_to_sync(cluster.aauthorities_with_data)()
+        self.assertEqual(authorities[0], opinion2.cluster)
+        self.assertEqual(authorities[0].citation_depth, 6)
+        self.assertEqual(cluster.authority_count, 3)
+        self.assertEqual(
+            async_to_sync(get_citation_depth_between_clusters)(
+                cluster.pk, opinion1.cluster_id
+            ),
+            3,
+        )
+
     def test_no_duplicate_parentheticals_from_parallel_cites(self) -> None:
         citing = Opinion.objects.get(cluster__pk=self.citation4.cluster_id)
         cited = Opinion.objects.get(cluster__pk=self.citation1.cluster_id)
@@ -1561,6 +1631,39 @@ class GroupParentheticalsTest(SimpleTestCase):
                     f"Got incorrect result from get_parenthetical_groups for: {groups}",
                 )
 
+    def test_compute_parenthetical_group_updates(self):
+        """
+        Tests whether compute_parenthetical_group_updates inserts new
+        parentheticals into the existing groups they're similar to and keeps
+        the groups that didn't change.
+        """
+        text = (
+            "The loss of First Amendment freedoms, for even minimal period of "
+            "time, unquestionably constitutes irreparable injury."
+        )
+        pars = [
+            DummyParenthetical(text=text, id=1, score=0.9),
+            DummyParenthetical(text=text, id=2, score=0.5),
+            DummyParenthetical(
+                text="Holding public employees could not be fired because "
+                "of their politics",
+                id=3,
+                score=0.4,
+            ),
+            DummyParenthetical(text=text, id=4, score=0.1),
+        ]
+        group_ids = {1: 100, 2: 100, 3: 101, 4: None}
+        updates = compute_parenthetical_group_updates(pars, group_ids)
+
+        self.assertEqual(updates.replaced_group_ids, {100})
+        self.assertEqual(
+            [set(g.parentheticals) for g in updates.new_groups],
+            [{pars[0], pars[1], pars[3]}],
+        )
+        self.assertEqual(updates.new_groups[0].representative, pars[0])
+        # The kept group only gets its score updated.
+        self.assertEqual(updates.group_scores, {101: 0.4 * 1 / 4})
+
     def test_get_representative_parenthetical(self):
         """
         Tests whether get_representative parenthetical identifies the correct
@@ -3,6 +3,7 @@ from datetime import date
 from django.apps import (  # Must use apps.get_model() to avoid circular import issue
     apps,
 )
+from django.db import transaction
 from django.db.models import Sum
 from eyecite.models import FullCaseCitation
 from eyecite.utils import strip_punct
@@ -35,8 +36,8 @@ async def get_citation_depth_between_clusters(
 ) -> int:
     """OpinionsCited objects exist as relationships between Opinion objects,
     but we often want access to citation depth information between
-    OpinionCluster objects. This helper method assists in doing the necessary
-    DB lookup.
+    OpinionCluster objects. This helper method looks it up in their
+    denormalized OpinionClustersCited row.
 
     :param citing_cluster_pk: The primary key of the citing OpinionCluster
     :param cited_cluster_pk: The primary key of the cited OpinionCluster
@@ -44,12 +45,64 @@ async def get_citation_depth_between_clusters(
         associated with the Opinion objects associated with the given
         OpinionCited objects
     """
+    depths = await get_citation_depths_to_cluster(
+        [citing_cluster_pk], cited_cluster_pk
+    )
+    return depths.get(citing_cluster_pk)
+
+
+async def get_citation_depths_to_cluster(
+    citing_cluster_pks: list[int], cited_cluster_pk: int
+) -> dict[int, int]:
+    """Get the citation depths between many citing clusters and a cited
+    cluster in a single query.
+
+    :param citing_cluster_pks: The primary keys of the citing OpinionClusters
+    :param cited_cluster_pk: The primary key of the cited OpinionCluster
+    :return: A dict mapping the citing clusters that cite the cited cluster
+        to their citation depth
+    """
+    OpinionClustersCited = apps.get_model("search.OpinionClustersCited")
+    edges = OpinionClustersCited.objects.filter(
+        citing_cluster_id__in=citing_cluster_pks,
+        cited_cluster_id=cited_cluster_pk,
+    ).values_list("citing_cluster_id", "depth")
+    return {
+        citing_cluster_pk: depth async for citing_cluster_pk, depth in edges
+    }
+
+
+def update_opinion_clusters_cited(citing_cluster_pk: int) -> None:
+    """Rebuild the OpinionClustersCited rows of a citing cluster from the
+    OpinionsCited rows of its sub-opinions.
+
+    :param citing_cluster_pk: The primary key of the citing OpinionCluster
+    :return: None
+    """
     OpinionsCited = apps.get_model("search.OpinionsCited")
-    result = await OpinionsCited.objects.filter(
-        citing_opinion__cluster__pk=citing_cluster_pk,
-        cited_opinion__cluster__pk=cited_cluster_pk,
-    ).aaggregate(depth=Sum("depth"))
-    return result["depth"]
+    OpinionClustersCited = apps.get_model("search.OpinionClustersCited")
+    depths = (
+        OpinionsCited.objects.filter(
+            citing_opinion__cluster_id=citing_cluster_pk
+        )
+        .values("cited_opinion__cluster_id")
+        .annotate(depth=Sum("depth"))
+        .order_by()
+    )
+    with transaction.atomic():
+        OpinionClustersCited.objects.filter(
+            citing_cluster_id=citing_cluster_pk
+        ).delete()
+        OpinionClustersCited.objects.bulk_create(
+            [
+                OpinionClustersCited(
+                    citing_cluster_id=citing_cluster_pk,
+                    cited_cluster_id=row["cited_opinion__cluster_id"],
+                    depth=row["depth"],
+                )
+                for row in depths
+            ]
+        )
 
 
 def get_years_from_reporter(
@@ -68,6 +121,26 @@ def get_years_from_reporter(
     return start_year, end_year
 
 
+def get_citation_year_range(
+    full_citation: FullCaseCitation,
+) -> tuple[int, int]:
+    """Get the range of years in which the case cited by a citation could've
+    been filed, using its year, its reporter or the date of the citing
+    opinion.
+
+    :param full_citation: A FullCaseCitation instance.
+    :return: A two tuple, the start year and the end year.
+    """
+    if full_citation.year:
+        return full_citation.year, full_citation.year
+
+    start_year, end_year = get_years_from_reporter(full_citation)
+    citing_opinion = getattr(full_citation, "citing_opinion", None)
+    if citing_opinion is not None and citing_opinion.cluster.date_filed:
+        end_year = min(end_year, citing_opinion.cluster.date_filed.year)
+    return start_year, end_year
+
+
 def make_name_param(
     defendant: str,
     plaintiff: str | None = None,
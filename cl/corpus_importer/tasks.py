@@ -1075,7 +1075,7 @@ def do_case_query_by_pacer_case_id(
     async_to_sync(update_docket_metadata)(d, docket_data)
     d.save()
 
-    add_tags_to_objs(tag_names, [d])
+    async_to_sync(add_tags_to_objs)(tag_names, [d])
 
     # Add the HTML to the docket in case we need it someday.
     pacer_file = PacerHtmlFiles(
@@ -1839,9 +1839,7 @@ def add_tags(rd: RECAPDocument, tag_name: Optional[str]) -> None:
     """
     if tag_name is not None:
         tag, _ = Tag.objects.get_or_create(name=tag_name)
-        tag.tag_object(rd.docket_entry.docket)
-        tag.tag_object(rd.docket_entry)
-        tag.tag_object(rd)
+        tag.tag_objects([rd.docket_entry.docket, rd.docket_entry, rd])
 
 
 @app.task(
@@ -13,8 +13,10 @@ from timeout_decorator import timeout_decorator
 
 from cl.favorites.factories import NoteFactory
 from cl.favorites.models import DocketTag, Note, UserTag
+from cl.lib.redis_utils import make_redis_interface
 from cl.lib.test_helpers import AudioTestCase, SimpleUserDataMixin
 from cl.search.views import get_homepage_stats
+from cl.stats.homepage import HOMEPAGE_STATS_KEY
 from cl.tests.base import SELENIUM_TIMEOUT, BaseSeleniumTest
 from cl.tests.cases import APITestCase, TestCase
 from cl.tests.utils import make_client
@@ -86,6 +88,7 @@ class UserNotesTest(BaseSeleniumTest):
 
     def setUp(self) -> None:
         get_homepage_stats.invalidate()
+        make_redis_interface("STATS").delete(HOMEPAGE_STATS_KEY)
         self.f = NoteFactory.create(
             user__username="pandora",
             user__password=make_password("password"),
@@ -1,6 +1,7 @@
 import functools
 import inspect
 import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Callable, Final, List
 
@@ -57,67 +58,183 @@ def make_queue_name_for_pri(queue: str, pri: int) -> str:
     )
 
 
-def get_queue_length(queue_name: str = "celery") -> int:
-    """Get the number of tasks in a celery queue.
+def get_queue_length(
+    queue_name: str | list[str] = "celery",
+    priorities: list[int] | None = None,
+) -> int:
+    """Get the number of tasks in one or more celery queues.
 
-    :param queue_name: The name of the queue you want to inspect.
-    :return: the number of items in the queue.
+    :param queue_name: The name of the queue you want to inspect, or a list
+    of queue names to add up.
+    :param priorities: The priorities to inspect. Defaults to all of them.
+    :return: the number of items in the queues.
     """
-    priority_names = [
-        make_queue_name_for_pri(queue_name, pri)
-        for pri in DEFAULT_PRIORITY_STEPS
-    ]
+    queue_names = [queue_name] if isinstance(queue_name, str) else queue_name
+    if priorities is None:
+        priorities = DEFAULT_PRIORITY_STEPS
     r = make_redis_interface("CELERY")
-    return sum(r.llen(x) for x in priority_names)
+    pipe = r.pipeline()
+    for queue in queue_names:
+        for pri in priorities:
+            pipe.llen(make_queue_name_for_pri(queue, pri))
+    return sum(pipe.execute())
+
+
+@dataclass
+class ThrottleStats:
+    """Throughput telemetry of a CeleryThrottle."""
+
+    items: int = 0
+    sleeps: int = 0
+    seconds_slept: float = 0.0
+    queue_length: int = 0
+    # Tasks drained from the queue per second, smoothed across measurements.
+    drain_rate: float | None = None
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def throughput(self) -> float:
+        """The number of items let through per second since the start."""
+        elapsed = time.monotonic() - self.started_at
+        return self.items / elapsed if elapsed > 0 else 0.0
 
 
 class CeleryThrottle:
-    """A class for throttling celery."""
+    """A class for throttling celery.
+
+    The throttle measures how fast the workers drain the queue from the
+    changes in its length between measurements. It uses that rate to pick how
+    many tasks to keep queued, so the workers don't starve before the next
+    measurement, and how long to sleep until the queue runs low.
+    """
+
+    # Bounds of a single sleep, in seconds.
+    min_sleep: Final = 0.1
+    # Weight of the latest drain rate measurement in the smoothed rate.
+    smoothing: Final = 0.3
 
     def __init__(
         self,
         poll_interval: float = 3.0,
         min_items: int = 50,
-        queue_name: str = "celery",
+        queue_name: str | list[str] = "celery",
+        priorities: list[int] | None = None,
+        max_items: int | None = None,
     ) -> None:
         """Create a throttle to prevent celery runaways.
 
-        :param poll_interval: How long to wait between polling the queue
+        :param poll_interval: The longest to wait between polling the queue
         length in seconds, when you know it's greater than the min length.
-        :param min_items: Generally keep the queue longer than this, and
-        always shorter than 2× this value.
+        :param min_items: Generally keep the queue longer than this. Until the
+        drain rate is known, keep it shorter than 2× this value.
+        :param queue_name: The queue to throttle, or a list of queues that
+        share the same workers.
+        :param priorities: The priorities of the queues to measure. Defaults
+        to all of them.
+        :param max_items: Never fill the queue past this value, however fast
+        it's drained. Defaults to 20× min_items.
         """
-        # All these variables are Final, i.e., they're consts. The only
-        # instance variable that changes is the shortage variable below.
+        # All these variables are Final, i.e., they're consts. Besides the
+        # measurements below, the only instance variables that change are
+        # the target and shortage variables.
         self.min: Final = min_items
-        self.max: Final = min_items * 2
+        self.max: Final = max_items or min_items * 20
         self.poll_interval: Final = poll_interval
         self.queue_name: Final = queue_name
+        self.priorities: Final = priorities
+        self.stats = ThrottleStats()
+
+        # `target` is the queue length to refill up to. It starts at 2× the
+        # min and follows the drain rate once that's measured.
+        self.target = min(min_items * 2, self.max)
 
         # `shortage` stores the number of items that the queue is short by, as
-        # compared to `self.max`. At init, the queue is empty, so it's short
-        # by the full amount. Fill it up.
-        self.shortage = self.max
+        # compared to `self.target`. At init, the queue is empty, so it's
+        # short by the full amount. Fill it up.
+        self.shortage = self.target
+
+        # The queue length at the last measurement, and the items added to
+        # the queue since then.
+        self._last_length = 0
+        self._last_measured_at = time.monotonic()
+        self._enqueued = 0
+
+    def _measure(self) -> int:
+        """Measure the queue length and update the drain rate and the target
+        queue length with it.
+
+        :return: The length of the queue.
+        """
+        queue_length = get_queue_length(self.queue_name, self.priorities)
+        measured_at = time.monotonic()
+        elapsed = measured_at - self._last_measured_at
+        drained = self._last_length + self._enqueued - queue_length
+        # A negative count means something else is adding to the queue, so
+        # the rate can't be measured this time.
+        if elapsed > 0 and drained >= 0:
+            rate = drained / elapsed
+            if self.stats.drain_rate is not None:
+                rate = (
+                    self.smoothing * rate
+                    + (1 - self.smoothing) * self.stats.drain_rate
+                )
+            self.stats.drain_rate = rate
+            # Keep enough tasks queued to keep the workers busy for two poll
+            # intervals, in case the next measurement comes late.
+            self.target = max(
+                self.min * 2,
+                min(round(rate * self.poll_interval * 2), self.max),
+            )
+
+        self._last_length = queue_length
+        self._last_measured_at = measured_at
+        self._enqueued = 0
+        self.stats.queue_length = queue_length
+        return queue_length
+
+    def _get_sleep_interval(self, queue_length: int) -> float:
+        """Compute how long it'll take the workers to drain the queue down to
+        the min length.
+
+        :param queue_length: The current length of the queue.
+        :return: The number of seconds to sleep, never longer than the poll
+        interval.
+        """
+        if not self.stats.drain_rate:
+            return self.poll_interval
+        interval = (queue_length - self.min) / self.stats.drain_rate
+        return max(self.min_sleep, min(interval, self.poll_interval))
 
     def maybe_wait(self) -> None:
         """Make the user wait until the queue is short enough"""
         self.shortage -= 1
         if self.shortage > 0:
             # No need to sleep. Add items to the queue.
+            self._let_through()
             return
 
         # No shortage we know of. Measure the queue to see if it's below
         # self.min. If so, we have a shortage that we should rectify.
         while True:
-            queue_length = get_queue_length(self.queue_name)
+            queue_length = self._measure()
             if queue_length > self.min:
-                # The queue is still pretty full. Let it process a bit.
-                time.sleep(self.poll_interval)
+                # The queue is still pretty full. Let it process until it
+                # should be low again.
+                interval = self._get_sleep_interval(queue_length)
+                time.sleep(interval)
+                self.stats.sleeps += 1
+                self.stats.seconds_slept += interval
             else:
                 # Refill the queue. As Michelle Obama says, when it goes low,
                 # we go high.
-                self.shortage = self.max - queue_length
+                self.shortage = self.target - queue_length
                 break
+        self._let_through()
+
+    def _let_through(self) -> None:
+        """Count an item that the caller is about to add to the queue."""
+        self.stats.items += 1
+        self._enqueued += 1
 
 
 def throttle_task(rate: str, key: str | None = None) -> Callable:
@@ -1,3 +1,4 @@
+import json
 import logging
 import operator
 import re
@@ -27,6 +28,7 @@ from elasticsearch_dsl.response import Hit, Response
 from elasticsearch_dsl.utils import AttrDict
 
 from cl.lib.bot_detector import is_bot
+from cl.lib.crypto import sha256
 from cl.lib.date_time import midnight_pt
 from cl.lib.paginators import ESPaginator
 from cl.lib.types import (
@@ -1474,13 +1476,50 @@ def clean_count_query(search_query: Search) -> SearchDSL:
     return search_query
 
 
+def get_track_total_hits() -> bool | int:
+    """Get the track_total_hits value for the count queries.
+
+    :return: The approximate counts threshold if it's enabled, otherwise True
+    to count all the hits.
+    """
+    return settings.ELASTICSEARCH_APPROXIMATE_COUNT_THRESHOLD or True
+
+
+def is_count_approximate(relation: str | None) -> bool:
+    """Check if a total returned by a count query stopped at the approximate
+    counts threshold, so the actual total can be greater.
+
+    :param relation: The hits.total.relation of the count response, or None
+    if there was no count query.
+    :return: True if the total is a lower bound, otherwise False.
+    """
+    return relation == "gte"
+
+
+def make_es_count_cache_key(count_queries: list[SearchDSL]) -> str:
+    """Compose the cache key of the totals of a search from its count
+    queries, which don't contain the pagination, sorting or highlighting.
+
+    :param count_queries: The ES Search objects of the count queries.
+    :return: The cache key as a string.
+    """
+    queries = [
+        {"index": count_query._index, "body": count_query.to_dict()}
+        for count_query in count_queries
+    ]
+    queries_hash = sha256(json.dumps(queries, sort_keys=True, default=str))
+    return f"es-count:{queries_hash}"
+
+
 def fetch_es_results(
     get_params: QueryDict,
     search_query: Search,
     child_docs_count_query: Search | None,
     page: int = 1,
     rows_per_page: int = settings.SEARCH_PAGE_SIZE,
-) -> tuple[Response | list, int, bool, int | None, int | None]:
+) -> tuple[
+    Response | list, int, bool, int | None, int | None, tuple[bool, bool]
+]:
     """Fetch elasticsearch results with pagination.
 
     :param get_params: The user get params.
@@ -1489,9 +1528,10 @@ def fetch_es_results(
     for child documents if required, otherwise None.
     :param page: Current page number.
     :param rows_per_page: Number of records wanted per page.
-    :return: A five-tuple: The ES main response, the ES query time, whether
-    there was an error, the total number of hits for the main document, and
-    the total number of hits for the child document.
+    :return: A six-tuple: The ES main response, the ES query time, whether
+    there was an error, the total number of hits for the main document, the
+    total number of hits for the child document, and a two-tuple of whether
+    each total is a lower bound that reached the approximate counts threshold.
     """
 
     child_total = None
@@ -1506,28 +1546,56 @@ def fetch_es_results(
         main_doc_count_query = clean_count_query(search_query)
         # Set size to 0 to avoid retrieving documents in the count queries for
         # better performance. Set track_total_hits to True to consider all the
-        # documents.
+        # documents, or to the approximate counts threshold if it's enabled.
+        track_total_hits = get_track_total_hits()
         main_doc_count_query = main_doc_count_query.extra(
-            size=0, track_total_hits=True
+            size=0, track_total_hits=track_total_hits
         )
+        count_queries = [main_doc_count_query]
         if child_docs_count_query:
             child_total_query = child_docs_count_query.extra(
-                size=0, track_total_hits=True
+                size=0, track_total_hits=track_total_hits
             )
+            count_queries.append(child_total_query)
+
+        # The totals don't depend on the page or the sorting, so they're
+        # cached to skip the count queries on the following pages.
+        totals = None
+        count_cache_key = make_es_count_cache_key(count_queries)
+        if settings.ELASTICSEARCH_COUNT_CACHE_TIMEOUT:
+            totals = caches["default"].get(count_cache_key)
 
         # Execute the ES main query + count queries in a single request.
         multi_search = MultiSearch()
-        multi_search = multi_search.add(main_query).add(main_doc_count_query)
-        if child_total_query:
-            multi_search = multi_search.add(child_total_query)
+        multi_search = multi_search.add(main_query)
+        if totals is None:
+            for count_query in count_queries:
+                multi_search = multi_search.add(count_query)
         responses = multi_search.execute()
 
         main_response = responses[0]
-        main_doc_count_response = responses[1]
-        parent_total = main_doc_count_response.hits.total.value
+        if totals is None:
+            # Cache the relation of the totals along with them, so a total
+            # that stopped at the approximate counts threshold is shown as a
+            # lower bound.
+            totals = [
+                (response.hits.total.value, response.hits.total.relation)
+                for response in responses[1:]
+            ]
+            if settings.ELASTICSEARCH_COUNT_CACHE_TIMEOUT:
+                caches["default"].set(
+                    count_cache_key,
+                    totals,
+                    settings.ELASTICSEARCH_COUNT_CACHE_TIMEOUT,
+                )
+        parent_total, parent_relation = totals[0]
+        child_relation = None
         if child_total_query:
-            child_doc_count_response = responses[2]
-            child_total = child_doc_count_response.hits.total.value
+            child_total, child_relation = totals[1]
+        approximate_totals = (
+            is_count_approximate(parent_relation),
+            is_count_approximate(child_relation),
+        )
 
         query_time = main_response.took
         search_type = get_params.get("type", SEARCH_TYPES.OPINION)
@@ -1537,7 +1605,14 @@ def fetch_es_results(
         ):
             main_response = main_response.aggregations.groups.buckets
         error = False
-        return main_response, query_time, error, parent_total, child_total
+        return (
+            main_response,
+            query_time,
+            error,
+            parent_total,
+            child_total,
+            approximate_totals,
+        )
     except (TransportError, ConnectionError, RequestError) as e:
         logger.warning(
             "Error loading search page with request: %s", dict(get_params)
@@ -1550,7 +1625,7 @@ def fetch_es_results(
             logger.warning("Failed to parse query: %s", e)
         else:
             logger.error("Multi-search API Error: %s", e)
-    return [], 0, error, None, None
+    return [], 0, error, None, None, (False, False)
 
 
 def build_join_fulltext_queries(
@@ -2276,7 +2351,7 @@ async def get_related_clusters_with_cache_and_es(
         search_query, child_docs_count_query, _ = await sync_to_async(
             build_es_main_query
         )(search, search_params)
-        hits, _, error, total_query_results, _ = await sync_to_async(
+        hits, _, error, total_query_results, *_ = await sync_to_async(
             fetch_es_results
         )(
             query_dict,
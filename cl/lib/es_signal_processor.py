@@ -1,12 +1,14 @@
 from functools import partial
 
 from celery.canvas import chain
+from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 from django.db import transaction
 from django.db.models.signals import m2m_changed, post_delete, post_save
 from model_utils.tracker import FieldInstanceTracker
 
 from cl.alerts.tasks import (
+    buffer_document_for_percolation,
     process_percolator_response,
     send_or_schedule_alerts,
 )
@@ -40,6 +42,8 @@ from cl.search.models import (
     RECAPDocument,
 )
 from cl.search.tasks import (
+    buffer_children_docs_update,
+    buffer_es_document_update,
     es_save_document,
     get_es_doc_id_and_parent_id,
     remove_document_from_es_index,
@@ -192,7 +196,7 @@ def update_es_documents(
                 # extracted from a related instance.
                 transaction.on_commit(
                     partial(
-                        update_es_document.delay,
+                        buffer_es_document_update,
                         es_document.__name__,
                         fields_to_update,
                         (
@@ -206,7 +210,7 @@ def update_es_documents(
             case OpinionCluster() if es_document is OpinionDocument:  # type: ignore
                 transaction.on_commit(
                     partial(
-                        update_children_docs_by_query.delay,
+                        buffer_children_docs_update,
                         es_document.__name__,
                         instance.pk,
                         fields_to_update,
@@ -220,7 +224,7 @@ def update_es_documents(
                 for cluster in related_record:
                     transaction.on_commit(
                         partial(
-                            update_children_docs_by_query.delay,
+                            buffer_children_docs_update,
                             es_document.__name__,
                             cluster.pk,
                             fields_to_update,
@@ -238,7 +242,7 @@ def update_es_documents(
                     continue
                 transaction.on_commit(
                     partial(
-                        update_children_docs_by_query.delay,
+                        buffer_children_docs_update,
                         es_document.__name__,
                         instance.pk,
                         fields_to_update,
@@ -261,7 +265,7 @@ def update_es_documents(
                         continue
                     transaction.on_commit(
                         partial(
-                            update_children_docs_by_query.delay,
+                            buffer_children_docs_update,
                             es_document.__name__,
                             person.pk,
                             fields_to_update,
@@ -275,7 +279,7 @@ def update_es_documents(
                     continue
                 transaction.on_commit(
                     partial(
-                        update_children_docs_by_query.delay,
+                        buffer_children_docs_update,
                         es_document.__name__,
                         instance.pk,
                         fields_to_update,
@@ -291,7 +295,7 @@ def update_es_documents(
                         continue
                     transaction.on_commit(
                         partial(
-                            update_children_docs_by_query.delay,
+                            buffer_children_docs_update,
                             es_document.__name__,
                             rel_docket.pk,
                             fields_to_update,
@@ -306,7 +310,7 @@ def update_es_documents(
                         # extracted from a related instance.
                         transaction.on_commit(
                             partial(
-                                update_es_document.delay,
+                                buffer_es_document_update,
                                 es_document.__name__,
                                 fields_to_update,
                                 (
@@ -364,7 +368,7 @@ def update_m2m_field_in_es_document(
     """
     transaction.on_commit(
         partial(
-            update_es_document.delay,
+            buffer_es_document_update,
             es_document.__name__,
             [
                 affected_field,
@@ -380,7 +384,7 @@ def update_m2m_field_in_es_document(
     ):
         transaction.on_commit(
             partial(
-                update_children_docs_by_query.delay,
+                buffer_children_docs_update,
                 es_document.__name__,
                 instance.pk,
                 [
@@ -428,7 +432,7 @@ def update_reverse_related_documents(
             continue
         transaction.on_commit(
             partial(
-                update_es_document.delay,
+                buffer_es_document_update,
                 es_document.__name__,
                 affected_fields,
                 (compose_app_label(main_object), main_object.pk),
@@ -449,7 +453,7 @@ def update_reverse_related_documents(
 
                 transaction.on_commit(
                     partial(
-                        update_children_docs_by_query.delay,
+                        buffer_children_docs_update,
                         PositionDocument.__name__,
                         person.pk,
                         affected_fields,
@@ -458,7 +462,7 @@ def update_reverse_related_documents(
         case Citation() | Opinion() if es_document is OpinionClusterDocument:  # type: ignore
             transaction.on_commit(
                 partial(
-                    update_children_docs_by_query.delay,
+                    buffer_children_docs_update,
                     OpinionDocument.__name__,
                     instance.cluster.pk,
                     affected_fields,
@@ -473,7 +477,7 @@ def update_reverse_related_documents(
                 return
             transaction.on_commit(
                 partial(
-                    update_children_docs_by_query.delay,
+                    buffer_children_docs_update,
                     ESRECAPDocument.__name__,
                     instance.docket.pk,
                     affected_fields,
@@ -506,7 +510,7 @@ def delete_reverse_related_documents(
             # Update parent document in ES.
             transaction.on_commit(
                 partial(
-                    update_es_document.delay,
+                    buffer_es_document_update,
                     es_document.__name__,
                     affected_fields,
                     (compose_app_label(instance), instance.pk),
@@ -521,7 +525,7 @@ def delete_reverse_related_documents(
             # Then update all their child documents (Positions)
             transaction.on_commit(
                 partial(
-                    update_children_docs_by_query.delay,
+                    buffer_children_docs_update,
                     PositionDocument.__name__,
                     instance.pk,
                     affected_fields,
@@ -533,7 +537,7 @@ def delete_reverse_related_documents(
             # Update parent document in ES.
             transaction.on_commit(
                 partial(
-                    update_es_document.delay,
+                    buffer_es_document_update,
                     es_document.__name__,
                     affected_fields,
                     (compose_app_label(instance), instance.pk),
@@ -548,7 +552,7 @@ def delete_reverse_related_documents(
             # Then update all their child documents (RECAPDocuments)
             transaction.on_commit(
                 partial(
-                    update_children_docs_by_query.delay,
+                    buffer_children_docs_update,
                     ESRECAPDocument.__name__,
                     instance.pk,
                     affected_fields,
@@ -558,7 +562,7 @@ def delete_reverse_related_documents(
             # Update parent document in ES.
             transaction.on_commit(
                 partial(
-                    update_es_document.delay,
+                    buffer_es_document_update,
                     es_document.__name__,
                     affected_fields,
                     (compose_app_label(instance), instance.pk),
@@ -569,7 +573,7 @@ def delete_reverse_related_documents(
             # Then update all their child documents (Positions)
             transaction.on_commit(
                 partial(
-                    update_children_docs_by_query.delay,
+                    buffer_children_docs_update,
                     OpinionDocument.__name__,
                     instance.pk,
                     affected_fields,
@@ -583,7 +587,7 @@ def delete_reverse_related_documents(
                 # Update main document in ES.
                 transaction.on_commit(
                     partial(
-                        update_es_document.delay,
+                        buffer_es_document_update,
                         es_document.__name__,
                         affected_fields,
                         (compose_app_label(main_object), main_object.pk),
@@ -752,6 +756,19 @@ class ESSignalProcessor:
             if isinstance(instance, Person) and not instance.is_judge:
                 # Avoid calling es_save_document if the Person is not a Judge.
                 return
+            if settings.ELASTICSEARCH_PERCOLATOR_BATCH_WINDOW:
+                # Percolate the document along with other documents indexed
+                # within the batch window.
+                percolator_tasks = [
+                    buffer_document_for_percolation.s(
+                        self.es_document._index._name
+                    )
+                ]
+            else:
+                percolator_tasks = [
+                    send_or_schedule_alerts.s(self.es_document._index._name),
+                    process_percolator_response.s(),
+                ]
             transaction.on_commit(
                 lambda: chain(
                     es_save_document.si(
@@ -759,8 +776,7 @@ class ESSignalProcessor:
                         compose_app_label(instance),
                         self.es_document.__name__,
                     ),
-                    send_or_schedule_alerts.s(self.es_document._index._name),
-                    process_percolator_response.s(),
+                    *percolator_tasks,
                 ).apply_async()
             )
             return
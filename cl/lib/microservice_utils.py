@@ -1,13 +1,119 @@
+import os
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
 from io import BufferedReader
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from httpx import AsyncClient, Response
+from httpx import Client, HTTPError, Limits, Request, Response
 
 from cl.audio.models import Audio
 from cl.lib.search_utils import clean_up_recap_document_file
 from cl.search.models import Opinion, RECAPDocument
 
 
+@dataclass
+class MicroserviceStats:
+    requests: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+# The clients, semaphores and stats of the current process, keyed by service.
+# Clients are safe to share between threads, and they keep their connections
+# alive between calls.
+_clients: dict[str, Client] = {}
+_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_stats: dict[str, MicroserviceStats] = {}
+_clients_pid: int | None = None
+_lock = threading.Lock()
+
+
+def get_microservice_client(
+    service: str,
+) -> tuple[Client, threading.BoundedSemaphore]:
+    """Get the long-lived client of a service and the semaphore that limits
+    its concurrent requests, creating them on first use.
+
+    Clients are discarded after a fork, since the connections of the parent
+    process can't be shared with its children.
+
+    :param service: The service to call.
+    :return: A two tuple, the httpx Client and the semaphore of the service.
+    """
+    global _clients_pid
+    with _lock:
+        if _clients_pid != os.getpid():
+            _clients.clear()
+            _semaphores.clear()
+            _stats.clear()
+            _clients_pid = os.getpid()
+
+        if service not in _clients:
+            config = settings.MICROSERVICE_URLS[service]
+            max_concurrency = config.get(
+                "max_concurrency", settings.MICROSERVICE_MAX_CONCURRENCY
+            )
+            _clients[service] = Client(
+                follow_redirects=True,
+                http2=True,
+                timeout=config["timeout"],
+                limits=Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency,
+                ),
+            )
+            _semaphores[service] = threading.BoundedSemaphore(max_concurrency)
+            _stats[service] = MicroserviceStats()
+        return _clients[service], _semaphores[service]
+
+
+def get_microservice_stats() -> dict[str, MicroserviceStats]:
+    """Get the latency and bytes counters of the services called by the
+    current process.
+
+    :return: A dict mapping service names to a copy of their stats.
+    """
+    with _lock:
+        return {service: replace(stats) for service, stats in _stats.items()}
+
+
+def send_microservice_request(service: str, request: Request) -> Response:
+    """Send a request to a service using its pooled client, waiting for a
+    free slot if the service already has its maximum of requests in flight.
+
+    Files in the request are streamed in chunks, and the response is read
+    completely before returning.
+
+    :param service: The service to call.
+    :param request: The request to send, built with the service client.
+    :return: The response from the microservice.
+    """
+    client, semaphore = get_microservice_client(service)
+    bytes_sent = int(request.headers.get("Content-Length", 0))
+    with semaphore:
+        start = time.monotonic()
+        try:
+            response = client.send(request)
+        except HTTPError:
+            with _lock:
+                _stats[service].errors += 1
+            raise
+        finally:
+            with _lock:
+                _stats[service].requests += 1
+                _stats[service].seconds += time.monotonic() - start
+                _stats[service].bytes_sent += bytes_sent
+
+    with _lock:
+        _stats[service].bytes_received += len(response.content)
+    return response
+
+
 async def microservice(
     service: str,
     method: str = "POST",
@@ -26,6 +132,10 @@ async def microservice(
     Because of the various ways our db is setup we have a few different params we use
     in this function.
 
+    Requests go through a pooled client per service, so connections are
+    reused across calls and the number of concurrent requests per service is
+    limited by MICROSERVICE_MAX_CONCURRENCY.
+
     :param service: The service to call
     :param method: The method to use (defaults to POST)
     :param item: The document as a db object
@@ -39,55 +149,65 @@ async def microservice(
 
     services = settings.MICROSERVICE_URLS
 
-    files = None
-    # Add file from filepath
-    if filepath:
-        files = {"file": (filepath, open(filepath, "rb"))}
+    # Files opened here are closed once the request is sent.
+    with ExitStack() as stack:
+        files = None
+        # Add file from filepath
+        if filepath:
+            files = {
+                "file": (filepath, stack.enter_context(open(filepath, "rb")))
+            }
 
-    # Handle our documents based on the type of model object
-    # Sadly these are not uniform
-    if item:
-        if type(item) == RECAPDocument:
-            try:
+        # Handle our documents based on the type of model object
+        # Sadly these are not uniform
+        if item:
+            if type(item) == RECAPDocument:
+                try:
+                    files = {
+                        "file": (
+                            item.filepath_local.name,
+                            stack.enter_context(
+                                item.filepath_local.open(mode="rb")
+                            ),
+                        )
+                    }
+                except FileNotFoundError:
+                    # The file is no longer available, clean it up in DB
+                    await clean_up_recap_document_file(item)
+            elif type(item) == Opinion:
                 files = {
                     "file": (
-                        item.filepath_local.name,
-                        item.filepath_local.open(mode="rb"),
+                        item.local_path.name,
+                        stack.enter_context(item.local_path.open(mode="rb")),
                     )
                 }
-            except FileNotFoundError:
-                # The file is no longer available, clean it up in DB
-                await clean_up_recap_document_file(item)
-        elif type(item) == Opinion:
-            files = {
-                "file": (
-                    item.local_path.name,
-                    item.local_path.open(mode="rb"),
-                )
-            }
-        elif type(item) == Audio:
-            files = {
-                "file": (
-                    item.local_path_original_file.name,
-                    item.local_path_original_file.open(mode="rb"),
-                )
-            }
-    # Sometimes we will want to pass in a filename and the file bytes
-    # to avoid writing them to disk. Filename can often be generic
-    # and is used to identify the file extension for our microservices
-    if file and file_type:
-        files = {"file": (f"dummy.{file_type}", file)}
-    elif file:
-        files = {"file": ("filename", file)}
-
-    async with AsyncClient(follow_redirects=True, http2=True) as client:
+            elif type(item) == Audio:
+                files = {
+                    "file": (
+                        item.local_path_original_file.name,
+                        stack.enter_context(
+                            item.local_path_original_file.open(mode="rb")
+                        ),
+                    )
+                }
+        # Sometimes we will want to pass in a filename and the file bytes
+        # to avoid writing them to disk. Filename can often be generic
+        # and is used to identify the file extension for our microservices
+        if file and file_type:
+            files = {"file": (f"dummy.{file_type}", file)}
+        elif file:
+            files = {"file": ("filename", file)}
+
+        client, _ = get_microservice_client(service)
         req = client.build_request(
             method=method,
             url=services[service]["url"],  # type: ignore
             data=data,
             files=files,
             params=params,
-            timeout=services[service]["timeout"],
         )
-
-        return await client.send(req)
+        # The pooled client is synchronous so it can be shared by the
+        # different event loops async_to_sync creates for every call.
+        return await sync_to_async(
+            send_microservice_request, thread_sensitive=False
+        )(service, req)
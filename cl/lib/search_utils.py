@@ -14,7 +14,7 @@ from requests import Session
 from scorched.response import SolrResponse
 
 from cl.citations.match_citations import search_db_for_fullcitation
-from cl.citations.utils import get_citation_depth_between_clusters
+from cl.citations.utils import get_citation_depths_to_cluster
 from cl.lib.bot_detector import is_bot
 from cl.lib.scorched_utils import ExtraSolrInterface
 from cl.lib.types import CleanData, SearchParam
@@ -979,13 +979,15 @@ async def add_depth_counts(
         except OpinionCluster.DoesNotExist:
             return None
         else:
+            depths = await get_citation_depths_to_cluster(
+                [
+                    result["cluster_id"]
+                    for result in search_results.object_list
+                ],
+                cited_cluster.pk,
+            )
             for result in search_results.object_list:
-                result["citation_depth"] = (
-                    await get_citation_depth_between_clusters(
-                        citing_cluster_pk=result["cluster_id"],
-                        cited_cluster_pk=cited_cluster.pk,
-                    )
-                )
+                result["citation_depth"] = depths.get(result["cluster_id"])
             return cited_cluster
     else:
         return None
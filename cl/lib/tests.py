@@ -1,16 +1,24 @@
 import datetime
 from typing import Tuple, TypedDict, cast
+from unittest import mock
 
 from asgiref.sync import async_to_sync
 from django.contrib.auth.hashers import make_password
 from django.core.files.base import ContentFile
 from django.test import override_settings
 from django.urls import reverse
+from httpx import Response
 from rest_framework.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
 
+from cl.lib.celery_utils import CeleryThrottle
 from cl.lib.date_time import midnight_pt
 from cl.lib.elasticsearch_utils import append_query_conjunctions
 from cl.lib.filesizes import convert_size_to_bytes
+from cl.lib.microservice_utils import (
+    get_microservice_client,
+    get_microservice_stats,
+    microservice,
+)
 from cl.lib.mime_types import lookup_mime_type
 from cl.lib.model_helpers import (
     clean_docket_number,
@@ -865,6 +873,71 @@ class TestRateLimiters(SimpleTestCase):
                 self.assertEqual(parse_rate(q), a)
 
 
+class TestMicroserviceClient(SimpleTestCase):
+    @mock.patch("cl.lib.microservice_utils.Client.send")
+    def test_clients_are_reused_and_tallied(self, send_mock) -> None:
+        """Do calls to a service reuse its client and count its requests?"""
+        send_mock.return_value = Response(200, content=b"pdf")
+        client, semaphore = get_microservice_client("page-count")
+        before = get_microservice_stats()["page-count"]
+
+        for _ in range(2):
+            response = async_to_sync(microservice)(
+                service="page-count", file=b"%PDF-1.4", file_type="pdf"
+            )
+            self.assertEqual(response.content, b"pdf")
+
+        self.assertIs(get_microservice_client("page-count")[0], client)
+        self.assertIs(get_microservice_client("page-count")[1], semaphore)
+        self.assertEqual(send_mock.call_count, 2)
+        stats = get_microservice_stats()["page-count"]
+        self.assertEqual(stats.requests, before.requests + 2)
+        self.assertEqual(stats.errors, before.errors)
+        self.assertEqual(stats.bytes_received, before.bytes_received + 6)
+        self.assertGreater(stats.bytes_sent, before.bytes_sent)
+
+
+class TestCeleryThrottle(SimpleTestCase):
+    @mock.patch("cl.lib.celery_utils.get_queue_length")
+    @mock.patch("cl.lib.celery_utils.time")
+    def test_throttle_adapts_to_drain_rate(self, time_mock, length_mock):
+        """Does the throttle sleep until the queue should be low and refill
+        it to a depth that follows the measured drain rate?"""
+        clock = [0.0]
+
+        def sleep(seconds: float) -> None:
+            clock[0] += seconds
+
+        time_mock.monotonic.side_effect = lambda: clock[0]
+        time_mock.sleep.side_effect = sleep
+        length_mock.side_effect = [15, 5]
+        throttle = CeleryThrottle(min_items=10, queue_name=["q1", "q2"])
+
+        for _ in range(19):
+            throttle.maybe_wait()
+        length_mock.assert_not_called()
+
+        # 19 items were added and 15 are left after a second: 4/s drained,
+        # so the 5 items above the min take 1.25 seconds.
+        clock[0] = 1.0
+        throttle.maybe_wait()
+        time_mock.sleep.assert_called_once_with(1.25)
+        length_mock.assert_called_with(["q1", "q2"], None)
+
+        # Then 10 more were drained in 1.25s: 8/s, smoothed to 5.2/s. That's
+        # enough work for two poll intervals with 31 items queued.
+        self.assertAlmostEqual(throttle.stats.drain_rate, 5.2)
+        self.assertEqual(throttle.target, 31)
+        self.assertEqual(throttle.shortage, 26)
+        self.assertEqual(throttle.stats.items, 20)
+        self.assertEqual(throttle.stats.sleeps, 1)
+        self.assertEqual(throttle.stats.seconds_slept, 1.25)
+
+        for _ in range(25):
+            throttle.maybe_wait()
+        self.assertEqual(length_mock.call_count, 2)
+
+
 class TestFactoriesClasses(TestCase):
     def test_related_factory_variable_list(self):
         court_scotus = CourtFactory(id="scotus")
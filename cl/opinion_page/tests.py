@@ -587,6 +587,62 @@ class CitationRedirectorTest(TestCase):
         )
         self.assertStatus(r, HTTP_404_NOT_FOUND)
 
+    async def test_pincite_redirect(self) -> None:
+        """Are pincites redirected to the cluster of the preceding citation
+        in the volume, only if it has a marker for the page?
+        """
+        cf = await sync_to_async(CourtFactory)(id="coloctapp")
+        df = await sync_to_async(DocketFactory)(court=cf)
+        cluster = await sync_to_async(
+            OpinionClusterFactoryWithChildrenAndParents
+        )(docket=df, case_name="People v. Davis")
+        await Opinion.objects.filter(cluster=cluster).aupdate(
+            html_with_citations="<p>Text <span>*40N</span> more text</p>"
+        )
+        await sync_to_async(CitationWithParentsFactory.create)(
+            volume="2017", reporter="COA", page="40M", cluster=cluster
+        )
+
+        r = await self.async_client.get(
+            reverse(
+                "citation_redirector",
+                kwargs={"reporter": "coa", "volume": "2017", "page": "40N"},
+            ),
+        )
+        self.assertStatus(r, HTTP_302_FOUND)
+        self.assertEqual(r.url, cluster.get_absolute_url())
+
+        # No marker for the page in the cluster.
+        r = await self.async_client.get(
+            reverse(
+                "citation_redirector",
+                kwargs={"reporter": "coa", "volume": "2017", "page": "40P"},
+            ),
+        )
+        self.assertStatus(r, HTTP_404_NOT_FOUND)
+
+        # The page is before the first citation of the volume.
+        r = await self.async_client.get(
+            reverse(
+                "citation_redirector",
+                kwargs={"reporter": "coa", "volume": "2017", "page": "39"},
+            ),
+        )
+        self.assertStatus(r, HTTP_404_NOT_FOUND)
+
+        # Moving the citation to another volume invalidates the page index
+        # of its previous volume too.
+        citation = await Citation.objects.aget(cluster=cluster)
+        citation.volume = "2018"
+        await citation.asave()
+        r = await self.async_client.get(
+            reverse(
+                "citation_redirector",
+                kwargs={"reporter": "coa", "volume": "2017", "page": "40N"},
+            ),
+        )
+        self.assertStatus(r, HTTP_404_NOT_FOUND)
+
 
 class ViewRecapDocketTest(TestCase):
     @classmethod
@@ -4,7 +4,6 @@ from typing import Dict, Union
 from urllib.parse import urlencode
 
 import eyecite
-import natsort
 import waffle
 from asgiref.sync import async_to_sync, sync_to_async
 from django.contrib import messages
@@ -35,6 +34,10 @@ from reporters_db import (
 )
 from rest_framework.status import HTTP_300_MULTIPLE_CHOICES, HTTP_404_NOT_FOUND
 
+from cl.citations.page_index import (
+    cluster_has_page_marker,
+    find_preceding_cluster_id,
+)
 from cl.citations.parenthetical_utils import get_or_create_parenthetical_groups
 from cl.custom_filters.templatetags.text_filters import best_case_name
 from cl.favorites.forms import NoteForm
@@ -990,52 +993,19 @@ async def citation_handler(
 
     if cluster_count == 0:
         # We didn't get an exact match on the volume/reporter/page. Perhaps
-        # it's a pincite. Try to find the citation immediately *before* this
-        # one in the same book. To do so, get all the opinions from the book,
-        # sort them by page number (in Python, b/c pages can have letters),
-        # then find the citation just before the requested one.
-
-        possible_match = None
-
-        # Create a list of the closest opinion clusters id and page to the
-        # input citation
-        closest_opinion_clusters = [
-            opinion
-            async for opinion in OpinionCluster.objects.filter(
-                citations__reporter=reporter, citations__volume=volume
-            )
-            .annotate(cite_page=(F("citations__page")))
-            .values_list("id", "cite_page")
-        ]
-
-        # Create a temporal item and add it to the values list
-        citation_item = (0, page)
-        closest_opinion_clusters.append((0, page))
-
-        # Natural sort page numbers ascending order
-        sort_possible_matches = natsort.natsorted(
-            closest_opinion_clusters, key=lambda item: item[1]
+        # it's a pincite. Find the citation immediately *before* this one in
+        # the same book, using the cached index of the volume pages, which
+        # are sorted naturally b/c pages can have letters.
+        possible_match_id = await find_preceding_cluster_id(
+            reporter, volume, page
         )
-
-        # Find the position of the item that we added
-        citation_item_position = sort_possible_matches.index(citation_item)
-
-        if citation_item_position > 0:
-            # if the position is greater than 0, then the previous item in
-            # the list is the closest citation, we get the id of the
-            # previous item, and we get the object
-            possible_match = await OpinionCluster.objects.aget(
-                id=sort_possible_matches[citation_item_position - 1][0]
-            )
-
-        if possible_match:
-            # There may be different page cite formats that aren't yet
-            # accounted for by this code.
-            clusters = OpinionCluster.objects.filter(
-                id=possible_match.id,
-                sub_opinions__html_with_citations__contains=f"*{page}",
-            )
-            cluster_count = 1 if await clusters.aexists() else 0
+        # There may be different page cite formats that aren't yet accounted
+        # for by the page markers.
+        if possible_match_id and await cluster_has_page_marker(
+            possible_match_id, page
+        ):
+            clusters = OpinionCluster.objects.filter(id=possible_match_id)
+            cluster_count = 1
 
     # Show the correct page....
     if cluster_count == 0:
@@ -1,7 +1,9 @@
 # Code for merging PACER content into the DB
 import logging
 import re
+from collections import defaultdict
 from copy import deepcopy
+from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -82,24 +84,17 @@ def confirm_docket_number_core_lookup_match(
     return docket
 
 
-async def find_docket_object(
-    court_id: str,
-    pacer_case_id: str | None,
-    docket_number: str,
-    using: str = "default",
-) -> Docket:
-    """Attempt to find the docket based on the parsed docket data. If cannot be
-    found, create a new docket. If multiple are found, return the oldest.
+def get_docket_lookups(
+    pacer_case_id: str | None, docket_number: str
+) -> list[dict[str, str | None]]:
+    """Get the lookups used to find a docket, in decreasing specificity.
 
-    :param court_id: The CourtListener court_id to lookup
     :param pacer_case_id: The PACER case ID for the docket
     :param docket_number: The docket number to lookup.
-    :param using: The database to use for the lookup queries.
-    :return The docket found or created.
+    :return: A list of dicts of Docket field lookups.
     """
     # Attempt several lookups of decreasing specificity. Note that
     # pacer_case_id is required for Docket and Docket History uploads.
-    d = None
     docket_number_core = make_docket_number_core(docket_number)
     lookups = []
     if pacer_case_id:
@@ -134,6 +129,26 @@ async def find_docket_object(
                 {"pacer_case_id": None, "docket_number": docket_number},
             )
 
+    return lookups
+
+
+async def find_docket_object(
+    court_id: str,
+    pacer_case_id: str | None,
+    docket_number: str,
+    using: str = "default",
+) -> Docket:
+    """Attempt to find the docket based on the parsed docket data. If cannot be
+    found, create a new docket. If multiple are found, return the oldest.
+
+    :param court_id: The CourtListener court_id to lookup
+    :param pacer_case_id: The PACER case ID for the docket
+    :param docket_number: The docket number to lookup.
+    :param using: The database to use for the lookup queries.
+    :return The docket found or created.
+    """
+    d = None
+    lookups = get_docket_lookups(pacer_case_id, docket_number)
     for kwargs in lookups:
         ds = Docket.objects.filter(court_id=court_id, **kwargs).using(using)
         count = await ds.acount()
@@ -171,6 +186,101 @@ async def find_docket_object(
     return d
 
 
+class DocketLookupIndex:
+    """An in-memory index of the dockets of a court that could match a batch
+    of items, fetched with a single query.
+
+    find() follows the same lookups as find_docket_object, and dockets saved
+    while the batch is merged must be added back with add(), so later items
+    in the batch match them instead of creating duplicates.
+
+    The dockets in the index are only meant for the lookup. They're loaded
+    before the batch is merged, so they must be reloaded before saving them.
+
+    :param court_id: The CourtListener court_id of the items.
+    :param cases: A list of (pacer_case_id, docket_number) tuples of the
+    items to look up.
+    """
+
+    LOOKUP_FIELDS = ("pacer_case_id", "docket_number_core", "docket_number")
+
+    def __init__(
+        self, court_id: str, cases: list[tuple[str | None, str]]
+    ) -> None:
+        self.court_id = court_id
+        self._keys: dict[int, list[tuple[str, str | None]]] = {}
+        self._index: dict[tuple[str, str | None], dict[int, Docket]] = (
+            defaultdict(dict)
+        )
+
+        values: dict[str, set[str]] = defaultdict(set)
+        for pacer_case_id, docket_number in cases:
+            for kwargs in get_docket_lookups(pacer_case_id, docket_number):
+                for field, value in kwargs.items():
+                    # Avoid loading every docket with a blank value.
+                    if value:
+                        values[field].add(value)
+        if not values:
+            return
+
+        q = Q()
+        for field, field_values in values.items():
+            q |= Q(**{f"{field}__in": field_values})
+        for d in Docket.objects.filter(q, court_id=court_id):
+            self.add(d)
+
+    def add(self, d: Docket) -> None:
+        """Add a saved docket to the index, or re-index it if its lookup
+        fields changed.
+
+        :param d: The saved Docket.
+        :return: None
+        """
+        for key in self._keys.pop(d.pk, []):
+            self._index[key].pop(d.pk, None)
+        keys = [(field, getattr(d, field)) for field in self.LOOKUP_FIELDS]
+        for key in keys:
+            self._index[key][d.pk] = d
+        self._keys[d.pk] = keys
+
+    def find(self, pacer_case_id: str | None, docket_number: str) -> Docket:
+        """Find the docket of an item. If it can't be found, return a new
+        docket. If multiple are found, return the oldest.
+
+        :param pacer_case_id: The PACER case ID for the docket
+        :param docket_number: The docket number to lookup.
+        :return The docket found or created.
+        """
+        for kwargs in get_docket_lookups(pacer_case_id, docket_number):
+            key = next(
+                (field, value)
+                for field, value in kwargs.items()
+                if value is not None
+            )
+            ds = [
+                d
+                for d in self._index[key].values()
+                if all(getattr(d, f) == v for f, v in kwargs.items())
+            ]
+            if not ds:
+                continue  # Try a looser lookup.
+            # Choose the oldest one and live with it.
+            d = min(ds, key=lambda d: (d.date_created, d.pk))
+            if kwargs.get("pacer_case_id") is None and kwargs.get(
+                "docket_number_core"
+            ):
+                d = confirm_docket_number_core_lookup_match(d, docket_number)
+            if d:
+                return d
+
+        # Couldn't find a docket. Return a new one.
+        return Docket(
+            source=Docket.RECAP,
+            pacer_case_id=pacer_case_id,
+            court_id=self.court_id,
+        )
+
+
 def add_attorney(atty, p, d):
     """Add/update an attorney.
 
@@ -728,6 +838,244 @@ async def get_or_make_docket_entry(
     return de, de_created
 
 
+DOCKET_ENTRY_MERGE_FIELDS = [
+    "description",
+    "date_filed",
+    "time_filed",
+    "pacer_sequence_number",
+    "recap_sequence_number",
+]
+DOCKET_ENTRY_BULK_UPDATE_FIELDS = DOCKET_ENTRY_MERGE_FIELDS + ["date_modified"]
+# Changes to these fields need to be propagated to Elasticsearch, which is
+# done by the post_save signal, so they can't be bulk updated.
+DOCKET_ENTRY_INDEXED_FIELDS = {"description", "date_filed"}
+RECAP_DOCUMENT_MERGE_FIELDS = [
+    "pacer_doc_id",
+    "description",
+    "document_number",
+]
+
+
+def get_field_values(instance, fields: list[str]) -> dict[str, Any]:
+    return {field: getattr(instance, field) for field in fields}
+
+
+def to_model_value(model, field_name: str, value: Any) -> Any:
+    """Convert a scraped value to the python type of a model field, so it
+    can be compared against the values of the instances in memory.
+
+    :param model: The model class the field belongs to.
+    :param field_name: The name of the field.
+    :param value: The scraped value.
+    :return: The converted value.
+    :raises ValidationError: If the value can't be converted.
+    """
+    return model._meta.get_field(field_name).to_python(value)
+
+
+def update_docket_entry_fields(
+    de: DocketEntry, docket_entry: dict[str, Any], court_id: str
+) -> None:
+    """Merge the scraped docket entry data into a DocketEntry object.
+
+    :param de: The DocketEntry object to update.
+    :param docket_entry: The scraped dict from Juriscraper for the docket
+    entry.
+    :param court_id: The court ID of the docket, used to localize the date.
+    :return: None
+    """
+    de.description = docket_entry["description"] or de.description
+    date_filed, time_filed = localize_date_and_time(
+        court_id, docket_entry["date_filed"]
+    )
+    if not time_filed:
+        # If not time data is available, compare if date_filed changed if
+        # so restart time_filed to None, otherwise keep the current time.
+        if de.date_filed != docket_entry["date_filed"]:
+            de.time_filed = None
+    else:
+        de.time_filed = time_filed
+    de.date_filed = date_filed
+    de.pacer_sequence_number = (
+        docket_entry.get("pacer_seq_no") or de.pacer_sequence_number
+    )
+    de.recap_sequence_number = docket_entry["recap_sequence_number"]
+
+
+@sync_to_async
+def get_or_make_docket_entries_in_bulk(
+    d: Docket,
+    docket_entries: list[dict[str, Any]],
+    do_not_update_existing: bool = False,
+) -> dict[int, tuple[DocketEntry, bool]]:
+    """Lookup or create the numbered docket entries of a docket sheet at once.
+
+    The existing entries of the docket are loaded in a single query and the
+    scraped entries are matched against them in memory, following the same
+    rules as add_create_docket_entry_transaction. The entries that are not
+    found are created with a single bulk_create while the docket is locked.
+
+    Unnumbered entries and entries that require merging duplicated docket
+    entries are not resolved here, get_or_make_docket_entry handles them.
+
+    :param d: The docket we expect to find the entries in.
+    :param docket_entries: The scraped dicts from Juriscraper for the docket
+    entries.
+    :param do_not_update_existing: Whether to stop at the first entry that
+    might exist, since no further entries will be merged after it.
+    :return: A dict mapping the index of each resolved entry in
+    docket_entries to a (de, de_created) tuple.
+    """
+    entry_numbers = set()
+    for docket_entry in docket_entries:
+        try:
+            entry_number = to_model_value(
+                DocketEntry, "entry_number", docket_entry["document_number"]
+            )
+        except ValidationError:
+            continue
+        if entry_number is not None:
+            entry_numbers.add(entry_number)
+    if not entry_numbers:
+        return {}
+
+    resolved_entries = {}
+    with transaction.atomic():
+        Docket.objects.select_for_update().get(pk=d.pk)
+        des_by_number = defaultdict(list)
+        for de in DocketEntry.objects.filter(
+            docket=d, entry_number__in=entry_numbers
+        ):
+            des_by_number[de.entry_number].append(de)
+
+        des_to_create = []
+        for i, docket_entry in enumerate(docket_entries):
+            try:
+                entry_number = to_model_value(
+                    DocketEntry,
+                    "entry_number",
+                    docket_entry["document_number"],
+                )
+                pacer_seq_no = to_model_value(
+                    DocketEntry,
+                    "pacer_sequence_number",
+                    docket_entry.get("pacer_seq_no"),
+                )
+            except ValidationError:
+                entry_number = None
+            if entry_number is None:
+                if do_not_update_existing:
+                    break
+                continue
+
+            candidates = des_by_number[entry_number]
+            matches = candidates
+            if pacer_seq_no is not None:
+                matches = [
+                    de
+                    for de in candidates
+                    if de.pacer_sequence_number == pacer_seq_no
+                ]
+            null_seq_no_exists = any(
+                de.pacer_sequence_number is None for de in candidates
+            )
+            if len(matches) == 1:
+                resolved_entries[i] = (matches[0], False)
+            elif not matches and (
+                pacer_seq_no is None or not null_seq_no_exists
+            ):
+                de = DocketEntry(
+                    docket=d,
+                    entry_number=entry_number,
+                    pacer_sequence_number=pacer_seq_no,
+                )
+                update_docket_entry_fields(de, docket_entry, d.court_id)
+                # Later entries of the sheet with the same number will match
+                # this one instead of creating it again.
+                candidates.append(de)
+                des_to_create.append(de)
+                resolved_entries[i] = (de, True)
+            else:
+                # Duplicated entries need to be merged.
+                if do_not_update_existing:
+                    break
+                continue
+
+            if do_not_update_existing and not resolved_entries[i][1]:
+                break
+
+        DocketEntry.objects.bulk_create(des_to_create)
+    return resolved_entries
+
+
+@sync_to_async
+def get_recap_documents_by_docket_entry(
+    de_ids: list[int],
+) -> dict[int, list[RECAPDocument]]:
+    """Load the RECAPDocuments of a group of docket entries at once.
+
+    :param de_ids: The IDs of the docket entries.
+    :return: A dict mapping every docket entry ID to the list of its
+    RECAPDocuments.
+    """
+    rds_by_de = {de_id: [] for de_id in de_ids}
+    if not de_ids:
+        return rds_by_de
+    for rd in RECAPDocument.objects.filter(docket_entry_id__in=de_ids):
+        rds_by_de[rd.docket_entry_id].append(rd)
+    return rds_by_de
+
+
+async def aget_recap_document(
+    params: dict[str, Any], de_rds: list[RECAPDocument] | None
+) -> RECAPDocument:
+    """Get the RECAPDocument that matches the lookup params, from the
+    documents of its docket entry if they were already loaded.
+
+    :param params: The lookup params, including the docket_entry.
+    :param de_rds: The RECAPDocuments of the docket entry or None if they
+    weren't loaded.
+    :return: The matching RECAPDocument.
+    :raises RECAPDocument.DoesNotExist: If no document matches.
+    :raises RECAPDocument.MultipleObjectsReturned: If more than one document
+    matches.
+    """
+    if de_rds is None:
+        return await RECAPDocument.objects.aget(**params)
+
+    lookups = {
+        field_name: to_model_value(RECAPDocument, field_name, value)
+        for field_name, value in params.items()
+        if field_name != "docket_entry"
+    }
+    matches = [
+        rd
+        for rd in de_rds
+        if all(getattr(rd, k) == v for k, v in lookups.items())
+    ]
+    if not matches:
+        raise RECAPDocument.DoesNotExist
+    if len(matches) > 1:
+        raise RECAPDocument.MultipleObjectsReturned
+    return matches[0]
+
+
+@sync_to_async
+def save_recap_document_in_savepoint(rd: RECAPDocument, **kwargs) -> None:
+    """Save a RECAPDocument within a savepoint.
+
+    A main document inserted concurrently by another merge violates the
+    unique_main_document_per_docket_entry index. The savepoint keeps the
+    IntegrityError from breaking the transaction the merge runs in, if any.
+
+    :param rd: The RECAPDocument to save.
+    :param kwargs: Keyword arguments for RECAPDocument.save.
+    :return: None
+    """
+    with transaction.atomic():
+        rd.save(**kwargs)
+
+
 async def add_docket_entries(
     d: Docket,
     docket_entries: list[dict[str, Any]],
@@ -738,6 +1086,10 @@ async def add_docket_entries(
 ]:
     """Update or create the docket entries and documents.
 
+    The numbered docket entries and their documents are looked up in bulk
+    and only the objects that changed are saved. Docket entries whose only
+    changes aren't indexed in Elasticsearch are saved with a bulk_update.
+
     :param d: The docket object to add things to and use for lookups.
     :param docket_entries: A list of dicts containing docket entry data.
     :param tags: A list of tag objects to apply to the recap documents and
@@ -756,39 +1108,72 @@ async def add_docket_entries(
     rds_created = []
     des_returned = []
     rds_updated = []
+    des_to_update = {}
+    objs_to_tag: list[DocketEntry | RECAPDocument] = []
     content_updated = False
     calculate_recap_sequence_numbers(docket_entries, d.court_id)
     known_filing_dates = [d.date_last_filing]
-    for docket_entry in docket_entries:
-        response = await get_or_make_docket_entry(d, docket_entry)
+
+    # Unlike district and bankr. dockets, where you always have a main
+    # RD and can optionally have attachments to the main RD, Appellate
+    # docket entries can either they *only* have a main RD (with no
+    # attachments) or they *only* have attachments (with no main doc).
+    # Unfortunately, when we ingest a docket, we don't know if the entries
+    # have attachments, so we begin by assuming they don't and create
+    # main RDs for each entry. Later, if/when we get attachment pages for
+    # particular entries, we convert the main documents into attachment
+    # RDs. The check below ensures that if that happens for a particular
+    # entry, we avoid creating the main RD a second+ time when we get the
+    # docket sheet a second+ time.
+    appelate_court_id_exists = (
+        await Court.federal_courts.appellate_pacer_courts()
+        .filter(pk=d.court_id)
+        .aexists()
+    )
+    court = None
+
+    resolved_entries = await get_or_make_docket_entries_in_bulk(
+        d, docket_entries, do_not_update_existing
+    )
+    rds_by_de = await get_recap_documents_by_docket_entry(
+        list({de.pk for de, _ in resolved_entries.values()})
+    )
+    for i, docket_entry in enumerate(docket_entries):
+        response = resolved_entries.get(i)
+        resolved_in_bulk = response is not None
+        if not resolved_in_bulk:
+            response = await get_or_make_docket_entry(d, docket_entry)
         if response is None:
             continue
         else:
             de, de_created = response[0], response[1]
 
-        de.description = docket_entry["description"] or de.description
-        date_filed, time_filed = localize_date_and_time(
-            d.court_id, docket_entry["date_filed"]
-        )
-        if not time_filed:
-            # If not time data is available, compare if date_filed changed if
-            # so restart time_filed to None, otherwise keep the current time.
-            if de.date_filed != docket_entry["date_filed"]:
-                de.time_filed = None
-        else:
-            de.time_filed = time_filed
-        de.date_filed = date_filed
-        de.pacer_sequence_number = (
-            docket_entry.get("pacer_seq_no") or de.pacer_sequence_number
-        )
-        de.recap_sequence_number = docket_entry["recap_sequence_number"]
+        previous_values = get_field_values(de, DOCKET_ENTRY_MERGE_FIELDS)
+        update_docket_entry_fields(de, docket_entry, d.court_id)
         des_returned.append(de)
         if do_not_update_existing and not de_created:
+            await DocketEntry.objects.abulk_update(
+                des_to_update.values(), DOCKET_ENTRY_BULK_UPDATE_FIELDS
+            )
+            for tag in tags or []:
+                await tag.atag_objects(objs_to_tag)
             return (des_returned, rds_updated), rds_created, content_updated
-        await de.asave()
+        changed_fields = {
+            field
+            for field, value in previous_values.items()
+            if getattr(de, field) != value
+        }
+        if (
+            not resolved_in_bulk
+            or changed_fields & DOCKET_ENTRY_INDEXED_FIELDS
+        ):
+            await de.asave()
+        elif changed_fields:
+            # bulk_update skips auto_now, bump date_modified by hand.
+            de.date_modified = now()
+            des_to_update[de.pk] = de
         if tags:
-            for tag in tags:
-                tag.tag_object(de)
+            objs_to_tag.append(de)
 
         if de_created:
             content_updated = True
@@ -809,44 +1194,38 @@ async def add_docket_entries(
         else:
             params["document_type"] = RECAPDocument.PACER_DOCUMENT
 
-        appellate_court_ids = Court.federal_courts.appellate_pacer_courts()
-
-        # Unlike district and bankr. dockets, where you always have a main
-        # RD and can optionally have attachments to the main RD, Appellate
-        # docket entries can either they *only* have a main RD (with no
-        # attachments) or they *only* have attachments (with no main doc).
-        # Unfortunately, when we ingest a docket, we don't know if the entries
-        # have attachments, so we begin by assuming they don't and create
-        # main RDs for each entry. Later, if/when we get attachment pages for
-        # particular entries, we convert the main documents into attachment
-        # RDs. The check here ensures that if that happens for a particular
-        # entry, we avoid creating the main RD a second+ time when we get the
-        # docket sheet a second+ time.
-        appelate_court_id_exists = await appellate_court_ids.filter(
-            pk=d.court_id
-        ).aexists()
+        de_rds = rds_by_de.get(de.pk)
         if de_created is False and appelate_court_id_exists:
-            appellate_rd_att_exists = await de.recap_documents.filter(
-                document_type=RECAPDocument.ATTACHMENT
-            ).aexists()
+            if de_rds is not None:
+                appellate_rd_att_exists = any(
+                    rd.document_type == RECAPDocument.ATTACHMENT
+                    for rd in de_rds
+                )
+            else:
+                appellate_rd_att_exists = await de.recap_documents.filter(
+                    document_type=RECAPDocument.ATTACHMENT
+                ).aexists()
             if appellate_rd_att_exists:
                 params["document_type"] = RECAPDocument.ATTACHMENT
                 params["pacer_doc_id"] = docket_entry["pacer_doc_id"]
         try:
-            rd = await RECAPDocument.objects.aget(**params)
+            rd = await aget_recap_document(params, de_rds)
             rds_updated.append(rd)
         except RECAPDocument.DoesNotExist:
             try:
                 params["pacer_doc_id"] = docket_entry["pacer_doc_id"]
-                rd = await RECAPDocument.objects.acreate(
+                rd = RECAPDocument(
                     document_number=docket_entry["document_number"] or "",
                     is_available=False,
                     **params,
                 )
-            except ValidationError:
+                await save_recap_document_in_savepoint(rd, force_insert=True)
+            except (ValidationError, IntegrityError):
                 # Happens from race conditions.
                 continue
             rds_created.append(rd)
+            if de_rds is not None:
+                de_rds.append(rd)
         except RECAPDocument.MultipleObjectsReturned:
             logger.info(
                 "Multiple recap documents found for document entry number'%s' "
@@ -863,24 +1242,32 @@ async def add_docket_entries(
             else:
                 rd = await duplicate_rd_queryset.alatest("date_created")
             await duplicate_rd_queryset.exclude(pk=rd.pk).adelete()
+            # The loaded documents are stale now, query them from now on.
+            rds_by_de.pop(de.pk, None)
 
-        rd.pacer_doc_id = rd.pacer_doc_id or docket_entry["pacer_doc_id"]
+        previous_values = get_field_values(rd, RECAP_DOCUMENT_MERGE_FIELDS)
+        # Juriscraper returns null pacer_doc_ids, RECAPDocument.save stores
+        # them as blanks.
+        rd.pacer_doc_id = rd.pacer_doc_id or docket_entry["pacer_doc_id"] or ""
         rd.description = (
             docket_entry.get("short_description") or rd.description
         )
         rd.document_number = docket_entry["document_number"] or ""
-        try:
-            await rd.asave()
-        except ValidationError:
-            # Happens from race conditions.
-            continue
+        if previous_values != get_field_values(
+            rd, RECAP_DOCUMENT_MERGE_FIELDS
+        ):
+            try:
+                await save_recap_document_in_savepoint(rd)
+            except (ValidationError, IntegrityError):
+                # Happens from race conditions.
+                continue
         if tags:
-            for tag in tags:
-                tag.tag_object(rd)
+            objs_to_tag.append(rd)
 
         attachments = docket_entry.get("attachments")
         if attachments is not None:
-            court = await Court.objects.aget(pk=d.court_id)
+            if court is None:
+                court = await Court.objects.aget(pk=d.court_id)
             await merge_attachment_page_data(
                 court,
                 d.pacer_case_id,
@@ -891,6 +1278,12 @@ async def add_docket_entries(
                 False,
             )
 
+    await DocketEntry.objects.abulk_update(
+        des_to_update.values(), DOCKET_ENTRY_BULK_UPDATE_FIELDS
+    )
+    # Tag the entries and documents in batches, instead of one by one.
+    for tag in tags or []:
+        await tag.atag_objects(objs_to_tag)
     known_filing_dates = set(filter(None, known_filing_dates))
     if known_filing_dates:
         await Docket.objects.filter(pk=d.pk).aupdate(
@@ -1026,7 +1419,7 @@ def normalize_attorney_roles(parties):
 
 
 def disassociate_extraneous_entities(
-    d, parties, parties_to_preserve, attorneys_to_preserve
+    d, parties, parties_to_preserve, attorneys_to_preserve, state=None
 ):
     """Disassociate any parties or attorneys no longer in the latest info.
 
@@ -1049,11 +1442,20 @@ def disassociate_extraneous_entities(
     while updating the docket.
     :param attorneys_to_preserve: A set of attorney IDs that were updated or
     created while updating the docket.
+    :param state: Optional, the DocketPartiesState of the docket, used to
+    find its terminated entities instead of querying them.
     """
     new_has_terminated_entities = check_json_for_terminated_entities(parties)
     if not new_has_terminated_entities:
         # No terminated data in the JSON. Check if we have any in the DB.
-        terminated_parties, terminated_attorneys = get_terminated_entities(d)
+        if state is not None:
+            terminated_parties, terminated_attorneys = (
+                state.get_terminated_entities()
+            )
+        else:
+            terminated_parties, terminated_attorneys = get_terminated_entities(
+                d
+            )
         if any([terminated_parties, terminated_attorneys]):
             # The docket currently has terminated entities, but new info
             # doesn't, indicating that the user didn't request it. Thus, delete
@@ -1088,12 +1490,178 @@ def disassociate_extraneous_entities(
     ).delete()
 
 
+@dataclass
+class DocketPartiesState:
+    """The parties and attorneys of a docket, loaded in memory so the ones
+    in a docket report can be reconciled against them in bulk.
+    """
+
+    parties_by_name: dict[str, list[Party]]
+    # Keyed by (party_id, name)
+    party_types: dict[tuple[int, str], PartyType]
+    attorneys_by_name: dict[str, list[Attorney]]
+    # Keyed by (attorney_id, party_id)
+    roles: dict[tuple[int, int], list[Role]]
+    # The (attorney_id, attorney_organization_id) associated in the docket.
+    org_associations: set[tuple[int, int]]
+
+    def get_terminated_entities(self) -> tuple[set[int], set[int]]:
+        """Identify the terminated parties and attorneys of the docket, same
+        as get_terminated_entities but without querying the DB.
+
+        :returns (parties, attorneys): A tuple of two sets. One for party IDs,
+        one for attorney IDs.
+        """
+        party_ids = {party_id for party_id, _ in self.party_types}
+        terminated_party_ids = {
+            pt.party_id
+            for pt in self.party_types.values()
+            if pt.date_terminated is not None
+        }
+        terminated_attorney_ids = {
+            role.attorney_id
+            for roles in self.roles.values()
+            for role in roles
+            if role.party_id in party_ids
+            and role.role in [Role.SELF_TERMINATED, Role.TERMINATED]
+        }
+        return terminated_party_ids, terminated_attorney_ids
+
+
+def load_docket_parties_state(d: Docket) -> DocketPartiesState:
+    """Load the parties, party types, attorneys, roles and attorney
+    organization associations of a docket.
+
+    :param d: The docket to load the parties and attorneys for.
+    :return: A DocketPartiesState object.
+    """
+    parties_by_name = defaultdict(list)
+    for p in (
+        Party.objects.filter(party_types__docket=d)
+        .distinct()
+        .order_by("date_created")
+    ):
+        parties_by_name[p.name].append(p)
+
+    attorneys_by_name = defaultdict(list)
+    for a in (
+        Attorney.objects.filter(roles__docket=d)
+        .distinct()
+        .order_by("date_created")
+    ):
+        attorneys_by_name[a.name].append(a)
+
+    roles = defaultdict(list)
+    for role in Role.objects.filter(docket=d):
+        roles[(role.attorney_id, role.party_id)].append(role)
+
+    return DocketPartiesState(
+        parties_by_name=parties_by_name,
+        party_types={
+            (pt.party_id, pt.name): pt
+            for pt in PartyType.objects.filter(docket=d)
+        },
+        attorneys_by_name=attorneys_by_name,
+        roles=roles,
+        org_associations=set(
+            AttorneyOrganizationAssociation.objects.filter(
+                docket=d
+            ).values_list("attorney_id", "attorney_organization_id")
+        ),
+    )
+
+
+def get_or_make_attorney_organizations(
+    orgs_info: dict[str, dict[str, str]]
+) -> dict[str, AttorneyOrganization]:
+    """Lookup the attorney organizations by their lookup keys, creating the
+    ones that don't exist yet.
+
+    :param orgs_info: A dict mapping lookup keys to the organization info
+    returned by normalize_attorney_contact.
+    :return: A dict mapping lookup keys to AttorneyOrganization objects.
+    """
+    orgs = {
+        org.lookup_key: org
+        for org in AttorneyOrganization.objects.filter(
+            lookup_key__in=orgs_info.keys()
+        )
+    }
+    missing_keys = orgs_info.keys() - orgs.keys()
+    if missing_keys:
+        # Organizations created by another process in the meantime are
+        # ignored here and fetched below.
+        AttorneyOrganization.objects.bulk_create(
+            [AttorneyOrganization(**orgs_info[key]) for key in missing_keys],
+            ignore_conflicts=True,
+        )
+        orgs.update(
+            {
+                org.lookup_key: org
+                for org in AttorneyOrganization.objects.filter(
+                    lookup_key__in=missing_keys
+                )
+            }
+        )
+    return orgs
+
+
+def reconcile_roles(
+    state: DocketPartiesState,
+    d: Docket,
+    new_roles: dict[tuple[int, int], list[dict[str, Any]]],
+) -> None:
+    """Replace the roles of the attorneys for their parties with the latest
+    ones, only writing the roles that changed.
+
+    :param state: The DocketPartiesState of the docket, updated in place.
+    :param d: The docket the roles belong to.
+    :param new_roles: A dict mapping (attorney_id, party_id) tuples to the
+    normalized roles of the attorney for the party.
+    :return: None
+    """
+    roles_to_delete = []
+    roles_to_create = []
+    for (attorney_id, party_id), atty_roles in new_roles.items():
+        wanted_roles = {
+            (r["role"], r.get("role_raw", ""), r["date_action"]): r
+            for r in atty_roles
+        }
+        kept_roles = []
+        for role in state.roles.get((attorney_id, party_id), []):
+            key = (role.role, role.role_raw, role.date_action)
+            if key in wanted_roles:
+                del wanted_roles[key]
+                kept_roles.append(role)
+            else:
+                roles_to_delete.append(role.pk)
+        created_roles = [
+            Role(
+                attorney_id=attorney_id,
+                party_id=party_id,
+                docket=d,
+                **atty_role,
+            )
+            for atty_role in wanted_roles.values()
+        ]
+        roles_to_create.extend(created_roles)
+        state.roles[(attorney_id, party_id)] = kept_roles + created_roles
+
+    if roles_to_delete:
+        Role.objects.filter(pk__in=roles_to_delete).delete()
+    Role.objects.bulk_create(roles_to_create)
+
+
 @transaction.atomic
 # Retry on transaction deadlocks; see #814.
 @retry(OperationalError, tries=2, delay=1, backoff=1, logger=logger)
 def add_parties_and_attorneys(d, parties):
     """Add parties and attorneys from the docket data to the docket.
 
+    The existing parties and attorneys of the docket are loaded at once and
+    reconciled in memory against the new data, so only the changes are
+    written, in bulk.
+
     :param d: The docket to update
     :param parties: The parties to update the docket with, with their
     associated attorney objects. This is typically the
@@ -1117,32 +1685,29 @@ def add_parties_and_attorneys(d, parties):
     local_parties = deepcopy(parties)
 
     normalize_attorney_roles(local_parties)
+    state = load_docket_parties_state(d)
+
+    # Create the parties that aren't in the docket yet.
+    new_parties = [
+        Party(name=name)
+        for name in {party["name"] for party in local_parties}
+        if name not in state.parties_by_name
+    ]
+    for p in Party.objects.bulk_create(new_parties):
+        state.parties_by_name[p.name].append(p)
 
     updated_parties = set()
-    updated_attorneys = set()
+    party_types_to_create = []
+    party_types_to_update = {}
+    criminal_counts = {}
+    criminal_complaints = {}
+    party_attorneys = []
     for party in local_parties:
-        ps = Party.objects.filter(
-            name=party["name"], party_types__docket=d
-        ).distinct()
-        count = ps.count()
-        if count == 0:
-            try:
-                p = Party.objects.create(name=party["name"])
-            except IntegrityError:
-                # Race condition. Object was created after our get and before
-                # our create. Try to get it again.
-                ps = Party.objects.filter(
-                    name=party["name"], party_types__docket=d
-                ).distinct()
-                count = ps.count()
-        if count == 1:
-            p = ps[0]
-        elif count >= 2:
-            p = ps.earliest("date_created")
+        # If there's more than one party with the name, the earliest wins.
+        p = state.parties_by_name[party["name"]][0]
         updated_parties.add(p.pk)
 
         # If the party type doesn't exist, make a new one.
-        pts = p.party_types.filter(docket=d, name=party["type"])
         criminal_data = party.get("criminal_data")
         update_dict = {
             "extra_info": party.get("extra_info", ""),
@@ -1155,50 +1720,153 @@ def add_parties_and_attorneys(d, parties):
             update_dict["highest_offense_level_terminated"] = criminal_data[
                 "highest_offense_level_terminated"
             ]
-        if pts.exists():
-            pts.update(**update_dict)
-            pt = pts[0]
-        else:
-            pt = PartyType.objects.create(
-                docket=d, party=p, name=party["type"], **update_dict
-            )
+        pt_key = (p.pk, party["type"])
+        pt = state.party_types.get(pt_key)
+        if pt is None:
+            pt = PartyType(docket=d, party=p, name=party["type"])
+            state.party_types[pt_key] = pt
+            party_types_to_create.append(pt)
+        for field_name, value in update_dict.items():
+            if getattr(pt, field_name) != value:
+                setattr(pt, field_name, value)
+                if pt.pk is not None:
+                    party_types_to_update[pt.pk] = pt
 
         # Criminal counts and complaints
         if criminal_data and criminal_data["counts"]:
-            CriminalCount.objects.filter(party_type=pt).delete()
-            CriminalCount.objects.bulk_create(
-                [
-                    CriminalCount(
-                        party_type=pt,
-                        name=criminal_count["name"],
-                        disposition=criminal_count["disposition"],
-                        status=CriminalCount.normalize_status(
-                            criminal_count["status"]
-                        ),
-                    )
-                    for criminal_count in criminal_data["counts"]
-                ]
-            )
-
+            criminal_counts[pt_key] = criminal_data["counts"]
         if criminal_data and criminal_data["complaints"]:
-            CriminalComplaint.objects.filter(party_type=pt).delete()
-            CriminalComplaint.objects.bulk_create(
-                [
-                    CriminalComplaint(
-                        party_type=pt,
-                        name=complaint["name"],
-                        disposition=complaint["disposition"],
-                    )
-                    for complaint in criminal_data["complaints"]
-                ]
-            )
+            criminal_complaints[pt_key] = criminal_data["complaints"]
 
-        # Attorneys
         for atty in party.get("attorneys", []):
-            updated_attorneys.add(add_attorney(atty, p, d))
+            party_attorneys.append((p, atty))
+
+    PartyType.objects.bulk_create(party_types_to_create)
+    PartyType.objects.bulk_update(
+        party_types_to_update.values(),
+        [
+            "extra_info",
+            "date_terminated",
+            "highest_offense_level_opening",
+            "highest_offense_level_terminated",
+        ],
+    )
+
+    # Criminal counts and complaints are replaced with the latest ones.
+    if criminal_counts:
+        CriminalCount.objects.filter(
+            party_type__in=[state.party_types[k] for k in criminal_counts]
+        ).delete()
+        CriminalCount.objects.bulk_create(
+            [
+                CriminalCount(
+                    party_type=state.party_types[pt_key],
+                    name=criminal_count["name"],
+                    disposition=criminal_count["disposition"],
+                    status=CriminalCount.normalize_status(
+                        criminal_count["status"]
+                    ),
+                )
+                for pt_key, counts in criminal_counts.items()
+                for criminal_count in counts
+            ]
+        )
+    if criminal_complaints:
+        CriminalComplaint.objects.filter(
+            party_type__in=[state.party_types[k] for k in criminal_complaints]
+        ).delete()
+        CriminalComplaint.objects.bulk_create(
+            [
+                CriminalComplaint(
+                    party_type=state.party_types[pt_key],
+                    name=complaint["name"],
+                    disposition=complaint["disposition"],
+                )
+                for pt_key, complaints in criminal_complaints.items()
+                for complaint in complaints
+            ]
+        )
+
+    # Attorneys. Create the ones that aren't in the docket yet.
+    new_attorneys = {}
+    for _, atty in party_attorneys:
+        if atty["name"] not in state.attorneys_by_name:
+            new_attorneys.setdefault(
+                atty["name"],
+                Attorney(name=atty["name"], contact_raw=atty["contact"]),
+            )
+    for a in Attorney.objects.bulk_create(new_attorneys.values()):
+        state.attorneys_by_name[a.name].append(a)
+
+    updated_attorneys = set()
+    attorneys_to_update = {}
+    orgs_info = {}
+    attorney_orgs = []
+    new_roles = {}
+    for p, atty in party_attorneys:
+        # If there's more than one attorney with the name, the earliest wins.
+        a = state.attorneys_by_name[atty["name"]][0]
+        updated_attorneys.add(a.pk)
+
+        # Associate the attorney with an org and update their contact info.
+        atty_org_info, atty_info = normalize_attorney_contact(
+            atty["contact"], fallback_name=atty["name"]
+        )
+        if atty["contact"]:
+            if atty_org_info:
+                orgs_info.setdefault(
+                    atty_org_info["lookup_key"], atty_org_info
+                )
+                attorney_orgs.append((a.pk, atty_org_info["lookup_key"]))
+
+            if atty_info:
+                contact = {
+                    "contact_raw": atty["contact"],
+                    "email": atty_info["email"],
+                    "phone": atty_info["phone"],
+                    "fax": atty_info["fax"],
+                }
+                for field_name, value in contact.items():
+                    if getattr(a, field_name) != value:
+                        setattr(a, field_name, value)
+                        attorneys_to_update[a.pk] = a
+
+        # Do roles. They're replaced by the latest ones.
+        roles = atty["roles"]
+        if len(roles) == 0:
+            roles = [{"role": Role.UNKNOWN, "date_action": None}]
+        new_roles[(a.pk, p.pk)] = roles
+
+    for a in attorneys_to_update.values():
+        a.date_modified = now()
+    Attorney.objects.bulk_update(
+        attorneys_to_update.values(),
+        ["contact_raw", "email", "phone", "fax", "date_modified"],
+    )
+
+    if orgs_info:
+        orgs = get_or_make_attorney_organizations(orgs_info)
+        new_associations = {
+            (attorney_id, orgs[lookup_key].pk)
+            for attorney_id, lookup_key in attorney_orgs
+        } - state.org_associations
+        AttorneyOrganizationAssociation.objects.bulk_create(
+            [
+                AttorneyOrganizationAssociation(
+                    attorney_id=attorney_id,
+                    attorney_organization_id=org_id,
+                    docket=d,
+                )
+                for attorney_id, org_id in new_associations
+            ],
+            ignore_conflicts=True,
+        )
+        state.org_associations |= new_associations
+
+    reconcile_roles(state, d, new_roles)
 
     disassociate_extraneous_entities(
-        d, local_parties, updated_parties, updated_attorneys
+        d, local_parties, updated_parties, updated_attorneys, state
     )
 
 
@@ -1345,7 +2013,7 @@ def add_claims_to_docket(d, new_claims, tag_names=None):
         )
         db_claim.remarks = new_claim.get("remarks") or db_claim.remarks
         db_claim.save()
-        add_tags_to_objs(tag_names, [db_claim])
+        async_to_sync(add_tags_to_objs)(tag_names, [db_claim])
         for new_history in new_claim["history"]:
             add_claim_history_entry(new_history, db_claim)
 
@@ -1377,7 +2045,7 @@ async def add_tags_to_objs(tag_names: List[str], objs: Any) -> QuerySet:
 
     :param tag_names: A list of tag name strings
     :type tag_names: list
-    :param objs: A list of objects in need of tags
+    :param objs: A list or queryset of objects in need of tags
     :type objs: list
     :return: [] if no tag names, else a list of the tags created/found
     """
@@ -1390,8 +2058,7 @@ async def add_tags_to_objs(tag_names: List[str], objs: Any) -> QuerySet:
         tags.append(tag)
 
     for tag in tags:
-        for obj in objs:
-            tag.tag_object(obj)
+        await tag.atag_objects(objs)
     return tags
 
 
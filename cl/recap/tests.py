@@ -15,7 +15,9 @@ from django.contrib.auth.models import User
 from django.core import mail
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from juriscraper.pacer import PacerRssFeed
@@ -78,6 +80,7 @@ from cl.recap.management.commands.reprocess_recap_dockets import (
     extract_unextracted_rds_and_add_to_solr,
 )
 from cl.recap.mergers import (
+    DocketLookupIndex,
     add_attorney,
     add_docket_entries,
     add_parties_and_attorneys,
@@ -109,6 +112,7 @@ from cl.recap.tasks import (
     process_recap_pdf,
     process_recap_zip,
 )
+from cl.recap_rss.models import RssItemCache
 from cl.recap_rss.tasks import merge_rss_feed_contents
 from cl.search.factories import (
     CourtFactory,
@@ -1711,6 +1715,53 @@ class TerminatedEntitiesTest(TestCase):
         role_count = Role.objects.filter(docket=self.d).count()
         self.assertEqual(role_count, 2)
 
+    def test_parties_are_reconciled_in_bulk(self) -> None:
+        """Does adding parties take the same number of queries regardless of
+        the number of parties and attorneys?
+        """
+
+        def make_parties(count: int) -> list[dict]:
+            return [
+                {
+                    "extra_info": "",
+                    "name": f"Party {i}",
+                    "type": "plaintiff",
+                    "attorneys": [
+                        {
+                            "contact": "Lane Powell LLC\n"
+                            "301 W. Nothern Lights Blvd., Suite 301\n"
+                            "Anchorage, AK 99503-2648\n"
+                            "907-276-2631\n"
+                            f"Email: attorney{i}@lanepowell.com\n",
+                            "name": f"Attorney {i}",
+                            "roles": ["LEAD ATTORNEY"],
+                        }
+                    ],
+                    "date_terminated": None,
+                }
+                for i in range(count)
+            ]
+
+        query_counts = []
+        for count in (2, 10):
+            d = Docket.objects.create(
+                source=0, court_id="scotus", pacer_case_id=f"asdf-{count}"
+            )
+            parties = make_parties(count)
+            add_parties_and_attorneys(d, parties)
+            with CaptureQueriesContext(connection) as ctx:
+                add_parties_and_attorneys(d, parties)
+            query_counts.append(len(ctx.captured_queries))
+            self.assertEqual(d.parties.count(), count)
+            self.assertEqual(Role.objects.filter(docket=d).count(), count)
+            self.assertEqual(
+                AttorneyOrganizationAssociation.objects.filter(
+                    docket=d
+                ).count(),
+                count,
+            )
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_no_parties(self) -> None:
         """Do we keep the old parties when the new case has none?"""
         count_before = self.d.parties.count()
@@ -1961,6 +2012,124 @@ class RecapMinuteEntriesTest(TestCase):
         self.assertEqual(docket.assigned_to_str, "John Marshall")
         self.assertEqual(docket.referred_to_str, "Sophia Clinton")
 
+    @mock.patch("cl.recap_rss.tasks.enqueue_docket_alert")
+    def test_merge_rss_feed_items_in_batch(self, mock_enqueue_de) -> None:
+        """Are RSS items merged only once, and are the items of a new docket
+        in the same feed merged into a single docket?
+        """
+        court_ca10 = CourtFactory(id="ca10", jurisdiction="F")
+        rss_feed = PacerRssFeed(court_ca10.pk)
+        with open(self.make_path("rss_ca10.xml"), "rb") as f:
+            text = f.read().decode()
+        rss_feed._parse_text(text)
+
+        # Add a second item for the first docket in the feed.
+        item = deepcopy(rss_feed.data[0])
+        item["case_name"] = f"{item['case_name']} (Updated)"
+        feed_data = rss_feed.data + [item]
+        merge_rss_feed_contents(feed_data, court_ca10.pk)
+        self.assertEqual(RssItemCache.objects.count(), 4)
+        self.assertEqual(Docket.objects.count(), 3)
+        d = Docket.objects.get(docket_number=item["docket_number"])
+        self.assertEqual(d.docket_entries.count(), 1)
+
+        # The cached items are skipped.
+        result = merge_rss_feed_contents(feed_data, court_ca10.pk)
+        self.assertEqual(result["rds_for_solr"], [])
+        self.assertEqual(RssItemCache.objects.count(), 4)
+        self.assertEqual(Docket.objects.count(), 3)
+
+    @mock.patch("cl.recap_rss.tasks.enqueue_docket_alert")
+    def test_merge_rss_feed_failure_releases_claims(
+        self, mock_enqueue_de
+    ) -> None:
+        """Are only the items merged before a failure kept in the cache, so
+        the rest are merged when the feed is processed again?
+        """
+        court_ca10 = CourtFactory(id="ca10", jurisdiction="F")
+        rss_feed = PacerRssFeed(court_ca10.pk)
+        with open(self.make_path("rss_ca10.xml"), "rb") as f:
+            text = f.read().decode()
+        rss_feed._parse_text(text)
+
+        merged_items = []
+
+        async def fail_second_item(d, docket_entries):
+            if merged_items:
+                raise ValueError("Merge failed")
+            merged_items.append(d)
+            return await add_docket_entries(d, docket_entries)
+
+        with (
+            mock.patch(
+                "cl.recap_rss.tasks.add_docket_entries",
+                side_effect=fail_second_item,
+            ),
+            self.assertRaises(ValueError),
+        ):
+            merge_rss_feed_contents(rss_feed.data, court_ca10.pk)
+        self.assertEqual(RssItemCache.objects.count(), 1)
+
+        merge_rss_feed_contents(rss_feed.data, court_ca10.pk)
+        self.assertEqual(RssItemCache.objects.count(), 3)
+        self.assertEqual(Docket.objects.count(), 3)
+
+    @mock.patch("cl.recap_rss.tasks.enqueue_docket_alert")
+    def test_merge_rss_feed_reloads_matched_dockets(
+        self, mock_enqueue_de
+    ) -> None:
+        """Are the dockets matched through the lookup index reloaded before
+        saving them, so writes made after the index was loaded are kept?
+        """
+        court_ca10 = CourtFactory(id="ca10", jurisdiction="F")
+        rss_feed = PacerRssFeed(court_ca10.pk)
+        with open(self.make_path("rss_ca10.xml"), "rb") as f:
+            text = f.read().decode()
+        rss_feed._parse_text(text)
+        merge_rss_feed_contents(rss_feed.data, court_ca10.pk)
+        RssItemCache.objects.all().delete()
+
+        find = DocketLookupIndex.find
+
+        def find_and_update(index, pacer_case_id, docket_number):
+            d = find(index, pacer_case_id, docket_number)
+            # Another process updates the docket after the index was loaded.
+            Docket.objects.filter(pk=d.pk).update(view_count=42)
+            return d
+
+        with mock.patch.object(
+            DocketLookupIndex,
+            "find",
+            autospec=True,
+            side_effect=find_and_update,
+        ):
+            merge_rss_feed_contents(rss_feed.data, court_ca10.pk)
+        self.assertEqual(Docket.objects.count(), 3)
+        self.assertTrue(all(d.view_count == 42 for d in Docket.objects.all()))
+
+    def test_docket_lookup_index_skips_blank_values(self) -> None:
+        """Are dockets with a blank docket_number_core left out of the index
+        when an item's docket number can't be parsed?
+        """
+        court = CourtFactory(id="ca10", jurisdiction="F")
+        d_blank_core = DocketFactory(
+            court=court,
+            source=Docket.RECAP,
+            docket_number="Unparseable",
+            pacer_case_id="999",
+        )
+        d = DocketFactory(
+            court=court,
+            source=Docket.RECAP,
+            docket_number="Not a number",
+            pacer_case_id="12345",
+        )
+        self.assertEqual(d_blank_core.docket_number_core, "")
+
+        docket_index = DocketLookupIndex(court.pk, [("12345", "Not a number")])
+        self.assertNotIn(d_blank_core.pk, docket_index._keys)
+        self.assertEqual(docket_index.find("12345", "Not a number"), d)
+
 
 class DescriptionCleanupTest(SimpleTestCase):
     def test_cleanup(self) -> None:
@@ -2090,6 +2259,103 @@ class RecapDocketTaskTest(TestCase):
             msg="New docket entry didn't get created.",
         )
 
+    def test_merge_skips_main_documents_created_concurrently(self) -> None:
+        """Is a main document inserted concurrently by another merge skipped,
+        without breaking the transaction the merge runs in?
+        """
+        d = DocketFactory(court=CourtFactory(jurisdiction="FD"))
+        sheet = [
+            DocketEntryDataFactory(document_number=i, pacer_doc_id=f"{i}")
+            for i in range(1, 3)
+        ]
+        async_to_sync(add_docket_entries)(d, deepcopy(sheet))
+
+        # The lookup and the duplicate probe miss the existing documents, as
+        # they would if the other merge inserted them in the meantime.
+        with (
+            mock.patch(
+                "cl.recap.mergers.aget_recap_document",
+                side_effect=RECAPDocument.DoesNotExist,
+            ),
+            mock.patch.object(
+                RECAPDocument, "_may_have_duplicate", return_value=False
+            ),
+            transaction.atomic(),
+        ):
+            _, rds_created, _ = async_to_sync(add_docket_entries)(
+                d, deepcopy(sheet)
+            )
+            self.assertEqual(rds_created, [])
+            self.assertEqual(
+                RECAPDocument.objects.filter(docket_entry__docket=d).count(),
+                2,
+            )
+
+    def test_merge_docket_entries_in_bulk(self) -> None:
+        """Does merging a docket sheet again take the same number of queries
+        regardless of its number of entries, and are only the changed
+        entries updated?
+        """
+        court = CourtFactory(jurisdiction="FD")
+        small_docket = DocketFactory(court=court, source=Docket.RECAP)
+        large_docket = DocketFactory(court=court, source=Docket.RECAP)
+        small_sheet = [
+            DocketEntryDataFactory(document_number=i, pacer_doc_id=f"{i}")
+            for i in range(1, 3)
+        ]
+        large_sheet = [
+            DocketEntryDataFactory(document_number=i, pacer_doc_id=f"{i}")
+            for i in range(1, 21)
+        ]
+        _, rds_created, content_updated = async_to_sync(add_docket_entries)(
+            large_docket, large_sheet
+        )
+        self.assertEqual(len(rds_created), 20)
+        self.assertTrue(content_updated)
+        async_to_sync(add_docket_entries)(small_docket, small_sheet)
+
+        query_counts = []
+        for d, sheet in (
+            (small_docket, small_sheet),
+            (large_docket, large_sheet),
+        ):
+            with CaptureQueriesContext(connection) as ctx:
+                (des, rds_updated), rds_created, content_updated = (
+                    async_to_sync(add_docket_entries)(d, deepcopy(sheet))
+                )
+            query_counts.append(len(ctx.captured_queries))
+            self.assertEqual(len(des), len(sheet))
+            self.assertEqual(len(rds_updated), len(sheet))
+            self.assertEqual(rds_created, [])
+            self.assertFalse(content_updated)
+        self.assertEqual(query_counts[0], query_counts[1])
+
+        # A changed description is saved, the new entry is created.
+        large_sheet[0]["description"] = "Updated description"
+        large_sheet.append(
+            DocketEntryDataFactory(document_number=21, pacer_doc_id="21")
+        )
+        _, rds_created, content_updated = async_to_sync(add_docket_entries)(
+            large_docket, large_sheet
+        )
+        self.assertEqual(len(rds_created), 1)
+        self.assertTrue(content_updated)
+        self.assertEqual(large_docket.docket_entries.count(), 21)
+        self.assertEqual(
+            large_docket.docket_entries.get(entry_number=1).description,
+            "Updated description",
+        )
+
+        # Entries saved with bulk_update get their date_modified bumped.
+        old_date = now() - timedelta(days=1)
+        large_docket.docket_entries.filter(entry_number=2).update(
+            recap_sequence_number="stale", date_modified=old_date
+        )
+        async_to_sync(add_docket_entries)(large_docket, large_sheet)
+        de = large_docket.docket_entries.get(entry_number=2)
+        self.assertNotEqual(de.recap_sequence_number, "stale")
+        self.assertGreater(de.date_modified, old_date)
+
     @mock.patch(
         "cl.lib.storage.get_name_by_incrementing",
         side_effect=clobbering_get_name,
@@ -5344,7 +5610,7 @@ class WebhooksRetries(TestCase):
             next_retry_date = fake_now + timedelta(minutes=1)
             with time_machine.travel(next_retry_date, tick=False):
                 with mock.patch(
-                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_event"
+                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_events"
                 ):
                     webhooks_to_retry = retry_webhook_events()
                     # No webhooks events should be retried since it's no time.
@@ -5354,7 +5620,7 @@ class WebhooksRetries(TestCase):
             next_retry_date = fake_now + timedelta(minutes=3)
             with time_machine.travel(next_retry_date, tick=False):
                 with mock.patch(
-                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_event"
+                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_events"
                 ):
                     # Only webhook_e1 should be retried.
                     webhooks_to_retry = retry_webhook_events()
@@ -5364,7 +5630,7 @@ class WebhooksRetries(TestCase):
             next_retry_date = fake_now + timedelta(minutes=5)
             with time_machine.travel(next_retry_date, tick=False):
                 with mock.patch(
-                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_event"
+                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_events"
                 ):
                     # Only webhook_e1 should be retried.
                     webhooks_to_retry = retry_webhook_events()
@@ -5374,13 +5640,13 @@ class WebhooksRetries(TestCase):
             next_retry_date = fake_now + timedelta(hours=10)
             with time_machine.travel(next_retry_date, tick=False):
                 with mock.patch(
-                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_event"
+                    "cl.api.management.commands.cl_retry_webhooks.send_webhook_events"
                 ):
                     webhooks_to_retry = retry_webhook_events()
                     self.assertEqual(webhooks_to_retry, 1)
 
             webhook_e1_compare = WebhookEvent.objects.filter(pk=webhook_e1.id)
-            # Retry without mocking send_webhook_event
+            # Retry without mocking send_webhook_events
             next_retry_date = fake_now + timedelta(minutes=10)
             with time_machine.travel(next_retry_date, tick=False):
                 webhooks_to_retry = retry_webhook_events()
@@ -26,14 +26,15 @@ from cl.lib.pacer import map_cl_to_pacer_id
 from cl.lib.types import EmailType
 from cl.recap.constants import COURT_TIMEZONES
 from cl.recap.mergers import (
+    DocketLookupIndex,
     add_bankruptcy_data_to_docket,
     add_docket_entries,
-    find_docket_object,
     update_docket_metadata,
 )
 from cl.recap_rss.models import RssFeedData, RssFeedStatus, RssItemCache
 from cl.recap_rss.utils import emails
-from cl.search.models import Court
+from cl.search.models import Court, Docket
+from cl.stats.utils import tally_stat
 
 logger = logging.getLogger(__name__)
 
@@ -311,6 +312,20 @@ async def cache_hash(item_hash):
         return True
 
 
+def get_cached_item_hashes(item_hashes: list[str]) -> set[str]:
+    """Get which of the hashes of a batch of RSS items are already in the RSS
+    Item Cache, with a single query.
+
+    :param item_hashes: The hashes of the items to check.
+    :return: The set of hashes found in the cache.
+    """
+    return set(
+        RssItemCache.objects.filter(hash__in=item_hashes).values_list(
+            "hash", flat=True
+        )
+    )
+
+
 @app.task(bind=True, max_retries=1)
 def merge_rss_feed_contents(self, feed_data, court_pk, metadata_only=False):
     """Merge the rss feed contents into CourtListener
@@ -326,23 +341,45 @@ def merge_rss_feed_contents(self, feed_data, court_pk, metadata_only=False):
     """
     start_time = now()
 
-    # RSS feeds are a list of normal Juriscraper docket objects.
+    # RSS feeds are a list of normal Juriscraper docket objects. Items already
+    # in the cache are skipped.
+    item_hashes = [hash_item(docket) for docket in feed_data]
+    cached_hashes = get_cached_item_hashes(item_hashes)
+    items = []
+    for item_hash, docket in zip(item_hashes, feed_data):
+        if item_hash not in cached_hashes:
+            items.append((item_hash, docket))
+            # Duplicated items in the feed are merged only once.
+            cached_hashes.add(item_hash)
+
+    docket_index = DocketLookupIndex(
+        court_pk,
+        [
+            (docket["pacer_case_id"], docket["docket_number"])
+            for _, docket in items
+        ],
+    )
     all_rds_created = []
     d_pks_to_alert = []
-    for docket in feed_data:
-        item_hash = hash_item(docket)
-        if async_to_sync(is_cached)(item_hash):
-            continue
-
+    items_merged = 0
+    for item_hash, docket in items:
         with transaction.atomic():
+            # The item is claimed within the transaction that merges it, so
+            # the claim is rolled back if the merge doesn't complete.
             cached_ok = async_to_sync(cache_hash)(item_hash)
             if not cached_ok:
                 # The item is already in the cache, ergo it's getting processed
                 # in another thread/process and we had a race condition.
                 continue
-            d = async_to_sync(find_docket_object)(
-                court_pk, docket["pacer_case_id"], docket["docket_number"]
+            items_merged += 1
+            d = docket_index.find(
+                docket["pacer_case_id"], docket["docket_number"]
             )
+            if d.pk:
+                # The index is only used for the lookup. The docket may have
+                # been updated since the index was loaded, so it's reloaded
+                # and locked to avoid overwriting concurrent writes.
+                d = Docket.objects.select_for_update().get(pk=d.pk)
 
             d.add_recap_source()
             async_to_sync(update_docket_metadata)(d, docket)
@@ -355,6 +392,7 @@ def merge_rss_feed_contents(self, feed_data, court_pk, metadata_only=False):
                 # The docket was created while we looked it up. Retry and it
                 # should associate with the new one instead.
                 raise self.retry(exc=exc)
+            docket_index.add(d)
             if metadata_only:
                 continue
 
@@ -369,10 +407,16 @@ def merge_rss_feed_contents(self, feed_data, court_pk, metadata_only=False):
 
         all_rds_created.extend([rd.pk for rd in rds_created])
 
+    elapsed_ms = int((now() - start_time).total_seconds() * 1000)
+    async_to_sync(tally_stat)(f"rss.merge.{court_pk}.ms", inc=elapsed_ms)
+    async_to_sync(tally_stat)(f"rss.merge.{court_pk}.items", inc=items_merged)
     logger.info(
-        "%s: Sending %s new RECAP documents to Solr for indexing and "
-        "sending %s dockets for alerts.",
+        "%s: Merged %s of %s RSS items in %sms. Sending %s new RECAP "
+        "documents to Solr for indexing and sending %s dockets for alerts.",
         court_pk,
+        items_merged,
+        len(feed_data),
+        elapsed_ms,
         len(all_rds_created),
         len(d_pks_to_alert),
     )
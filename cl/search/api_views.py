@@ -2,6 +2,7 @@ import waffle
 from rest_framework import pagination, permissions, response, status, viewsets
 from rest_framework.pagination import PageNumberPagination
 
+from cl.api.pagination import CursorOrPageNumberPagination
 from cl.api.utils import CacheListMixin, LoggingMixin, RECAPUsersReadOnly
 from cl.search import api_utils
 from cl.search.api_serializers import (
@@ -73,6 +74,7 @@ class DocketViewSet(LoggingMixin, viewsets.ModelViewSet):
 
 
 class DocketEntryViewSet(LoggingMixin, viewsets.ModelViewSet):
+    pagination_class = CursorOrPageNumberPagination
     permission_classes = (RECAPUsersReadOnly,)
     serializer_class = DocketEntrySerializer
     filterset_class = DocketEntryFilter
@@ -95,6 +97,7 @@ class RECAPDocumentViewSet(
     LoggingMixin, CacheListMixin, viewsets.ModelViewSet
 ):
     permission_classes = (RECAPUsersReadOnly,)
+    pagination_class = CursorOrPageNumberPagination
     serializer_class = RECAPDocumentSerializer
     filterset_class = RECAPDocumentFilter
     ordering_fields = ("id", "date_created", "date_modified", "date_upload")
@@ -158,6 +161,7 @@ class OpinionViewSet(LoggingMixin, viewsets.ModelViewSet):
 
 
 class OpinionsCitedViewSet(LoggingMixin, viewsets.ModelViewSet):
+    pagination_class = CursorOrPageNumberPagination
     serializer_class = OpinionsCitedSerializer
     filterset_class = OpinionsCitedFilter
     queryset = OpinionsCited.objects.all().order_by("-id")
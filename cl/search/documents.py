@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from django.db.models import Prefetch, QuerySet
 from django.http import QueryDict
 from django.utils.html import escape, strip_tags
 from django_elasticsearch_dsl import Document, fields
@@ -37,11 +38,76 @@ from cl.search.models import (
     Docket,
     Opinion,
     OpinionCluster,
+    OpinionsCited,
+    OpinionsCitedByRECAPDocument,
     ParentheticalGroup,
     RECAPDocument,
 )
 
 
+class BulkPrepareMixin:
+    """Mixin for child documents that can be prepared in bulk.
+
+    Child documents share a lot of fields with their parent. When many
+    children from the same parent are indexed together, the fields listed in
+    parent_fields are prepared only once per parent and reused, and the
+    queryset is built with the relations each document requires so that no
+    query is performed per child.
+    """
+
+    # Relations to join when preparing documents in bulk.
+    bulk_select_related: tuple[str, ...] = ()
+    # Relations to fetch in a batched query when preparing documents in bulk.
+    bulk_prefetch_related: tuple[str | Prefetch, ...] = ()
+    # Fields whose value only depends on the parent instance.
+    parent_fields: frozenset[str] = frozenset()
+
+    @classmethod
+    def get_bulk_queryset(cls, queryset: QuerySet) -> QuerySet:
+        """Add the relations required to prepare documents in bulk to a
+        queryset.
+
+        :param queryset: The child documents queryset.
+        :return: The queryset with the required joins and prefetches.
+        """
+        return queryset.select_related(
+            *cls.bulk_select_related
+        ).prefetch_related(*cls.bulk_prefetch_related)
+
+    def prepare_bulk(
+        self,
+        instance,
+        parent_id: int,
+        parent_fields_cache: dict[int, dict],
+    ) -> dict:
+        """Prepare a child document, reusing the fields that depend on its
+        parent if they were already prepared for a sibling.
+
+        :param instance: The child instance to prepare.
+        :param parent_id: The ID of the instance parent.
+        :param parent_fields_cache: A dict mapping parent IDs to their
+        already prepared fields. It's updated in place.
+        :return: The prepared document.
+        """
+        parent_data = parent_fields_cache.get(parent_id)
+        if parent_data is None:
+            parent_data = {
+                name: prep_func(instance)
+                for name, field, prep_func in self._prepared_fields
+                if name in self.parent_fields
+            }
+            parent_fields_cache[parent_id] = parent_data
+
+        return {
+            name: (
+                parent_data[name]
+                if name in parent_data
+                else prep_func(instance)
+            )
+            for name, field, prep_func in self._prepared_fields
+        }
+
+
 @parenthetical_group_index.document
 class ParentheticalGroupDocument(Document):
     author_id = fields.IntegerField(attr="opinion.author_id")
@@ -550,7 +616,7 @@ class PersonBaseDocument(Document):
 
 
 @people_db_index.document
-class PositionDocument(PersonBaseDocument):
+class PositionDocument(BulkPrepareMixin, PersonBaseDocument):
     court = fields.TextField(
         attr="court.short_name",
         analyzer="text_en_splitting_cl",
@@ -679,6 +745,36 @@ class PositionDocument(PersonBaseDocument):
         model = Position
         ignore_signals = True
 
+    bulk_select_related = (
+        "person",
+        "court",
+        "appointer__person",
+        "supervisor",
+        "predecessor",
+    )
+    parent_fields = frozenset(
+        {
+            "id",
+            "alias_ids",
+            "races",
+            "political_affiliation_id",
+            "fjc_id",
+            "name",
+            "gender",
+            "religion",
+            "alias",
+            "dob",
+            "dod",
+            "dob_city",
+            "dob_state",
+            "dob_state_id",
+            "political_affiliation",
+            "aba_rating",
+            "school",
+            "person_child",
+        }
+    )
+
     def prepare_position_type(self, instance):
         return instance.get_position_type_display()
 
@@ -958,7 +1054,7 @@ class DocketBaseDocument(Document):
 
 
 @recap_index.document
-class ESRECAPDocument(DocketBaseDocument):
+class ESRECAPDocument(BulkPrepareMixin, DocketBaseDocument):
     id = fields.IntegerField(attr="pk")
     docket_entry_id = fields.IntegerField(attr="docket_entry.pk")
     description = fields.TextField(
@@ -1030,6 +1126,46 @@ class ESRECAPDocument(DocketBaseDocument):
         model = RECAPDocument
         ignore_signals = True
 
+    bulk_select_related = (
+        "docket_entry__docket__court",
+        "docket_entry__docket__assigned_to",
+        "docket_entry__docket__referred_to",
+        "docket_entry__docket__bankruptcy_information",
+    )
+    bulk_prefetch_related = (
+        Prefetch(
+            "cited_opinions",
+            queryset=OpinionsCitedByRECAPDocument.objects.only(
+                "citing_document", "cited_opinion"
+            ),
+        ),
+    )
+    parent_fields = frozenset(
+        {
+            "docket_child",
+            "docket_id",
+            "caseName",
+            "case_name_full",
+            "docketNumber",
+            "suitNature",
+            "cause",
+            "juryDemand",
+            "jurisdictionType",
+            "dateArgued",
+            "dateFiled",
+            "dateTerminated",
+            "assignedTo",
+            "assigned_to_id",
+            "referredTo",
+            "referred_to_id",
+            "court",
+            "court_id",
+            "court_citation_string",
+            "chapter",
+            "trustee_str",
+        }
+    )
+
     def prepare_document_number(self, instance):
         return instance.document_number or None
 
@@ -1123,11 +1259,11 @@ class ESRECAPDocument(DocketBaseDocument):
         return escape(instance.plain_text.translate(null_map))
 
     def prepare_cites(self, instance):
-        return list(
-            instance.cited_opinions.all().values_list(
-                "cited_opinion_id", flat=True
-            )
-        )
+        # Iterate over all() so that prefetched citations are used when
+        # preparing documents in bulk.
+        return [
+            cite.cited_opinion_id for cite in instance.cited_opinions.all()
+        ]
 
 
 @recap_index.document
@@ -1573,7 +1709,7 @@ class OpinionBaseDocument(Document):
 
 
 @opinion_index.document
-class OpinionDocument(OpinionBaseDocument):
+class OpinionDocument(BulkPrepareMixin, OpinionBaseDocument):
     id = fields.IntegerField(
         attr="pk",
         fields={
@@ -1610,6 +1746,50 @@ class OpinionDocument(OpinionBaseDocument):
         model = Opinion
         ignore_signals = True
 
+    bulk_select_related = ("cluster__docket__court", "author")
+    bulk_prefetch_related = (
+        Prefetch(
+            "cited_opinions",
+            queryset=OpinionsCited.objects.only(
+                "citing_opinion", "cited_opinion"
+            ),
+        ),
+        Prefetch("joined_by", queryset=Person.objects.only("pk")),
+    )
+    parent_fields = frozenset(
+        {
+            "absolute_url",
+            "cluster_id",
+            "docket_id",
+            "docketNumber",
+            "caseName",
+            "caseNameFull",
+            "dateFiled",
+            "dateArgued",
+            "dateReargued",
+            "dateReargumentDenied",
+            "court_id",
+            "court",
+            "court_citation_string",
+            "judge",
+            "panel_names",
+            "attorney",
+            "suitNature",
+            "citation",
+            "status",
+            "procedural_history",
+            "posture",
+            "syllabus",
+            "scdb_id",
+            "sibling_ids",
+            "panel_ids",
+            "neutralCite",
+            "lexisCite",
+            "citeCount",
+            "cluster_child",
+        }
+    )
+
     def prepare_absolute_url(self, instance):
         return instance.cluster.get_absolute_url()
 
@@ -1627,14 +1807,14 @@ class OpinionDocument(OpinionBaseDocument):
             return instance.local_path.name
 
     def prepare_cites(self, instance):
-        return list(
-            instance.cited_opinions.all().values_list(
-                "cited_opinion_id", flat=True
-            )
-        )
+        # Iterate over all() so that prefetched citations are used when
+        # preparing documents in bulk.
+        return [
+            cite.cited_opinion_id for cite in instance.cited_opinions.all()
+        ]
 
     def prepare_joined_by_ids(self, instance):
-        return list(instance.joined_by.all().values_list("id", flat=True))
+        return [judge.pk for judge in instance.joined_by.all()]
 
     def prepare_text(self, instance):
         if instance.html_columbia:
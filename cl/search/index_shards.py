@@ -0,0 +1,228 @@
+import math
+
+from django.db.models import Max, Min
+from redis import Redis
+
+from cl.lib.redis_utils import make_redis_interface
+from cl.people_db.models import Person
+from cl.search.models import SEARCH_TYPES, Docket, OpinionCluster
+from cl.search.types import IndexShard
+
+SHARDS_TTL = 60 * 60 * 24 * 28  # 4 weeks
+SHARD_LEASE_TTL = 60 * 10
+
+
+def compose_shards_key(search_type: str, suffix: str = "") -> str:
+    """Compose a Redis key used to coordinate the indexing shards of a
+    search type.
+
+    :param search_type: The type of search.
+    :param suffix: An optional suffix for the key.
+    :return: A Redis key as a string.
+    """
+    if suffix:
+        return f"es_{search_type}_indexing:shards:{suffix}"
+    return f"es_{search_type}_indexing:shards"
+
+
+def get_parent_pk_range(
+    search_type: str, pk_offset: int = 0
+) -> tuple[int, int] | None:
+    """Get the lowest and highest parent document PKs to index.
+
+    :param search_type: The type of search.
+    :param pk_offset: The parent document pk to start from.
+    :return: A two tuple with the lowest and highest PKs, or None if there
+    are no parent documents to index.
+    """
+    match search_type:
+        case SEARCH_TYPES.PEOPLE:
+            queryset = Person.objects.filter(is_alias_of=None)
+        case SEARCH_TYPES.RECAP:
+            queryset = Docket.objects.all()
+        case SEARCH_TYPES.OPINION:
+            queryset = OpinionCluster.objects.all()
+        case _:
+            return None
+
+    pk_range = queryset.filter(pk__gte=pk_offset).aggregate(
+        min_pk=Min("pk"), max_pk=Max("pk")
+    )
+    if pk_range["min_pk"] is None:
+        return None
+    return pk_range["min_pk"], pk_range["max_pk"]
+
+
+def create_index_shards(
+    search_type: str, num_shards: int, pk_offset: int = 0
+) -> list[IndexShard]:
+    """Split the parent documents PK space into contiguous shards and store
+    them in Redis, discarding any previous shards and checkpoints.
+
+    :param search_type: The type of search.
+    :param num_shards: The number of shards to create.
+    :param pk_offset: The parent document pk to start from.
+    :return: A list of the IndexShard created.
+    """
+    r = make_redis_interface("CACHE")
+    pk_range = get_parent_pk_range(search_type, pk_offset)
+    delete_index_shards(search_type, r)
+    if pk_range is None:
+        return []
+
+    min_pk, max_pk = pk_range
+    shard_size = math.ceil((max_pk - min_pk + 1) / num_shards)
+    shards = []
+    for shard_id, start in enumerate(range(min_pk, max_pk + 1, shard_size)):
+        end = min(start + shard_size - 1, max_pk)
+        shards.append(
+            IndexShard(
+                shard_id=shard_id, start=start, end=end, checkpoint=start - 1
+            )
+        )
+
+    ranges_key = compose_shards_key(search_type)
+    pipe = r.pipeline()
+    pipe.hset(
+        ranges_key,
+        mapping={
+            str(shard.shard_id): f"{shard.start}:{shard.end}"
+            for shard in shards
+        },
+    )
+    pipe.expire(ranges_key, SHARDS_TTL)
+    pipe.execute()
+    return shards
+
+
+def delete_index_shards(search_type: str, r: Redis | None = None) -> None:
+    """Remove the shards, checkpoints and leases of a search type.
+
+    :param search_type: The type of search.
+    :param r: Optional, the Redis interface to use.
+    :return: None
+    """
+    if r is None:
+        r = make_redis_interface("CACHE")
+    # The shard keys are derived from the shard IDs, so they're deleted
+    # without scanning the keyspace.
+    shard_ids = r.hkeys(compose_shards_key(search_type))
+    r.delete(
+        compose_shards_key(search_type),
+        compose_shards_key(search_type, "checkpoints"),
+        compose_shards_key(search_type, "done"),
+        *[
+            compose_shards_key(search_type, f"lease:{shard_id}")
+            for shard_id in shard_ids
+        ],
+    )
+
+
+def get_index_shards(search_type: str) -> list[IndexShard]:
+    """Get the shards of a search type along with their progress.
+
+    :param search_type: The type of search.
+    :return: A list of IndexShard sorted by shard ID.
+    """
+    r = make_redis_interface("CACHE")
+    pipe = r.pipeline()
+    pipe.hgetall(compose_shards_key(search_type))
+    pipe.hgetall(compose_shards_key(search_type, "checkpoints"))
+    pipe.smembers(compose_shards_key(search_type, "done"))
+    ranges, checkpoints, done = pipe.execute()
+
+    shard_ids = sorted(ranges, key=int)
+    pipe = r.pipeline()
+    for shard_id in shard_ids:
+        pipe.get(compose_shards_key(search_type, f"lease:{shard_id}"))
+    owners = pipe.execute()
+
+    shards = []
+    for shard_id, owner in zip(shard_ids, owners):
+        start, end = (int(pk) for pk in ranges[shard_id].split(":"))
+        shards.append(
+            IndexShard(
+                shard_id=int(shard_id),
+                start=start,
+                end=end,
+                checkpoint=int(checkpoints.get(shard_id, start - 1)),
+                done=shard_id in done,
+                owner=owner,
+            )
+        )
+    return shards
+
+
+def claim_index_shard(
+    search_type: str, worker_id: str, lease_ttl: int = SHARD_LEASE_TTL
+) -> IndexShard | None:
+    """Claim a pending shard by acquiring its lease.
+
+    Leases expire if they're not renewed, so shards from crashed workers are
+    claimed again by other workers, which resume them from their checkpoint.
+
+    :param search_type: The type of search.
+    :param worker_id: A unique identifier of the worker claiming the shard.
+    :param lease_ttl: How long the lease lives if it's not renewed.
+    :return: The claimed IndexShard or None if there are no shards to claim.
+    """
+    r = make_redis_interface("CACHE")
+    for shard in get_index_shards(search_type):
+        if shard.done or shard.owner:
+            continue
+        lease_key = compose_shards_key(search_type, f"lease:{shard.shard_id}")
+        if r.set(lease_key, worker_id, nx=True, ex=lease_ttl):
+            shard.owner = worker_id
+            return shard
+    return None
+
+
+def checkpoint_index_shard(
+    search_type: str,
+    shard: IndexShard,
+    last_pk: int,
+    lease_ttl: int = SHARD_LEASE_TTL,
+) -> bool:
+    """Store the last parent PK processed in a shard and renew its lease.
+
+    Note that there's a small race condition between checking the lease
+    owner and renewing it. If a worker loses its lease in between, a shard
+    chunk can be indexed twice, which is harmless.
+
+    :param search_type: The type of search.
+    :param shard: The IndexShard being processed.
+    :param last_pk: The last parent PK processed.
+    :param lease_ttl: How long the renewed lease lives.
+    :return: True if the lease is still owned by the worker, otherwise False
+    and the worker should stop processing the shard.
+    """
+    r = make_redis_interface("CACHE")
+    lease_key = compose_shards_key(search_type, f"lease:{shard.shard_id}")
+    if r.get(lease_key) != shard.owner:
+        return False
+
+    checkpoints_key = compose_shards_key(search_type, "checkpoints")
+    pipe = r.pipeline()
+    pipe.hset(checkpoints_key, str(shard.shard_id), last_pk)
+    pipe.expire(checkpoints_key, SHARDS_TTL)
+    pipe.expire(lease_key, lease_ttl)
+    pipe.execute()
+    shard.checkpoint = last_pk
+    return True
+
+
+def complete_index_shard(search_type: str, shard: IndexShard) -> None:
+    """Mark a shard as done and release its lease.
+
+    :param search_type: The type of search.
+    :param shard: The IndexShard completed.
+    :return: None
+    """
+    r = make_redis_interface("CACHE")
+    done_key = compose_shards_key(search_type, "done")
+    pipe = r.pipeline()
+    pipe.sadd(done_key, str(shard.shard_id))
+    pipe.expire(done_key, SHARDS_TTL)
+    pipe.delete(compose_shards_key(search_type, f"lease:{shard.shard_id}"))
+    pipe.execute()
+    shard.done = True
@@ -1,32 +1,16 @@
 import os
 
-import igraph
+import numpy as np
 from django.conf import settings
 
-from cl.lib.command_utils import VerboseCommand
+from cl.citations.citation_graph import compute_pagerank, update_citation_graph
+from cl.lib.command_utils import VerboseCommand, logger
 from cl.lib.solr_core_admin import get_data_dir
-from cl.search.models import Opinion, OpinionsCited
+from cl.search.models import Opinion
 
 
-def make_and_populate_nx_graph() -> igraph.Graph:
-    """Create a new igraph object and populate it.
-
-    This pulls all of the inter-opinion citations into memory then passes all of
-    them to igraph as a directed graph.
-    """
-    g = igraph.Graph(
-        directed=True,
-        edges=list(
-            OpinionsCited.objects.values_list(
-                "citing_opinion", "cited_opinion"
-            )
-        ),
-    )
-    return g
-
-
-def make_sorted_pr_file(pr_results, result_file_path):
-    """Convert the pagerank results list into something Solr can use.
+def make_sorted_pr_file(pr_results: np.ndarray, result_file_path: str) -> None:
+    """Convert the pagerank results array into something Solr can use.
 
     Solr uses a file of the form:
 
@@ -34,46 +18,61 @@ def make_sorted_pr_file(pr_results, result_file_path):
         2=0.214810626172
         3=0.397399661529
 
-    The IDs must be sorted for performance, and every ID should be listed. This
-    function takes the pagerank results and converts them into a file like this,
-    using the os's `sort` executable for fastest sorting.
+    The IDs must be sorted for performance, and every ID should be listed. The
+    opinion IDs are pulled sorted from the DB, so the file is written in one
+    pass without sorting it afterward.
     """
-    temp_extension = ".tmp"
-    min_value = min(pr_results)
-    with open(result_file_path + temp_extension, "w") as f:
-        # pr_results has a score for every value between 0 and our highest
-        # opinion id that has citations. Write a file that only contains values
-        # matching valid Opinions.
-        for pk in Opinion.objects.values_list("pk", flat=True):
-            try:
-                score = pr_results[pk]
-            except IndexError:
-                # Happens because some items don't have citations, thus aren't
-                # in network.
-                score = min_value
-            f.write(f"{pk}={score}\n")
+    pks = np.fromiter(
+        Opinion.objects.order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=100_000),
+        dtype=np.int64,
+    )
+    # pr_results has a score for every value between 0 and our highest
+    # opinion id that has citations. Opinions without citations aren't in the
+    # network, so they get the lowest score.
+    min_value = pr_results.min() if len(pr_results) else 0.0
+    scores = np.full(len(pks), min_value)
+    in_network = pks < len(pr_results)
+    scores[in_network] = pr_results[pks[in_network]]
 
-    # For improved Solr performance, sort the temp file, creating a new file
-    # without the temp_extension value.
-    os.system(
-        f"sort -n {result_file_path}{temp_extension} > {result_file_path}"
+    temp_path = f"{result_file_path}.tmp"
+    np.savetxt(
+        temp_path,
+        np.column_stack((pks, scores)),
+        fmt=["%d", "%.12g"],
+        delimiter="=",
     )
-    os.remove(result_file_path + temp_extension)
+    os.replace(temp_path, result_file_path)
 
 
 class Command(VerboseCommand):
     args = "<args>"
     help = "Calculate pagerank value for every case"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            default=False,
+            help="Discard the stored citation graph and build it again from "
+            "every citation. Use it to drop deleted citations.",
+        )
+
     @staticmethod
-    def do_pagerank():
-        g = make_and_populate_nx_graph()
-        pr_results = g.pagerank()
+    def do_pagerank(rebuild: bool = False) -> np.ndarray:
+        graph = update_citation_graph(settings.CITATION_GRAPH_DIR, rebuild)
+        logger.info(
+            "Citation graph loaded with %s opinions and %s citations.",
+            graph.num_nodes,
+            graph.num_edges,
+        )
+        pr_results = compute_pagerank(graph)
         return pr_results
 
     def handle(self, *args, **options):
         super().handle(*args, **options)
-        pr_results = self.do_pagerank()
+        pr_results = self.do_pagerank(options["rebuild"])
         pr_dest_dir = settings.SOLR_PAGERANK_DEST_DIR
         make_sorted_pr_file(pr_results, pr_dest_dir)
         normal_dest_dir = f"{get_data_dir('collection1')}external_pagerank"
@@ -1,6 +1,9 @@
+import os
+import socket
+import time
 from datetime import date, datetime
 from itertools import batched
-from typing import Iterable, Mapping
+from typing import Generator, Iterable, Mapping
 
 from django.conf import settings
 from django.db.models import QuerySet
@@ -15,6 +18,11 @@ from cl.lib.es_signal_processor import (
 from cl.lib.redis_utils import make_redis_interface
 from cl.people_db.models import Person
 from cl.search.documents import ESRECAPDocument
+from cl.search.index_shards import (
+    SHARD_LEASE_TTL,
+    create_index_shards,
+    get_index_shards,
+)
 from cl.search.models import (
     SEARCH_TYPES,
     Docket,
@@ -29,11 +37,14 @@ from cl.search.models import (
 from cl.search.signals import recap_document_field_mapping
 from cl.search.tasks import (
     index_parent_and_child_docs,
+    index_parent_and_child_docs_in_bulk,
+    index_parent_and_child_docs_shards,
     index_parent_or_child_docs,
     remove_parent_and_child_docs_by_query,
+    run_index_shards_worker,
     update_children_docs_by_query,
 )
-from cl.search.types import EventTable
+from cl.search.types import BulkIndexingStats, EventTable
 
 
 def compose_redis_key(
@@ -299,6 +310,37 @@ class Command(VerboseCommand):
             action="store_true",
             help="Use this flag only when running the command in tests based on TestCase",
         )
+        parser.add_argument(
+            "--inline",
+            action="store_true",
+            help="Index parent and child documents within this process "
+            "through a single bulk stream instead of enqueuing celery tasks. "
+            "Throughput stats are reported at the end.",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=0,
+            help="Coordinator mode. Split the parent documents PK space into "
+            "this number of shards and enqueue a celery worker per shard. "
+            "Each shard keeps its own checkpoint in Redis, and shards from "
+            "crashed workers are handed out again. Use --auto-resume to "
+            "resume the existing shards instead of creating new ones.",
+        )
+        parser.add_argument(
+            "--shard-worker",
+            action="store_true",
+            help="Worker mode. Claim and index shards created by a "
+            "coordinator within this process until no shards are left. Can "
+            "be run on many hosts at once.",
+        )
+        parser.add_argument(
+            "--shard-lease-ttl",
+            type=int,
+            default=SHARD_LEASE_TTL,
+            help="Seconds a shard lease lives without being renewed before "
+            "another worker can claim the shard.",
+        )
         parser.add_argument(
             "--document-type",
             type=str,
@@ -351,6 +393,13 @@ class Command(VerboseCommand):
         start_date: date | None = options.get("start_date", None)
         end_date: date | None = options.get("end_date", None)
 
+        if options.get("shard_worker", False):
+            self.run_shard_worker(search_type)
+            return
+        if options.get("shards", 0):
+            self.coordinate_shards(search_type, options["shards"])
+            return
+
         match search_type:
             case SEARCH_TYPES.PEOPLE:
                 queryset = Person.objects.filter(
@@ -418,8 +467,65 @@ class Command(VerboseCommand):
             case _:
                 return
 
+        if (
+            options.get("inline", False)
+            and task_to_use == "index_parent_and_child_docs"
+        ):
+            self.index_parent_and_child_docs_inline(q, count, search_type)
+            return
+
         self.process_queryset(q, count, search_type, chunk_size, task_to_use)
 
+    def log_indexing_progress(
+        self, items: Iterable[int], count: int
+    ) -> Generator[int, None, None]:
+        """Yield parent IDs while reporting the progress.
+
+        :param items: Iterable of parent IDs to process.
+        :param count: Total number of items expected to process.
+        :return: Yields the parent IDs.
+        """
+        processed_count = 0
+        for item_id in items:
+            yield item_id
+            processed_count += 1
+            if not processed_count % 1000 or processed_count == count:
+                self.stdout.write(
+                    "\rProcessed {}/{}, ({:.0%}), last PK indexed: {},".format(
+                        processed_count,
+                        count,
+                        processed_count * 1.0 / count,
+                        item_id,
+                    )
+                )
+
+    def index_parent_and_child_docs_inline(
+        self, items: Iterable[int], count: int, search_type: str
+    ) -> None:
+        """Index parent and child documents within this process through a
+        single bulk stream and report the indexing throughput.
+
+        The last parent document processed is logged to Redis once ES
+        confirms its documents were indexed, so the indexing can be resumed
+        from there.
+
+        :param items: Iterable of parent IDs to index.
+        :param count: Total number of items expected to process.
+        :param search_type: The search type to index.
+        :return: None
+        """
+        testing_mode = self.options.get("testing_mode", False)
+        log_key = compose_redis_key(search_type)
+        stats = index_parent_and_child_docs_in_bulk(
+            self.log_indexing_progress(items, count),
+            search_type,
+            testing_mode=testing_mode,
+            on_parent_indexed=lambda pk: log_last_document_indexed(
+                pk, log_key
+            ),
+        )
+        self.write_indexing_stats(stats)
+
     def process_queryset(
         self,
         items: Iterable,
@@ -528,6 +634,102 @@ class Command(VerboseCommand):
                 f"Successfully indexed {processed_count} items from pk {pk_offset}."
             )
 
+    def write_indexing_stats(self, stats: BulkIndexingStats) -> None:
+        """Report the indexing throughput.
+
+        :param stats: The BulkIndexingStats to report.
+        :return: None
+        """
+        self.stdout.write(
+            f"Indexed {stats.documents} documents from {stats.parents} "
+            f"parents in {stats.elapsed:.2f}s. "
+            f"Throughput: {stats.docs_per_second:.1f} docs/sec, "
+            f"{stats.requests_per_parent:.2f} ES requests per parent. "
+            f"Failed documents: {stats.failed}."
+        )
+
+    def run_shard_worker(self, search_type: str) -> None:
+        """Claim and index shards within this process until no shards are
+        left.
+
+        :param search_type: The search type to index.
+        :return: None
+        """
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        stats = run_index_shards_worker(
+            search_type,
+            worker_id,
+            self.options["chunk_size"],
+            lease_ttl=self.options["shard_lease_ttl"],
+            testing_mode=self.options.get("testing_mode", False),
+        )
+        self.write_indexing_stats(stats)
+
+    def coordinate_shards(
+        self, search_type: str, num_shards: int, poll_interval: int = 60
+    ) -> None:
+        """Split the parent documents PK space into shards, enqueue a worker
+        per shard and monitor them until all the shards are indexed.
+
+        Workers renew their shard lease after every chunk. If a lease expires
+        before its shard is done, the worker is assumed to have crashed and a
+        new worker is enqueued to resume the shard from its checkpoint.
+
+        :param search_type: The search type to index.
+        :param num_shards: The number of shards to create.
+        :param poll_interval: Seconds to wait between checks of the shards
+        progress.
+        :return: None
+        """
+        queue = self.options["queue"]
+        lease_ttl = self.options["shard_lease_ttl"]
+        shards = []
+        if self.options.get("auto_resume", False):
+            shards = get_index_shards(search_type)
+        if shards:
+            self.stdout.write(f"Resuming {len(shards)} existing shards.")
+        else:
+            shards = create_index_shards(
+                search_type, num_shards, self.options["pk_offset"]
+            )
+            self.stdout.write(f"Created {len(shards)} shards.")
+
+        def enqueue_worker() -> None:
+            index_parent_and_child_docs_shards.si(
+                search_type,
+                self.options["chunk_size"],
+                lease_ttl=lease_ttl,
+                testing_mode=self.options.get("testing_mode", False),
+            ).set(queue=queue).apply_async()
+
+        for _ in [shard for shard in shards if not shard.done]:
+            enqueue_worker()
+
+        leased_shards: set[int] = set()
+        while True:
+            shards = get_index_shards(search_type)
+            pending_shards = [shard for shard in shards if not shard.done]
+            self.stdout.write(
+                f"\rShards done: {len(shards) - len(pending_shards)}"
+                f"/{len(shards)}"
+            )
+            if not pending_shards:
+                break
+            for shard in pending_shards:
+                if shard.owner:
+                    leased_shards.add(shard.shard_id)
+                elif shard.shard_id in leased_shards:
+                    # The lease expired before the shard was done.
+                    self.stdout.write(
+                        f"Shard {shard.shard_id} was abandoned at PK "
+                        f"{shard.checkpoint}, enqueuing a new worker."
+                    )
+                    leased_shards.discard(shard.shard_id)
+                    enqueue_worker()
+            time.sleep(poll_interval)
+
+        self.stdout.write(f"Successfully indexed {len(shards)} shards.")
+
     def index_documents_from_event_table(
         self,
         events_to_update: QuerySet,
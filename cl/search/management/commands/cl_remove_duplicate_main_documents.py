@@ -0,0 +1,89 @@
+from django.db.models import Count
+
+from cl.lib.command_utils import VerboseCommand, logger
+from cl.search.models import RECAPDocument
+
+
+def remove_duplicate_main_documents(simulate: bool) -> tuple[int, int]:
+    """Find main documents that have the same docket entry and document
+    number, and keep only one of them where possible.
+
+    Duplicates are only resolved if they have the same pacer_doc_id, like in
+    RECAPDocument.save. Otherwise, they're reported and have to be fixed by
+    hand. The document kept is chosen like in add_docket_entries: the latest
+    created one that has its PDF, or the latest created one if none has it.
+
+    :param simulate: True to only report the duplicates, without deleting
+    them.
+    :return: A two-tuple: the number of deleted documents, and the number of
+    duplicates that couldn't be resolved.
+    """
+    duplicates = (
+        RECAPDocument.objects.filter(attachment_number=None)
+        .values("docket_entry_id", "document_number")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    deleted = unresolved = 0
+    for duplicate in duplicates.iterator():
+        rds = sorted(
+            RECAPDocument.objects.filter(
+                docket_entry_id=duplicate["docket_entry_id"],
+                document_number=duplicate["document_number"],
+                attachment_number=None,
+            ),
+            key=lambda rd: (
+                bool(rd.is_available and rd.filepath_local),
+                rd.date_created,
+                rd.pk,
+            ),
+            reverse=True,
+        )
+        if len({rd.pacer_doc_id for rd in rds}) > 1:
+            logger.warning(
+                "Unable to fix duplicated main documents with different "
+                "pacer_doc_id values. The rds are %s",
+                ", ".join(str(rd.pk) for rd in rds),
+            )
+            unresolved += 1
+            continue
+
+        for rd in rds[1:]:
+            logger.info(
+                "Deleting duplicate rd %s, keeping %s", rd.pk, rds[0].pk
+            )
+            if not simulate:
+                # Delete one by one so the signals remove them from the
+                # search indexes.
+                rd.delete()
+            deleted += 1
+    return deleted, unresolved
+
+
+class Command(VerboseCommand):
+    help = (
+        "Delete the duplicated main documents of docket entries, so the "
+        "unique_main_document_per_docket_entry index can be built."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--simulate",
+            action="store_true",
+            default=False,
+            help="Run the command in simulate mode so that no items are "
+            "actually deleted.",
+        )
+
+    def handle(self, *args, **options):
+        super().handle(*args, **options)
+        deleted, unresolved = remove_duplicate_main_documents(
+            options["simulate"]
+        )
+        self.stdout.write(f"Deleted {deleted} duplicated main documents.\n")
+        if unresolved:
+            self.stdout.write(
+                f"{unresolved} duplicates have different pacer_doc_id values "
+                "and must be fixed by hand before migrating.\n"
+            )
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("search", "0026_drop_docket_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="parenthetical",
+            name="minhash",
+            field=models.BinaryField(
+                blank=True,
+                help_text="The MinHash signature of the parenthetical text, stored as an array of 64 unsigned 64-bit integers and used to group similar parentheticals",
+                null=True,
+            ),
+        ),
+    ]
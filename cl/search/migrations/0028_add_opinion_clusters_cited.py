@@ -0,0 +1,54 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("search", "0027_add_parenthetical_minhash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OpinionClustersCited",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "depth",
+                    models.IntegerField(
+                        default=1,
+                        help_text="The number of times the opinions of the cited cluster were cited in the opinions of the citing cluster",
+                    ),
+                ),
+                (
+                    "cited_cluster",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="citing_clusters",
+                        to="search.opinioncluster",
+                    ),
+                ),
+                (
+                    "citing_cluster",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cited_clusters",
+                        to="search.opinioncluster",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Opinion clusters cited",
+                "unique_together": {("citing_cluster", "cited_cluster")},
+            },
+        ),
+    ]
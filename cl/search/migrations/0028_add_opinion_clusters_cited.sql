@@ -0,0 +1,17 @@
+BEGIN;
+--
+-- Create model OpinionClustersCited
+--
+CREATE TABLE "search_opinionclusterscited"
+(
+    "id"                integer NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    "depth"             integer NOT NULL,
+    "cited_cluster_id"  integer NOT NULL,
+    "citing_cluster_id" integer NOT NULL
+);
+ALTER TABLE "search_opinionclusterscited" ADD CONSTRAINT "search_opinionclustersci_citing_cluster_id_cited__c0e182cc_uniq" UNIQUE ("citing_cluster_id", "cited_cluster_id");
+ALTER TABLE "search_opinionclusterscited" ADD CONSTRAINT "search_opinioncluste_cited_cluster_id_23475551_fk_search_op" FOREIGN KEY ("cited_cluster_id") REFERENCES "search_opinioncluster" ("id") DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE "search_opinionclusterscited" ADD CONSTRAINT "search_opinioncluste_citing_cluster_id_8335f055_fk_search_op" FOREIGN KEY ("citing_cluster_id") REFERENCES "search_opinioncluster" ("id") DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX "search_opinionclusterscited_cited_cluster_id_23475551" ON "search_opinionclusterscited" ("cited_cluster_id");
+CREATE INDEX "search_opinionclusterscited_citing_cluster_id_8335f055" ON "search_opinionclusterscited" ("citing_cluster_id");
+COMMIT;
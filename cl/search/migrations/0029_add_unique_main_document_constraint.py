@@ -0,0 +1,35 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index concurrently to avoid locking the table. Duplicated main
+    # documents have to be cleaned up with cl_remove_duplicate_main_documents
+    # before running this migration. A failed concurrent build leaves an
+    # invalid index behind, so it's dropped before building it again.
+    atomic = False
+
+    dependencies = [
+        ("search", "0028_add_opinion_clusters_cited"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """DROP INDEX CONCURRENTLY IF EXISTS "unique_main_document_per_docket_entry";""",
+                """CREATE UNIQUE INDEX CONCURRENTLY "unique_main_document_per_docket_entry" ON "search_recapdocument" ("docket_entry_id", "document_number") WHERE "attachment_number" IS NULL;""",
+            ],
+            reverse_sql="""DROP INDEX CONCURRENTLY IF EXISTS "unique_main_document_per_docket_entry";""",
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name="recapdocument",
+                    constraint=models.UniqueConstraint(
+                        condition=models.Q(("attachment_number", None)),
+                        fields=("docket_entry", "document_number"),
+                        name="unique_main_document_per_docket_entry",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,5 @@
+--
+-- Create constraint unique_main_document_per_docket_entry on model recapdocument
+--
+DROP INDEX CONCURRENTLY IF EXISTS "unique_main_document_per_docket_entry";
+CREATE UNIQUE INDEX CONCURRENTLY "unique_main_document_per_docket_entry" ON "search_recapdocument" ("docket_entry_id", "document_number") WHERE "attachment_number" IS NULL;
@@ -1,6 +1,6 @@
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Tuple, TypeVar
+from typing import Any, Dict, Iterable, List, Tuple, TypeVar
 
 import pghistory
 import pytz
@@ -9,7 +9,7 @@ from celery.canvas import chain
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.indexes import HashIndex
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
 from django.db.models import Q, QuerySet
 from django.db.models.functions import MD5
 from django.template import loader
@@ -21,7 +21,6 @@ from localflavor.us.models import USPostalCodeField, USZipCodeField
 from localflavor.us.us_states import OBSOLETE_STATES, USPS_CHOICES
 from model_utils import FieldTracker
 
-from cl.citations.utils import get_citation_depth_between_clusters
 from cl.custom_filters.templatetags.text_filters import best_case_name
 from cl.lib import fields
 from cl.lib.date_time import midnight_pt
@@ -39,7 +38,7 @@ from cl.lib.search_index_utils import (
 )
 from cl.lib.storage import IncrementingAWSMediaStorage
 from cl.lib.string_utils import trunc
-from cl.lib.utils import deepgetattr
+from cl.lib.utils import chunks, deepgetattr
 
 
 class PRECEDENTIAL_STATUS:
@@ -1423,6 +1422,15 @@ class RECAPDocument(AbstractPacerDocument, AbstractPDF, AbstractDateTimeModel):
             "document_number",
             "attachment_number",
         )
+        constraints = [
+            # None values in SQL are all considered different, so the
+            # unique_together above doesn't cover main documents.
+            models.UniqueConstraint(
+                fields=["docket_entry", "document_number"],
+                condition=Q(attachment_number=None),
+                name="unique_main_document_per_docket_entry",
+            ),
+        ]
         ordering = ("document_type", "document_number", "attachment_number")
         indexes = [
             models.Index(
@@ -1558,14 +1566,8 @@ class RECAPDocument(AbstractPacerDocument, AbstractPDF, AbstractDateTimeModel):
         """
         return build_authorities_query(self.cited_opinions)
 
-    def save(
-        self,
-        update_fields=None,
-        do_extraction=False,
-        index=False,
-        *args,
-        **kwargs,
-    ):
+    def _clean_for_save(self) -> None:
+        """Validate the item and normalize its fields before saving it."""
         if self.document_type == self.ATTACHMENT:
             if self.attachment_number is None:
                 raise ValidationError(
@@ -1576,44 +1578,96 @@ class RECAPDocument(AbstractPacerDocument, AbstractPDF, AbstractDateTimeModel):
             # Juriscraper returns these as null values. Instead we want blanks.
             self.pacer_doc_id = ""
 
-        if self.attachment_number is None:
-            # Validate that we don't already have such an entry. This is needed
-            # because None values in SQL are all considered different.
-            others = RECAPDocument.objects.exclude(pk=self.pk).filter(
-                document_number=self.document_number,
-                attachment_number=self.attachment_number,
-                docket_entry=self.docket_entry,
+    def _may_have_duplicate(self, update_fields=None) -> bool:
+        """Check if saving the item could make it a duplicate of another main
+        document of its docket entry.
+
+        The check is only needed for main documents that are new or whose
+        docket entry, document number or attachment number changed. Updates
+        that don't touch those fields can't create a duplicate.
+
+        :param update_fields: The fields that are going to be saved, if not
+        all of them.
+        :return: True if the item needs to be checked for duplicates.
+        """
+        if self.attachment_number is not None:
+            return False
+        if self._state.adding or self.pk is None:
+            return True
+        key_fields = {"docket_entry", "document_number", "attachment_number"}
+        if update_fields is not None and not key_fields.intersection(
+            f.removesuffix("_id") for f in update_fields
+        ):
+            return False
+        return any(
+            self.es_rd_field_tracker.has_changed(field)
+            for field in (
+                "docket_entry_id",
+                "document_number",
+                "attachment_number",
             )
-            if others.exists():
-                # Keep only the better item. This situation occurs during race
-                # conditions since the check we do here doesn't have the kinds
-                # of database guarantees we would like. Items are duplicates if
-                # they have the same pacer_doc_id. The worse one is the one
-                # that is *not* being updated here.
-                if others.count() > 1:
-                    raise ValidationError(
-                        "Multiple duplicate values violate save constraint "
-                        "and we are unable to fix it automatically for "
-                        "rd: %s" % self.pk
-                    )
-                else:
-                    # Only one duplicate. Attempt auto-resolution.
-                    other = others[0]
-                if other.pacer_doc_id == self.pacer_doc_id:
-                    # Delete "other"; the new one probably has better data.
-                    # Lots of code could be written here to merge "other" into
-                    # self, but it's nasty stuff because it happens when saving
-                    # new data and requires merging a lot of fields. This
-                    # situation only occurs rarely, so just delete "other" and
-                    # hope that "self" has the best, latest data.
-                    other.delete()
-                else:
-                    raise ValidationError(
-                        "Duplicate values violate save constraint and we are "
-                        "unable to fix it because the items have different "
-                        "pacer_doc_id values. The rds are %s and %s "
-                        % (self.pk, other.pk)
-                    )
+        )
+
+    def _resolve_duplicates(self, others: list["RECAPDocument"]) -> None:
+        """Keep only the better item when other main documents have the same
+        docket entry and document number as this one.
+
+        This situation occurs during race conditions. Items are duplicates if
+        they have the same pacer_doc_id. The worse one is the one that is
+        *not* being saved here.
+
+        :param others: The other main documents with the same docket entry
+        and document number.
+        :return: None
+        """
+        if len(others) > 1:
+            raise ValidationError(
+                "Multiple duplicate values violate save constraint "
+                "and we are unable to fix it automatically for "
+                "rd: %s" % self.pk
+            )
+        # Only one duplicate. Attempt auto-resolution.
+        other = others[0]
+        if other.pacer_doc_id == self.pacer_doc_id:
+            # Delete "other"; the new one probably has better data.
+            # Lots of code could be written here to merge "other" into
+            # self, but it's nasty stuff because it happens when saving
+            # new data and requires merging a lot of fields. This
+            # situation only occurs rarely, so just delete "other" and
+            # hope that "self" has the best, latest data.
+            other.delete()
+        else:
+            raise ValidationError(
+                "Duplicate values violate save constraint and we are "
+                "unable to fix it because the items have different "
+                "pacer_doc_id values. The rds are %s and %s "
+                % (self.pk, other.pk)
+            )
+
+    def save(
+        self,
+        update_fields=None,
+        do_extraction=False,
+        index=False,
+        *args,
+        **kwargs,
+    ):
+        self._clean_for_save()
+
+        if self._may_have_duplicate(update_fields):
+            # Validate that we don't already have such an entry. This is
+            # needed because None values in SQL are all considered different.
+            # The unique_main_document_per_docket_entry index guarantees it
+            # in the DB, but resolving it here lets us keep the better item.
+            others = list(
+                RECAPDocument.objects.exclude(pk=self.pk).filter(
+                    document_number=self.document_number,
+                    attachment_number=None,
+                    docket_entry_id=self.docket_entry_id,
+                )[:2]
+            )
+            if others:
+                self._resolve_duplicates(others)
 
         if update_fields is not None:
             update_fields = {"pacer_doc_id"}.union(update_fields)
@@ -2820,48 +2874,17 @@ class OpinionCluster(AbstractDateTimeModel):
         """Returns a queryset that can be used for querying and caching
         authorities.
         """
-        # All clusters that have sub_opinions cited by the sub_opinions of
-        # the current cluster, ordered by citation count, descending.
-        # Note that:
-        #  - sum()'ing an empty list with a nested one, flattens the nested
-        #    list.
-        #  - QuerySets are lazy by default, so we need to call list() on the
-        #    queryset object to evaluate it here and now.
+        # All clusters cited by the sub_opinions of the current cluster,
+        # ordered by citation count, descending.
         return OpinionCluster.objects.filter(
-            sub_opinions__in=sum(
-                [
-                    list(sub_opinion.opinions_cited.all().only("pk"))
-                    for sub_opinion in self.sub_opinions.all()
-                ],
-                [],
-            )
+            citing_clusters__citing_cluster_id=self.pk
         ).order_by("-citation_count", "-date_filed")
 
     async def aauthorities(self):
         """Returns a queryset that can be used for querying and caching
         authorities.
         """
-        # All clusters that have sub_opinions cited by the sub_opinions of
-        # the current cluster, ordered by citation count, descending.
-        # Note that:
-        #  - sum()'ing an empty list with a nested one, flattens the nested
-        #    list.
-        #  - QuerySets are lazy by default, so we need to call list() on the
-        #    queryset object to evaluate it here and now.
-        return OpinionCluster.objects.filter(
-            sub_opinions__in=sum(
-                [
-                    [
-                        i
-                        async for i in sub_opinion.opinions_cited.all().only(
-                            "pk"
-                        )
-                    ]
-                    async for sub_opinion in self.sub_opinions.all()
-                ],
-                [],
-            )
-        ).order_by("-citation_count", "-date_filed")
+        return self.authorities
 
     @property
     def parentheticals(self):
@@ -2889,23 +2912,17 @@ class OpinionCluster(AbstractDateTimeModel):
     def has_private_authority(self):
         if not hasattr(self, "_has_private_authority"):
             # Calculate it, then cache it.
-            private = False
-            for authority in self.authorities:
-                if authority.blocked:
-                    private = True
-                    break
-            self._has_private_authority = private
+            self._has_private_authority = self.authorities.filter(
+                blocked=True
+            ).exists()
         return self._has_private_authority
 
     async def ahas_private_authority(self):
         if not hasattr(self, "_has_private_authority"):
             # Calculate it, then cache it.
-            private = False
-            async for authority in await self.aauthorities():
-                if authority.blocked:
-                    private = True
-                    break
-            self._has_private_authority = private
+            self._has_private_authority = await self.authorities.filter(
+                blocked=True
+            ).aexists()
         return self._has_private_authority
 
     async def aauthorities_with_data(self):
@@ -2915,17 +2932,18 @@ class OpinionCluster(AbstractDateTimeModel):
         The returned list is sorted by that citation count field.
         """
         authorities_with_data = []
-        async for authority in await self.aauthorities():
-            authority.citation_depth = (
-                await get_citation_depth_between_clusters(
-                    citing_cluster_pk=self.pk, cited_cluster_pk=authority.pk
-                )
+        async for edge in (
+            OpinionClustersCited.objects.filter(citing_cluster_id=self.pk)
+            .select_related("cited_cluster")
+            .order_by(
+                "-depth",
+                "-cited_cluster__citation_count",
+                "-cited_cluster__date_filed",
             )
+        ):
+            authority = edge.cited_cluster
+            authority.citation_depth = edge.depth
             authorities_with_data.append(authority)
-
-        authorities_with_data.sort(
-            key=lambda x: x.citation_depth, reverse=True
-        )
         return authorities_with_data
 
     def top_visualizations(self):
@@ -3175,6 +3193,7 @@ class Citation(models.Model):
     type = models.SmallIntegerField(
         help_text="The type of citation that this is.", choices=CITATION_TYPES
     )
+    page_index_tracker = FieldTracker(fields=["reporter", "volume"])
 
     def __str__(self) -> str:
         # Note this representation is used in the front end.
@@ -3580,6 +3599,36 @@ class OpinionsCited(models.Model):
         unique_together = ("citing_opinion", "cited_opinion")
 
 
+class OpinionClustersCited(models.Model):
+    """The citations between clusters, denormalized from the OpinionsCited
+    rows of their sub-opinions, so the authorities of a cluster can be found
+    with a single indexed query.
+    """
+
+    citing_cluster = models.ForeignKey(
+        OpinionCluster,
+        related_name="cited_clusters",
+        on_delete=models.CASCADE,
+    )
+    cited_cluster = models.ForeignKey(
+        OpinionCluster,
+        related_name="citing_clusters",
+        on_delete=models.CASCADE,
+    )
+    depth = models.IntegerField(
+        help_text="The number of times the opinions of the cited cluster "
+        "were cited in the opinions of the citing cluster",
+        default=1,
+    )
+
+    def __str__(self) -> str:
+        return f"{self.citing_cluster_id} ⤜--cites⟶  {self.cited_cluster_id}"
+
+    class Meta:
+        verbose_name_plural = "Opinion clusters cited"
+        unique_together = ("citing_cluster", "cited_cluster")
+
+
 class OpinionsCitedByRECAPDocument(models.Model):
     citing_document = models.ForeignKey(
         RECAPDocument, related_name="cited_opinions", on_delete=models.CASCADE
@@ -3662,6 +3711,13 @@ class Parenthetical(models.Model):
         help_text="A score between 0 and 1 representing how descriptive the "
         "parenthetical is",
     )
+    minhash = models.BinaryField(
+        help_text="The MinHash signature of the parenthetical text, stored "
+        "as an array of 64 unsigned 64-bit integers and used to group "
+        "similar parentheticals",
+        blank=True,
+        null=True,
+    )
     es_pa_field_tracker = FieldTracker(fields=["score", "text"])
 
     def __str__(self) -> str:
@@ -3774,6 +3830,85 @@ class Tag(AbstractDateTimeModel):
         else:
             raise NotImplementedError("Object type not supported for tagging.")
 
+    def _get_tag_through_table(
+        self, model: type[models.Model]
+    ) -> tuple[str, str]:
+        """Get the through table between tags and a taggable model, and its
+        column pointing to the model.
+
+        :param model: Docket, DocketEntry, RECAPDocument or Claim.
+        :return: A tuple with the table name and the column name.
+        """
+        related_names = {
+            Docket: "dockets",
+            DocketEntry: "docket_entries",
+            RECAPDocument: "recap_documents",
+            Claim: "claims",
+        }
+        if model not in related_names:
+            raise NotImplementedError("Object type not supported for tagging.")
+        through = getattr(self, related_names[model]).through
+        column = through._meta.get_field(model._meta.model_name).column
+        return through._meta.db_table, column
+
+    def tag_objects(
+        self,
+        things: QuerySet | Iterable[TaggableType | Claim],
+        batch_size: int = 1000,
+    ) -> int:
+        """Add a tag to many items at once.
+
+        Like tag_object, this is safe to run from concurrent processes, since
+        rows that already exist are skipped by the database. Querysets are
+        tagged with a single INSERT ... SELECT, without loading their rows.
+        Other iterables are tagged in batches of batch_size, with one INSERT
+        per batch.
+
+        :param things: A queryset or an iterable of Dockets, DocketEntries,
+        RECAPDocuments or Claims that you wish to tag. Iterables can mix
+        types.
+        :param batch_size: The number of items to tag per INSERT.
+        :return: The number of items that were newly tagged.
+        """
+        if isinstance(things, QuerySet):
+            table, column = self._get_tag_through_table(things.model)
+            sql, params = (
+                things.values_list("pk", flat=True)
+                .order_by()
+                .query.sql_with_params()
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO "{table}" ("tag_id", "{column}") '
+                    f"SELECT %s, sub.pk FROM ({sql}) AS sub (pk) "
+                    f"ON CONFLICT DO NOTHING",
+                    [self.pk, *params],
+                )
+                return cursor.rowcount
+
+        created = 0
+        for batch in chunks(things, batch_size):
+            pks_by_model: dict[type[models.Model], list[int]] = {}
+            for thing in batch:
+                pks_by_model.setdefault(type(thing), []).append(thing.pk)
+            for model, pks in pks_by_model.items():
+                table, column = self._get_tag_through_table(model)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'INSERT INTO "{table}" ("tag_id", "{column}") '
+                        f"SELECT %s, UNNEST(%s) ON CONFLICT DO NOTHING",
+                        [self.pk, pks],
+                    )
+                    created += cursor.rowcount
+        return created
+
+    async def atag_objects(
+        self,
+        things: QuerySet | Iterable[TaggableType | Claim],
+        batch_size: int = 1000,
+    ) -> int:
+        return await sync_to_async(self.tag_objects)(things, batch_size)
+
 
 # class AppellateReview(models.Model):
 #     REVIEW_STANDARDS = (
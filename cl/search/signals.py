@@ -1,8 +1,9 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from cl.audio.models import Audio
+from cl.citations.page_index import invalidate_volume_page_index
 from cl.citations.tasks import (
     find_citations_and_parantheticals_for_recap_documents,
 )
@@ -563,3 +564,28 @@ def handle_recap_doc_change(
             find_citations_and_parantheticals_for_recap_documents.apply_async(
                 args=([instance.pk],)
             )
+
+
+@receiver(
+    post_save,
+    sender=Citation,
+    dispatch_uid="handle_citation_save_uid",
+)
+@receiver(
+    post_delete,
+    sender=Citation,
+    dispatch_uid="handle_citation_delete_uid",
+)
+def handle_citation_change(sender, instance: Citation, **kwargs) -> None:
+    """Invalidate the cached page index of the reporter volume of a citation
+    when the citation is saved or deleted. If the reporter or volume of the
+    citation changed, the index of its previous volume is invalidated too.
+    """
+    invalidate_volume_page_index(instance.reporter, instance.volume)
+    previous = instance.page_index_tracker.changed()
+    if not previous:
+        return
+    reporter = previous.get("reporter", instance.reporter)
+    volume = previous.get("volume", instance.volume)
+    if reporter and volume:
+        invalidate_volume_page_index(reporter, volume)
@@ -1,9 +1,15 @@
+import json
 import logging
+import math
+import pickle
 import socket
+import time
+from collections import deque
 from datetime import timedelta
 from importlib import import_module
+from itertools import batched
 from random import randint
-from typing import Any, Generator
+from typing import Any, Callable, Generator, Iterable
 
 import scorched
 import waffle
@@ -28,18 +34,31 @@ from scorched.exc import SolrError
 from cl.audio.models import Audio
 from cl.celery_init import app
 from cl.lib.elasticsearch_utils import es_index_exists
+from cl.lib.redis_utils import (
+    create_redis_semaphore,
+    delete_redis_semaphore,
+    make_redis_interface,
+)
 from cl.lib.search_index_utils import InvalidDocumentError
 from cl.people_db.models import Person, Position
 from cl.search.documents import (
     ES_CHILD_ID,
     AudioDocument,
+    BulkPrepareMixin,
     DocketDocument,
     ESRECAPDocument,
     OpinionClusterDocument,
     OpinionDocument,
+    ParentheticalGroupDocument,
     PersonDocument,
     PositionDocument,
 )
+from cl.search.index_shards import (
+    SHARD_LEASE_TTL,
+    checkpoint_index_shard,
+    claim_index_shard,
+    complete_index_shard,
+)
 from cl.search.models import (
     SEARCH_TYPES,
     Docket,
@@ -49,9 +68,12 @@ from cl.search.models import (
     OpinionCluster,
     OpinionsCited,
     OpinionsCitedByRECAPDocument,
+    ParentheticalGroup,
     RECAPDocument,
 )
 from cl.search.types import (
+    BufferedDocumentUpdate,
+    BulkIndexingStats,
     ESDictDocument,
     ESDocumentClassType,
     ESDocumentInstanceType,
@@ -59,6 +81,7 @@ from cl.search.types import (
     ESModelClassType,
     ESModelType,
     EventTable,
+    IndexShard,
     SaveDocumentResponseType,
 )
 
@@ -776,6 +799,362 @@ def update_children_docs_by_query(
         es_document._index.refresh()
 
 
+ES_UPDATE_BUFFER_KEY = "es.update.buffer"
+
+
+def push_to_es_update_buffer(update: tuple) -> None:
+    """Add an update to the ES update buffer and schedule the buffer to be
+    flushed, unless it's already scheduled.
+
+    :param update: A tuple whose first element is the update type, either
+    "document" or "children", followed by the arguments of the update task.
+    :return: None
+    """
+    window = settings.ELASTICSEARCH_UPDATE_BUFFER_WINDOW
+    r = make_redis_interface("CACHE", decode_responses=False)
+    pipe = r.pipeline()
+    pipe.rpush(ES_UPDATE_BUFFER_KEY, pickle.dumps(update))
+    pipe.expire(ES_UPDATE_BUFFER_KEY, 60 * 60)
+    pipe.hincrby(f"{ES_UPDATE_BUFFER_KEY}:stats", "buffered", 1)
+    pipe.execute()
+    # The semaphore expires in case the scheduled task is lost, so that a new
+    # one can be scheduled.
+    if create_redis_semaphore(
+        "CACHE", f"{ES_UPDATE_BUFFER_KEY}:scheduled", ttl=window + 60 * 5
+    ):
+        flush_es_update_buffer.apply_async(countdown=window)
+
+
+def buffer_es_document_update(
+    es_document_name: ESDocumentNameType,
+    fields_to_update: list[str],
+    main_instance_data: tuple[str, int],
+    related_instance_data: tuple[str, int] | None = None,
+    fields_map: dict | None = None,
+) -> None:
+    """Schedule a document update in Elasticsearch. If the update buffer is
+    enabled the update is buffered so it can be merged with other updates to
+    the same document, otherwise it's sent right away.
+
+    Takes the same arguments as update_es_document.
+    """
+    if not settings.ELASTICSEARCH_UPDATE_BUFFER_WINDOW:
+        update_es_document.delay(
+            es_document_name,
+            fields_to_update,
+            main_instance_data,
+            related_instance_data,
+            fields_map,
+        )
+        return
+    push_to_es_update_buffer(
+        (
+            "document",
+            es_document_name,
+            fields_to_update,
+            main_instance_data,
+            related_instance_data,
+            fields_map,
+        )
+    )
+
+
+def buffer_children_docs_update(
+    es_document_name: ESDocumentNameType,
+    parent_instance_id: int,
+    fields_to_update: list[str],
+    fields_map: dict | None = None,
+) -> None:
+    """Schedule an update of child documents in Elasticsearch. If the update
+    buffer is enabled the update is buffered so it can be merged with other
+    updates to the same children, otherwise it's sent right away.
+
+    Takes the same arguments as update_children_docs_by_query.
+    """
+    if not settings.ELASTICSEARCH_UPDATE_BUFFER_WINDOW:
+        update_children_docs_by_query.delay(
+            es_document_name, parent_instance_id, fields_to_update, fields_map
+        )
+        return
+    push_to_es_update_buffer(
+        (
+            "children",
+            es_document_name,
+            parent_instance_id,
+            fields_to_update,
+            fields_map,
+        )
+    )
+
+
+def coalesce_es_updates(
+    updates: list[tuple],
+) -> tuple[
+    list[BufferedDocumentUpdate],
+    dict[tuple[str, int, str], tuple[set[str], dict | None]],
+]:
+    """Merge the buffered updates that target the same documents.
+
+    Field values are read from the DB when the updates are flushed, so
+    repeated updates to a field are superseded by a single one.
+
+    :param updates: The buffered update tuples.
+    :return: A two tuple, the coalesced document updates and a dict mapping
+    the (es_document_name, parent_instance_id, fields_map) of children
+    updates to their merged fields and fields map.
+    """
+    document_updates: dict[tuple, BufferedDocumentUpdate] = {}
+    children_updates = {}
+    for update_type, *args in updates:
+        if update_type == "document":
+            es_document_name, fields, main_data, related_data, fields_map = (
+                args
+            )
+            key = (
+                es_document_name,
+                tuple(main_data),
+                tuple(related_data) if related_data else None,
+                json.dumps(fields_map, sort_keys=True),
+            )
+            if key not in document_updates:
+                document_updates[key] = BufferedDocumentUpdate(
+                    es_document_name=es_document_name,
+                    main_instance_data=main_data,
+                    related_instance_data=related_data,
+                    fields_map=fields_map,
+                    fields_to_update=set(),
+                )
+            document_updates[key].fields_to_update.update(fields)
+        else:
+            es_document_name, parent_id, fields, fields_map = args
+            key = (
+                es_document_name,
+                parent_id,
+                json.dumps(fields_map, sort_keys=True),
+            )
+            merged_fields, _ = children_updates.setdefault(
+                key, (set(), fields_map)
+            )
+            merged_fields.update(fields)
+    return list(document_updates.values()), children_updates
+
+
+def update_es_documents_in_bulk(
+    updates: list[BufferedDocumentUpdate],
+) -> tuple[int, int, int]:
+    """Apply document updates as partial updates sent in bulk requests of
+    up to ELASTICSEARCH_BULK_BATCH_SIZE actions.
+
+    Updates that target the same ES document are merged into one action.
+    Like update_es_document, updates to documents that don't exist in ES
+    are dropped.
+
+    :param updates: The coalesced document updates.
+    :return: A three tuple, the number of ES documents updated, the number of
+    bulk requests sent and the number of documents that don't exist in ES.
+    """
+    actions = {}
+    for update in updates:
+        es_document = getattr(es_document_module, update.es_document_name)
+        main_app_label, main_instance_id = update.main_instance_data
+        main_instance = get_instance_from_db(
+            main_instance_id, apps.get_model(main_app_label)
+        )
+        if not main_instance:
+            continue
+        related_instance = None
+        if update.related_instance_data:
+            related_app_label, related_instance_id = (
+                update.related_instance_data
+            )
+            related_instance = get_instance_from_db(
+                related_instance_id, apps.get_model(related_app_label)
+            )
+            if not related_instance:
+                continue
+
+        fields_values_to_update = document_fields_to_update(
+            es_document,
+            main_instance,
+            sorted(update.fields_to_update),
+            related_instance,
+            update.fields_map,
+        )
+        doc_id, parent_id = get_es_doc_id_and_parent_id(
+            es_document, main_instance
+        )
+        key = (es_document._index._name, str(doc_id))
+        if key not in actions:
+            actions[key] = {
+                "_op_type": "update",
+                "_index": es_document._index._name,
+                "_id": doc_id,
+                "doc": {},
+            }
+            if parent_id:
+                actions[key]["_routing"] = parent_id
+        actions[key]["doc"].update(fields_values_to_update)
+
+    if not actions:
+        return 0, 0, 0
+
+    documents_missing = 0
+    bulk_requests = 0
+    client = connections.get_connection()
+    for keys in batched(actions, settings.ELASTICSEARCH_BULK_BATCH_SIZE):
+        # Each batch is sent in a single bulk request.
+        results = streaming_bulk(
+            client,
+            [actions[key] for key in keys],
+            chunk_size=len(keys),
+            raise_on_error=False,
+            refresh=settings.ELASTICSEARCH_DSL_AUTO_REFRESH,
+        )
+        bulk_requests += 1
+        for key, (success, info) in zip(keys, results):
+            if success:
+                continue
+            if info["update"].get("status") == 404:
+                documents_missing += 1
+            else:
+                logger.error(
+                    "Error updating the ES document %s: %s",
+                    key,
+                    info["update"].get("error"),
+                )
+    return len(actions) - documents_missing, bulk_requests, documents_missing
+
+
+def get_es_update_buffer_stats() -> dict[str, int]:
+    """Get the counters of the ES update buffer.
+
+    :return: A dict with the number of updates buffered and flushed, the
+    number of ES documents updated, the number of bulk requests sent and the
+    number of documents that were missing in ES.
+    """
+    r = make_redis_interface("CACHE")
+    stats = r.hgetall(f"{ES_UPDATE_BUFFER_KEY}:stats")
+    return {key: int(value) for key, value in stats.items()}
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(ConnectionError, ConnectionTimeout),
+    max_retries=5,
+    retry_backoff=1 * 60,
+    retry_backoff_max=10 * 60,
+    retry_jitter=True,
+    queue=settings.CELERY_ETL_TASK_QUEUE,
+    ignore_result=True,
+)
+def flush_es_update_buffer(self: Task) -> None:
+    """Apply the buffered ES updates. Document updates are merged by target
+    document and sent as partial updates in bulk requests, children updates
+    are merged by parent and run as one update by query each.
+
+    :param self: The celery task
+    :return: None
+    """
+    # Allow new updates to schedule the next flush.
+    delete_redis_semaphore("CACHE", f"{ES_UPDATE_BUFFER_KEY}:scheduled")
+    r = make_redis_interface("CACHE", decode_responses=False)
+    batch_size = settings.ELASTICSEARCH_UPDATE_BUFFER_BATCH_SIZE
+    while True:
+        pipe = r.pipeline()
+        pipe.lrange(ES_UPDATE_BUFFER_KEY, 0, batch_size - 1)
+        pipe.ltrim(ES_UPDATE_BUFFER_KEY, batch_size, -1)
+        items, _ = pipe.execute()
+        if not items:
+            break
+
+        updates = [pickle.loads(item) for item in items]
+        document_updates, children_updates = coalesce_es_updates(updates)
+        try:
+            documents_updated, bulk_requests, documents_missing = (
+                update_es_documents_in_bulk(document_updates)
+            )
+        except (ConnectionError, ConnectionTimeout):
+            # Put the updates back in the buffer before retrying.
+            r.rpush(ES_UPDATE_BUFFER_KEY, *items)
+            raise
+
+        for (es_document_name, parent_id, _), (
+            fields,
+            fields_map,
+        ) in children_updates.items():
+            update_children_docs_by_query.delay(
+                es_document_name, parent_id, sorted(fields), fields_map
+            )
+
+        pipe = r.pipeline()
+        stats_key = f"{ES_UPDATE_BUFFER_KEY}:stats"
+        pipe.hincrby(stats_key, "flushed", len(updates))
+        pipe.hincrby(stats_key, "documents_updated", documents_updated)
+        pipe.hincrby(stats_key, "bulk_requests", bulk_requests)
+        pipe.hincrby(stats_key, "documents_missing", documents_missing)
+        pipe.hincrby(stats_key, "children_updates", len(children_updates))
+        pipe.execute()
+        logger.info(
+            "Flushed %s buffered ES updates into %s document updates and %s "
+            "children updates. %s documents were missing in ES.",
+            len(updates),
+            documents_updated,
+            len(children_updates),
+            documents_missing,
+        )
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(ConnectionError, ConnectionTimeout),
+    max_retries=5,
+    retry_backoff=1 * 60,
+    retry_backoff_max=10 * 60,
+    retry_jitter=True,
+    queue=settings.CELERY_ETL_TASK_QUEUE,
+    ignore_result=True,
+)
+def update_parenthetical_group_scores(
+    self: Task, group_ids: list[int]
+) -> None:
+    """Update the score of ParentheticalGroups in ES with partial updates
+    sent in bulk. Used when the scores are updated in the DB in bulk, which
+    doesn't trigger the ES signal processor.
+
+    :param self: The celery task
+    :param group_ids: The IDs of the ParentheticalGroups to update.
+    :return: None
+    """
+
+    index_name = ParentheticalGroupDocument._index._name
+    actions = (
+        {
+            "_op_type": "update",
+            "_index": index_name,
+            "_id": group_id,
+            "doc": {"score": score},
+        }
+        for group_id, score in ParentheticalGroup.objects.filter(
+            pk__in=group_ids
+        ).values_list("pk", "score")
+    )
+    client = connections.get_connection()
+    for success, info in streaming_bulk(
+        client,
+        actions,
+        chunk_size=settings.ELASTICSEARCH_BULK_BATCH_SIZE,
+        raise_on_error=False,
+        refresh=settings.ELASTICSEARCH_DSL_AUTO_REFRESH,
+    ):
+        # Groups that aren't indexed yet get their score when they're indexed.
+        if not success and info["update"].get("status") != 404:
+            logger.error(
+                "Error updating the score of ParentheticalGroup %s: %s",
+                info["update"].get("_id"),
+                info["update"].get("error"),
+            )
+
+
 @app.task(
     bind=True,
     autoretry_for=(
@@ -825,6 +1204,10 @@ def bulk_indexing_generator(
 ) -> Generator[ESDictDocument, None, None]:
     """Generate ES documents for bulk indexing.
 
+    Child documents that support bulk preparation are fetched along with the
+    relations they require, and the fields that depend on their parent are
+    prepared only once per parent.
+
     :param docs_query_set: The queryset of model instances to be indexed.
     :param es_document: The Elasticsearch document class corresponding to
     the instance model.
@@ -836,22 +1219,37 @@ def bulk_indexing_generator(
     """
 
     parent_id_mappings = {
+        "POSITION": lambda document: document.person_id,
         "RECAP": lambda document: document.docket_entry.docket_id,
         "OPINION": lambda document: document.cluster_id,
     }
-    for doc in docs_query_set.iterator():
-        es_doc = es_document().prepare(doc)
+    es_doc_instance = es_document()
+    bulk_prepare = child_id_property and issubclass(
+        es_document, BulkPrepareMixin
+    )
+    if bulk_prepare:
+        docs_query_set = es_document.get_bulk_queryset(docs_query_set)
+    parent_fields_cache: dict[int, ESDictDocument] = {}
+    for doc in docs_query_set.iterator(chunk_size=2000):
         if child_id_property:
-            if not parent_id:
+            doc_parent_id = parent_id
+            if not doc_parent_id:
                 parent_id_lambda = parent_id_mappings.get(child_id_property)
                 if not parent_id_lambda:
                     continue
-                parent_id = parent_id_lambda(doc)
+                doc_parent_id = parent_id_lambda(doc)
+            if bulk_prepare:
+                es_doc = es_doc_instance.prepare_bulk(
+                    doc, doc_parent_id, parent_fields_cache
+                )
+            else:
+                es_doc = es_doc_instance.prepare(doc)
             doc_params = {
                 "_id": getattr(ES_CHILD_ID(doc.pk), child_id_property),
-                "_routing": f"{parent_id}",
+                "_routing": f"{doc_parent_id}",
             }
         else:
+            es_doc = es_doc_instance.prepare(doc)
             doc_params = {
                 "_id": doc.pk,
             }
@@ -860,6 +1258,54 @@ def bulk_indexing_generator(
         yield es_doc
 
 
+def index_documents_in_bulk(
+    actions: Iterable[ESDictDocument],
+    testing_mode: bool = False,
+    on_progress: Callable[[int], None] | None = None,
+) -> list[str]:
+    """Send a stream of bulk actions to ES. Uses either streaming or parallel
+    bulk operations, depending on the mode.
+
+    :param actions: An iterable of ES bulk actions.
+    :param testing_mode: Set to True to enable streaming bulk, which is used in
+     TestCase-based tests because parallel_bulk is incompatible with them.
+    https://github.com/freelawproject/courtlistener/pull/3324#issue-1970675619
+    Default is False.
+    :param on_progress: Optional, a callable called with the number of
+    actions indexed so far, as results come back from ES. It stops being
+    called once an action fails, so it never reports past a failure.
+    :return: A list of IDs of documents that failed to index.
+    """
+
+    client = connections.get_connection()
+    failed_docs = []
+
+    if testing_mode:
+        # Use streaming_bulk in TestCase based tests. Since parallel_bulk
+        # doesn't work on them.
+        results = streaming_bulk(
+            client,
+            actions,
+            chunk_size=settings.ELASTICSEARCH_BULK_BATCH_SIZE,
+        )
+    else:
+        # Use parallel_bulk in production and tests based on TransactionTestCase
+        results = parallel_bulk(
+            client,
+            actions,
+            thread_count=settings.ELASTICSEARCH_PARALLEL_BULK_THREADS,
+            chunk_size=settings.ELASTICSEARCH_BULK_BATCH_SIZE,
+        )
+    # Both helpers return the results in the same order as the actions.
+    for indexed, (success, info) in enumerate(results, start=1):
+        if not success:
+            failed_docs.append(info["index"]["_id"])
+        elif on_progress and not failed_docs:
+            on_progress(indexed)
+
+    return failed_docs
+
+
 def index_documents_in_bulk_from_queryset(
     docs_queryset: QuerySet,
     es_document: ESDocumentClassType,
@@ -886,43 +1332,230 @@ def index_documents_in_bulk_from_queryset(
     :return: A list of IDs of documents that failed to index.
     """
 
+    return index_documents_in_bulk(
+        bulk_indexing_generator(
+            docs_queryset,
+            es_document,
+            base_doc,
+            child_id_property,
+            parent_instance_id,
+        ),
+        testing_mode=testing_mode,
+    )
+
+
+def get_indexed_parent_ids(
+    es_document: ESDocumentClassType, parent_ids: list[int]
+) -> set[int]:
+    """Get the IDs of the parent documents that are already indexed in ES
+    using a single multi-get request.
+
+    :param es_document: The ES parent document class.
+    :param parent_ids: The parent document IDs to look up.
+    :return: A set of the parent IDs that exist in the index.
+    """
+
     client = connections.get_connection()
-    failed_child_docs = []
+    response = client.mget(
+        index=es_document._index._name,
+        ids=[str(parent_id) for parent_id in parent_ids],
+        source=False,
+    )
+    return {int(doc["_id"]) for doc in response["docs"] if doc.get("found")}
 
-    if testing_mode:
-        # Use streaming_bulk in TestCase based tests. Since parallel_bulk
-        # doesn't work on them.
-        for success, info in streaming_bulk(
-            client,
-            bulk_indexing_generator(
-                docs_queryset,
-                es_document,
-                base_doc,
-                child_id_property,
-                parent_instance_id,
-            ),
-            chunk_size=settings.ELASTICSEARCH_BULK_BATCH_SIZE,
+
+def get_parent_and_child_bulk_config(
+    search_type: str,
+) -> (
+    tuple[
+        ESDocumentClassType,
+        ESDocumentClassType,
+        str,
+        Callable[[list[int]], QuerySet],
+        Callable[[list[int]], QuerySet],
+    ]
+    | None
+):
+    """Get the documents, the child ID property and the querysets builders
+    required to index parent and child documents in bulk for a search type.
+
+    :param search_type: The Search Type to index parent and child docs.
+    :return: A five tuple containing the parent ES document class, the child
+    ES document class, the child ID property, a callable that returns the
+    parent instances for a list of IDs and a callable that returns the child
+    instances for a list of parent IDs. None if the search type is not
+    supported.
+    """
+
+    match search_type:
+        case SEARCH_TYPES.PEOPLE:
+            return (
+                PersonDocument,
+                PositionDocument,
+                "POSITION",
+                lambda ids: Person.objects.filter(pk__in=ids),
+                lambda ids: Position.objects.filter(person_id__in=ids),
+            )
+        case SEARCH_TYPES.RECAP:
+            return (
+                DocketDocument,
+                ESRECAPDocument,
+                "RECAP",
+                lambda ids: Docket.objects.filter(pk__in=ids).select_related(
+                    "court", "assigned_to", "referred_to"
+                ),
+                lambda ids: RECAPDocument.objects.filter(
+                    docket_entry__docket_id__in=ids
+                ),
+            )
+        case SEARCH_TYPES.OPINION:
+            return (
+                OpinionClusterDocument,
+                OpinionDocument,
+                "OPINION",
+                lambda ids: OpinionCluster.objects.filter(
+                    pk__in=ids
+                ).select_related("docket__court"),
+                lambda ids: Opinion.objects.filter(cluster_id__in=ids),
+            )
+        case _:
+            return None
+
+
+def parent_and_child_bulk_generator(
+    parent_ids: Iterable[int],
+    search_type: str,
+    stats: BulkIndexingStats,
+    parents_per_batch: int = 100,
+    on_batch_done: Callable[[int], None] | None = None,
+) -> Generator[ESDictDocument, None, None]:
+    """Generate the ES bulk actions required to index many parent documents
+    and their children in a single stream.
+
+    Parents are fetched in batches. Their existence in ES is checked with a
+    single multi-get request per batch, and only the missing ones are
+    indexed. Child documents for the whole batch are fetched together and
+    routed to their parent.
+
+    :param parent_ids: An iterable of parent instance IDs to index.
+    :param search_type: The Search Type to index parent and child docs.
+    :param stats: A BulkIndexingStats instance updated in place.
+    :param parents_per_batch: The number of parents fetched at a time.
+    :param on_batch_done: Optional, a callable called with the last parent ID
+    of a batch once all the actions of the batch have been generated.
+    :return: Yields ES bulk actions.
+    """
+
+    config = get_parent_and_child_bulk_config(search_type)
+    if config is None:
+        return
+    (
+        parent_es_document,
+        child_es_document,
+        child_id_property,
+        get_parents,
+        get_children,
+    ) = config
+    base_doc = {
+        "_op_type": "index",
+        "_index": parent_es_document._index._name,
+    }
+    for batch in batched(parent_ids, parents_per_batch):
+        batch_ids = list(batch)
+        stats.parents += len(batch_ids)
+        indexed_ids = get_indexed_parent_ids(parent_es_document, batch_ids)
+        stats.es_requests += 1
+        missing_ids = [pk for pk in batch_ids if pk not in indexed_ids]
+        if missing_ids:
+            # Parent documents not indexed yet, index them.
+            for es_doc in bulk_indexing_generator(
+                get_parents(missing_ids), parent_es_document, base_doc
+            ):
+                stats.documents += 1
+                yield es_doc
+
+        for es_doc in bulk_indexing_generator(
+            get_children(batch_ids),
+            child_es_document,
+            base_doc,
+            child_id_property=child_id_property,
         ):
-            if not success:
-                failed_child_docs.append(info["index"]["_id"])
-    else:
-        # Use parallel_bulk in production and tests based on TransactionTestCase
-        for success, info in parallel_bulk(
-            client,
-            bulk_indexing_generator(
-                docs_queryset,
-                es_document,
-                base_doc,
-                child_id_property,
-                parent_instance_id,
+            stats.documents += 1
+            yield es_doc
+        if on_batch_done:
+            on_batch_done(batch_ids[-1])
+
+
+def index_parent_and_child_docs_in_bulk(
+    parent_ids: Iterable[int],
+    search_type: str,
+    testing_mode: bool = False,
+    on_parent_indexed: Callable[[int], None] | None = None,
+) -> BulkIndexingStats:
+    """Index many parent documents and their children into ES through a
+    single shared bulk stream.
+
+    :param parent_ids: An iterable of parent instance IDs to index.
+    :param search_type: The Search Type to index parent and child docs.
+    :param testing_mode: Set to True to enable streaming bulk, which is used in
+     TestCase-based tests because parallel_bulk is incompatible with them.
+    :param on_parent_indexed: Optional, a callable called with the ID of the
+    last parent whose documents, and those of all the parents before it, were
+    indexed successfully. Useful to checkpoint the indexing.
+    :return: A BulkIndexingStats instance with the indexing throughput.
+    """
+
+    stats = BulkIndexingStats()
+    config = get_parent_and_child_bulk_config(search_type)
+    if config is None:
+        return stats
+
+    # The number of actions generated up to the end of each parent batch,
+    # along with the last parent ID of the batch.
+    batch_ends: deque[tuple[int, int]] = deque()
+
+    def checkpoint(indexed: int) -> None:
+        last_parent_id = None
+        while batch_ends and batch_ends[0][0] <= indexed:
+            last_parent_id = batch_ends.popleft()[1]
+        if last_parent_id is not None and on_parent_indexed:
+            on_parent_indexed(last_parent_id)
+
+    start_time = time.monotonic()
+    failed_docs = index_documents_in_bulk(
+        parent_and_child_bulk_generator(
+            parent_ids,
+            search_type,
+            stats,
+            on_batch_done=lambda last_id: batch_ends.append(
+                (stats.documents, last_id)
             ),
-            thread_count=settings.ELASTICSEARCH_PARALLEL_BULK_THREADS,
-            chunk_size=settings.ELASTICSEARCH_BULK_BATCH_SIZE,
-        ):
-            if not success:
-                failed_child_docs.append(info["index"]["_id"])
+        ),
+        testing_mode=testing_mode,
+        on_progress=checkpoint,
+    )
+    if not failed_docs:
+        # Batches without actions, or whose end was generated after the
+        # last result came back.
+        checkpoint(stats.documents)
+    stats.elapsed = time.monotonic() - start_time
+    stats.failed = len(failed_docs)
+    # Bulk requests are sent in chunks of ELASTICSEARCH_BULK_BATCH_SIZE
+    # actions.
+    stats.es_requests += math.ceil(
+        stats.documents / settings.ELASTICSEARCH_BULK_BATCH_SIZE
+    )
+    if failed_docs:
+        logger.error(
+            f"Error indexing documents for search type {search_type}. "
+            f"Failed doc IDs are: {failed_docs}"
+        )
 
-    return failed_child_docs
+    if settings.ELASTICSEARCH_DSL_AUTO_REFRESH:
+        # Set auto-refresh, used for testing.
+        parent_es_document = config[0]
+        parent_es_document._index.refresh()
+    return stats
 
 
 @app.task(
@@ -950,83 +1583,185 @@ def index_parent_and_child_docs(
     :return: None
     """
 
+    stats = index_parent_and_child_docs_in_bulk(
+        instance_ids, search_type, testing_mode=testing_mode
+    )
+    logger.info(
+        f"Indexed {stats.documents} documents from {stats.parents} parents "
+        f"in {stats.elapsed:.2f}s ({stats.docs_per_second:.1f} docs/sec, "
+        f"{stats.requests_per_parent:.2f} ES requests per parent)."
+    )
+
+
+def get_next_parent_ids(
+    search_type: str, after_pk: int, end_pk: int, chunk_size: int
+) -> tuple[list[int], int | None]:
+    """Get the next chunk of parent IDs to index within a PK range.
+
+    :param search_type: The Search Type to index parent and child docs.
+    :param after_pk: Only parents with a greater PK are returned.
+    :param end_pk: The highest PK to return.
+    :param chunk_size: The number of parents to scan.
+    :return: A two tuple containing the parent IDs to index and the last PK
+    scanned, or None if there are no more parents in the range.
+    """
+
     match search_type:
         case SEARCH_TYPES.PEOPLE:
-            parent_es_document = PersonDocument
-            child_es_document = PositionDocument
-            child_id_property = "POSITION"
+            queryset = Person.objects.filter(is_alias_of=None)
         case SEARCH_TYPES.RECAP:
-            parent_es_document = DocketDocument
-            child_es_document = ESRECAPDocument
-            child_id_property = "RECAP"
+            queryset = Docket.objects.all()
         case SEARCH_TYPES.OPINION:
-            parent_es_document = OpinionClusterDocument
-            child_es_document = OpinionDocument
-            child_id_property = "OPINION"
+            queryset = OpinionCluster.objects.all()
         case _:
-            return
+            return [], None
 
-    model_label = parent_es_document.Django.model.__name__.capitalize()
-    for instance_id in instance_ids:
-        if search_type == SEARCH_TYPES.PEOPLE:
-            instance = Person.objects.prefetch_related("positions").get(
-                pk=instance_id
-            )
-            child_docs = instance.positions.all()
-        elif search_type == SEARCH_TYPES.RECAP:
-            instance = Docket.objects.get(pk=instance_id)
-            child_docs = RECAPDocument.objects.filter(
-                docket_entry__docket=instance
-            )
-        elif search_type == SEARCH_TYPES.OPINION:
-            instance = OpinionCluster.objects.get(pk=instance_id)
-            child_docs = instance.sub_opinions.all()
-        else:
-            return
+    queryset = queryset.filter(pk__gt=after_pk, pk__lte=end_pk).order_by("pk")
+    if search_type == SEARCH_TYPES.PEOPLE:
+        # Only judges are indexed.
+        people = list(queryset.prefetch_related("positions")[:chunk_size])
+        if not people:
+            return [], None
+        judge_ids = [person.pk for person in people if person.is_judge]
+        return judge_ids, people[-1].pk
 
-        if not parent_es_document.exists(instance_id):
-            # Parent document is not yet indexed, index it.
-            doc = parent_es_document().prepare(instance)
-            es_args = {
-                "meta": {"id": instance_id},
-            }
-            try:
-                parent_es_document(**es_args, **doc).save(
-                    skip_empty=False,
-                    return_doc_meta=False,
-                    refresh=settings.ELASTICSEARCH_DSL_AUTO_REFRESH,
-                )
-            except (ConflictError, RequestError) as exc:
+    parent_ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+    if not parent_ids:
+        return [], None
+    return parent_ids, parent_ids[-1]
+
+
+def index_shard(
+    shard: IndexShard,
+    search_type: str,
+    chunk_size: int,
+    lease_ttl: int = SHARD_LEASE_TTL,
+    testing_mode: bool = False,
+) -> BulkIndexingStats:
+    """Index the parent and child documents of a claimed shard, starting
+    from its checkpoint. The checkpoint is stored and the lease renewed after
+    every chunk of parents.
+
+    If documents of a chunk fail to be indexed, the checkpoint isn't moved
+    past them and the worker stops processing the shard, so they're indexed
+    again when the shard is claimed once its lease expires.
+
+    :param shard: The claimed IndexShard to process.
+    :param search_type: The Search Type to index parent and child docs.
+    :param chunk_size: The number of parents to index per chunk.
+    :param lease_ttl: How long the shard lease lives if it's not renewed.
+    :param testing_mode: Set to True to enable streaming bulk, which is used in
+     TestCase-based tests because parallel_bulk is incompatible with them.
+    :return: A BulkIndexingStats instance with the shard indexing throughput.
+    """
+
+    stats = BulkIndexingStats()
+    while True:
+        parent_ids, last_pk = get_next_parent_ids(
+            search_type, shard.checkpoint, shard.end, chunk_size
+        )
+        if last_pk is None:
+            complete_index_shard(search_type, shard)
+            break
+        if parent_ids:
+            indexed_parent_ids = []
+            chunk_stats = index_parent_and_child_docs_in_bulk(
+                parent_ids,
+                search_type,
+                testing_mode=testing_mode,
+                on_parent_indexed=indexed_parent_ids.append,
+            )
+            stats.merge(chunk_stats)
+            if chunk_stats.failed:
+                if indexed_parent_ids:
+                    checkpoint_index_shard(
+                        search_type, shard, indexed_parent_ids[-1], lease_ttl
+                    )
                 logger.error(
-                    f"Error indexing the {model_label} with ID: {instance_id}. "
-                    f"Exception was: {type(exc).__name__}"
+                    f"Failed to index {chunk_stats.failed} documents from "
+                    f"shard {shard.shard_id} of {search_type}, stopped at PK "
+                    f"{shard.checkpoint}."
                 )
-                continue
+                break
+        if not checkpoint_index_shard(search_type, shard, last_pk, lease_ttl):
+            logger.warning(
+                f"Lost the lease for shard {shard.shard_id} of {search_type}, "
+                f"stopped at PK {last_pk}."
+            )
+            break
+    return stats
 
-        # Index child documents in bulk.
-        base_doc = {
-            "_op_type": "index",
-            "_index": parent_es_document._index._name,
-        }
 
-        failed_child_docs = index_documents_in_bulk_from_queryset(
-            child_docs,
-            child_es_document,
-            base_doc,
-            child_id_property=child_id_property,
-            parent_instance_id=instance_id,
+def run_index_shards_worker(
+    search_type: str,
+    worker_id: str,
+    chunk_size: int,
+    lease_ttl: int = SHARD_LEASE_TTL,
+    testing_mode: bool = False,
+) -> BulkIndexingStats:
+    """Claim and index shards until there are no more shards to claim.
+
+    :param search_type: The Search Type to index parent and child docs.
+    :param worker_id: A unique identifier of the worker.
+    :param chunk_size: The number of parents to index per chunk.
+    :param lease_ttl: How long a shard lease lives if it's not renewed.
+    :param testing_mode: Set to True to enable streaming bulk, which is used in
+     TestCase-based tests because parallel_bulk is incompatible with them.
+    :return: A BulkIndexingStats instance with the worker throughput.
+    """
+
+    stats = BulkIndexingStats()
+    while shard := claim_index_shard(search_type, worker_id, lease_ttl):
+        shard_stats = index_shard(
+            shard,
+            search_type,
+            chunk_size,
+            lease_ttl=lease_ttl,
             testing_mode=testing_mode,
         )
+        logger.info(
+            f"Worker {worker_id} indexed {shard_stats.documents} documents "
+            f"from shard {shard.shard_id} of {search_type} "
+            f"({shard_stats.docs_per_second:.1f} docs/sec)."
+        )
+        stats.merge(shard_stats)
+    return stats
 
-        if failed_child_docs:
-            logger.error(
-                f"Error indexing child documents from the {model_label}"
-                f" with ID: {instance_id}. Child IDs are: {failed_child_docs}"
-            )
 
-    if settings.ELASTICSEARCH_DSL_AUTO_REFRESH:
-        # Set auto-refresh, used for testing.
-        parent_es_document._index.refresh()
+@app.task(
+    bind=True,
+    autoretry_for=(ConnectionError,),
+    max_retries=3,
+    interval_start=5,
+    ignore_result=True,
+)
+def index_parent_and_child_docs_shards(
+    self: Task,
+    search_type: str,
+    chunk_size: int,
+    lease_ttl: int = SHARD_LEASE_TTL,
+    testing_mode: bool = False,
+) -> None:
+    """Claim and index shards of parent documents and their children until
+    there are no more shards to claim.
+
+    :param self: The Celery task instance
+    :param search_type: The Search Type to index parent and child docs.
+    :param chunk_size: The number of parents to index per chunk.
+    :param lease_ttl: How long a shard lease lives if it's not renewed.
+    :param testing_mode: Set to True to enable streaming bulk, which is used in
+     TestCase-based tests because parallel_bulk is incompatible with them.
+    :return: None
+    """
+
+    worker_id = f"{socket.gethostname()}:{self.request.id}"
+    run_index_shards_worker(
+        search_type,
+        worker_id,
+        chunk_size,
+        lease_ttl=lease_ttl,
+        testing_mode=testing_mode,
+    )
 
 
 @app.task(
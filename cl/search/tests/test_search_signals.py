@@ -10,6 +10,7 @@ from cl.search.factories import (
 )
 from cl.search.models import RECAPDocument
 from cl.search.signals import handle_recap_doc_change
+from cl.search.tasks import coalesce_es_updates
 from cl.tests.cases import SimpleTestCase
 
 
@@ -82,3 +83,61 @@ class RECAPDocumentReceiverTests(SimpleTestCase):
                         )
                     else:
                         mock_apply.assert_not_called()
+
+
+class ESUpdateBufferTests(SimpleTestCase):
+    def test_coalesce_es_updates(self) -> None:
+        """Are buffered updates to the same documents merged?"""
+        fields_map = {"case_name": ["caseName"]}
+        updates = [
+            (
+                "DocketDocument",
+                ["case_name"],
+                ("search.Docket", 1),
+                None,
+                None,
+            ),
+            (
+                "DocketDocument",
+                ["docket_number"],
+                ("search.Docket", 1),
+                None,
+                None,
+            ),
+            (
+                "DocketDocument",
+                ["case_name"],
+                ("search.Docket", 2),
+                None,
+                None,
+            ),
+            (
+                "ESRECAPDocument",
+                ["case_name"],
+                ("search.RECAPDocument", 3),
+                ("search.Docket", 1),
+                fields_map,
+            ),
+        ]
+        children_updates = [
+            ("ESRECAPDocument", 1, ["case_name"], fields_map),
+            ("ESRECAPDocument", 1, ["docket_number"], fields_map),
+            ("ESRECAPDocument", 2, ["case_name"], fields_map),
+        ]
+        document_updates, merged_children = coalesce_es_updates(
+            [("document", *update) for update in updates]
+            + [("children", *update) for update in children_updates]
+        )
+
+        self.assertEqual(len(document_updates), 3)
+        self.assertEqual(
+            document_updates[0].fields_to_update,
+            {"case_name", "docket_number"},
+        )
+        self.assertEqual(document_updates[2].fields_map, fields_map)
+        self.assertEqual(len(merged_children), 2)
+        fields, children_fields_map = merged_children[
+            ("ESRECAPDocument", 1, '{"case_name": ["caseName"]}')
+        ]
+        self.assertEqual(fields, {"case_name", "docket_number"})
+        self.assertEqual(children_fields_map, fields_map)
@@ -1,6 +1,7 @@
 import datetime
 import io
 import os
+import tempfile
 from datetime import date
 from pathlib import Path
 from unittest import mock
@@ -13,7 +14,9 @@ from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.management import call_command
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from factory import RelatedFactory
@@ -24,6 +27,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 from timeout_decorator import timeout_decorator
 
+from cl.citations.citation_graph import load_citation_graph
 from cl.lib.search_utils import make_fq
 from cl.lib.storage import clobbering_get_name
 from cl.lib.test_helpers import (
@@ -71,7 +75,9 @@ from cl.search.models import (
     DocketEvent,
     Opinion,
     OpinionCluster,
+    OpinionsCited,
     RECAPDocument,
+    Tag,
     sort_cites,
 )
 from cl.search.tasks import (
@@ -281,6 +287,71 @@ class ModelTest(TestCase):
         )
         self.assertEqual(cluster_count, expected_count)
 
+    def test_tag_objects_in_bulk(self) -> None:
+        """Can we tag querysets and mixed lists of objects in bulk, skipping
+        the ones already tagged?"""
+        tag = Tag.objects.create(name="bulk-tag")
+        docket_2 = DocketFactory(court=self.docket.court)
+        de = DocketEntryWithParentsFactory(docket=self.docket)
+        rd = RECAPDocumentFactory(docket_entry=de)
+        tag.tag_object(self.docket)
+
+        with self.assertNumQueries(1):
+            created = tag.tag_objects(
+                Docket.objects.filter(pk__in=[self.docket.pk, docket_2.pk])
+            )
+        self.assertEqual(created, 1)
+
+        with self.assertNumQueries(3):
+            created = tag.tag_objects([de, rd, docket_2, self.docket])
+        self.assertEqual(created, 2)
+        self.assertEqual(tag.dockets.count(), 2)
+        self.assertEqual(list(tag.docket_entries.all()), [de])
+        self.assertEqual(list(tag.recap_documents.all()), [rd])
+
+        with self.assertRaises(NotImplementedError):
+            tag.tag_objects([self.oc])
+
+    def test_recap_document_duplicate_resolution(self) -> None:
+        """Does RECAPDocument.save resolve duplicated main documents, only
+        looking for them when they're needed?"""
+        de = DocketEntryWithParentsFactory(docket=self.docket)
+        rd = RECAPDocumentFactory(
+            docket_entry=de, document_number="1", pacer_doc_id="123"
+        )
+
+        # Updates that don't change the key fields don't look for duplicates.
+        rd.description = "Lorem ipsum"
+        with CaptureQueriesContext(connection) as ctx:
+            rd.save(update_fields=["description"])
+        self.assertFalse(
+            any('"attachment_number" IS NULL' in q["sql"] for q in ctx)
+        )
+
+        # Items with different pacer_doc_id values can't be resolved.
+        with self.assertRaises(ValidationError):
+            RECAPDocument(
+                docket_entry=de, document_number="1", pacer_doc_id="456"
+            ).save()
+
+        # The existing duplicate is replaced by the new item.
+        rd_dupe = RECAPDocument(
+            docket_entry=de, document_number="1", pacer_doc_id="123"
+        )
+        rd_dupe.save()
+        self.assertFalse(RECAPDocument.objects.filter(pk=rd.pk).exists())
+        self.assertEqual(
+            list(de.recap_documents.values_list("pk", flat=True)),
+            [rd_dupe.pk],
+        )
+
+        # The DB guarantees it when the probe is skipped.
+        with transaction.atomic():
+            with self.assertRaises(IntegrityError):
+                RECAPDocument.objects.bulk_create(
+                    [RECAPDocument(docket_entry=de, document_number="1")]
+                )
+
 
 class DocketValidationTest(TestCase):
     @classmethod
@@ -900,6 +971,15 @@ class PagerankTest(TestCase):
     def setUpTestData(cls) -> None:
         PACERFreeDocumentLogFactory.create()
 
+    def setUp(self) -> None:
+        graph_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(graph_dir.cleanup)
+        settings_override = override_settings(
+            CITATION_GRAPH_DIR=graph_dir.name
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
     def test_pagerank_calculation(self) -> None:
         """Create a few items and fake citation relation among them, then
         run the pagerank algorithm. Check whether this simple case can get the
@@ -924,6 +1004,24 @@ class PagerankTest(TestCase):
                 "%s" % (key, pr_results[key], answers[key]),
             )
 
+    def test_citation_graph_incremental_update(self) -> None:
+        """Are only the citations created since the last run merged into the
+        stored citation graph?
+        """
+        Command.do_pagerank()
+        graph = load_citation_graph(settings.CITATION_GRAPH_DIR)
+        citations_count = OpinionsCited.objects.count()
+        self.assertEqual(graph.num_edges, citations_count)
+
+        OpinionsCited.objects.create(citing_opinion_id=2, cited_opinion_id=1)
+        Command.do_pagerank()
+        graph = load_citation_graph(settings.CITATION_GRAPH_DIR)
+        self.assertEqual(graph.num_edges, citations_count + 1)
+        self.assertEqual(
+            graph.last_citation_id, OpinionsCited.objects.latest("pk").pk
+        )
+        self.assertIn(1, graph.indices[graph.indptr[2] : graph.indptr[3]])
+
 
 class OpinionSearchFunctionalTest(AudioTestCase, BaseSeleniumTest):
     """
@@ -8,6 +8,7 @@ from django.urls import reverse
 from elasticsearch_dsl import Q
 from lxml import html
 
+from cl.citations.parenthetical_utils import create_parenthetical_groups
 from cl.lib.elasticsearch_utils import (
     build_daterange_query,
     build_es_filters,
@@ -564,6 +565,41 @@ class ParentheticalESSignalProcessorTest(
         self.p5.group = self.pg_test
         self.p5.save()
 
+    def test_update_kept_group_scores_in_es(self) -> None:
+        """Are the scores of the groups kept when a cluster is regrouped
+        updated in ES?"""
+        cluster = OpinionClusterFactory(
+            docket=DocketFactory(court=self.c1),
+            precedential_status=PRECEDENTIAL_STATUS.PUBLISHED,
+        )
+        described = OpinionWithParentsFactory(cluster=cluster)
+        ParentheticalFactory(
+            describing_opinion=self.o,
+            described_opinion=described,
+            group=None,
+            text="Holding public employees could not be fired because of "
+            "their politics",
+            score=0.5,
+        )
+        create_parenthetical_groups(cluster)
+        group = cluster.parenthetical_groups.get()
+        doc = ParentheticalGroupDocument.get(id=group.pk)
+        self.assertEqual(doc.score, 0.5)
+
+        # A new unrelated parenthetical halves the score of the kept group.
+        ParentheticalFactory(
+            describing_opinion=self.o_2,
+            described_opinion=described,
+            group=None,
+            text="The loss of First Amendment freedoms, for even minimal "
+            "period of time, unquestionably constitutes irreparable injury.",
+            score=0.4,
+        )
+        create_parenthetical_groups(cluster)
+        self.assertTrue(cluster.parenthetical_groups.filter(pk=group.pk))
+        doc = ParentheticalGroupDocument.get(id=group.pk)
+        self.assertEqual(doc.score, 0.25)
+
     def test_keep_in_sync_related_pa_objects_on_save(self) -> None:
         """Test PA documents are updated in ES when related objects change."""
 
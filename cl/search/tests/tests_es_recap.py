@@ -10,7 +10,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
 from django.test import AsyncClient, override_settings
 from django.urls import reverse
-from elasticsearch_dsl import Q
+from elasticsearch_dsl import MultiSearch, Q
 from lxml import etree, html
 from rest_framework.status import HTTP_200_OK
 
@@ -34,6 +34,14 @@ from cl.search.factories import (
     OpinionWithParentsFactory,
     RECAPDocumentFactory,
 )
+from cl.search.index_shards import (
+    checkpoint_index_shard,
+    claim_index_shard,
+    compose_shards_key,
+    create_index_shards,
+    delete_index_shards,
+    get_index_shards,
+)
 from cl.search.management.commands.cl_index_parent_and_child_docs import (
     compose_redis_key,
     get_last_parent_document_id_processed,
@@ -41,14 +49,22 @@ from cl.search.management.commands.cl_index_parent_and_child_docs import (
 )
 from cl.search.models import (
     SEARCH_TYPES,
+    Docket,
     OpinionsCitedByRECAPDocument,
     RECAPDocument,
 )
 from cl.search.tasks import (
+    ES_UPDATE_BUFFER_KEY,
     add_docket_to_solr_by_rds,
+    buffer_es_document_update,
+    bulk_indexing_generator,
     es_save_document,
+    flush_es_update_buffer,
+    get_es_update_buffer_stats,
     index_docket_parties_in_es,
+    index_parent_and_child_docs_in_bulk,
     index_related_cites_fields,
+    index_shard,
     update_es_document,
 )
 from cl.search.types import EventTable
@@ -143,7 +159,7 @@ class RECAPSearchTest(RECAPSearchTestCase, ESIndexTestCase, TestCase):
     def _test_main_es_query(self, cd, parent_expected, field_name):
         search_query = DocketDocument.search()
         (s, child_docs_count_query, *_) = build_es_main_query(search_query, cd)
-        hits, _, _, total_query_results, child_total = fetch_es_results(
+        hits, _, _, total_query_results, child_total, _ = fetch_es_results(
             cd,
             s,
             child_docs_count_query,
@@ -191,6 +207,49 @@ class RECAPSearchTest(RECAPSearchTestCase, ESIndexTestCase, TestCase):
             "     Got: %s\n\n" % (field_name, expected_count, got),
         )
 
+    @override_settings(ELASTICSEARCH_COUNT_CACHE_TIMEOUT=60)
+    def test_search_totals_are_cached(self) -> None:
+        """Are the count queries skipped when paginating a search whose
+        totals are cached?
+        """
+        cd = {"type": SEARCH_TYPES.RECAP, "q": "Discharging Debtor"}
+        search_query = DocketDocument.search()
+        s, child_docs_count_query, *_ = build_es_main_query(search_query, cd)
+        _, _, _, parent_total, child_total, _ = fetch_es_results(
+            cd, s, child_docs_count_query, 1
+        )
+        with mock.patch.object(
+            MultiSearch, "add", autospec=True, side_effect=MultiSearch.add
+        ) as mock_add:
+            _, _, error, cached_parent_total, cached_child_total, _ = (
+                fetch_es_results(cd, s, child_docs_count_query, 2)
+            )
+        self.assertFalse(error)
+        self.assertEqual(mock_add.call_count, 1)
+        self.assertEqual(cached_parent_total, parent_total)
+        self.assertEqual(cached_child_total, child_total)
+
+    @override_settings(ELASTICSEARCH_APPROXIMATE_COUNT_THRESHOLD=1)
+    def test_approximate_search_totals(self) -> None:
+        """Are the hits only counted up to the approximate counts threshold?"""
+        cd = {"type": SEARCH_TYPES.RECAP, "q": ""}
+        search_query = DocketDocument.search()
+        s, child_docs_count_query, *_ = build_es_main_query(search_query, cd)
+        _, _, _, parent_total, _, approximate_totals = fetch_es_results(
+            cd, s, child_docs_count_query, 1
+        )
+        self.assertEqual(parent_total, 1)
+        self.assertEqual(approximate_totals, (True, False))
+
+        # A total that matches the threshold exactly isn't approximate.
+        cd = {"type": SEARCH_TYPES.RECAP, "q": "Discharging Debtor"}
+        s, child_docs_count_query, *_ = build_es_main_query(search_query, cd)
+        _, _, _, parent_total, _, approximate_totals = fetch_es_results(
+            cd, s, child_docs_count_query, 1
+        )
+        self.assertEqual(parent_total, 1)
+        self.assertFalse(approximate_totals[0])
+
     def test_has_child_text_queries(self) -> None:
         """Test has_child text queries."""
         cd = {
@@ -2928,6 +2987,188 @@ class IndexDocketRECAPDocumentsCommandTest(
             s.count(), 1, msg="Wrong number of RECAPDocuments returned."
         )
 
+    def test_cl_index_parent_and_child_docs_inline(self):
+        """Confirm the command can index Dockets and their RECAPDocuments
+        within the same process through a single bulk stream."""
+
+        # Index one of the dockets in advance; it shouldn't be indexed again.
+        call_command(
+            "cl_index_parent_and_child_docs",
+            search_type=SEARCH_TYPES.RECAP,
+            queue="celery",
+            pk_offset=self.de_1.docket.pk,
+            document_type="parent",
+        )
+        s = DocketDocument.search().query(Q("match", docket_child="docket"))
+        self.assertEqual(s.count(), 1, msg="Wrong number of Dockets returned.")
+
+        call_command(
+            "cl_index_parent_and_child_docs",
+            search_type=SEARCH_TYPES.RECAP,
+            queue="celery",
+            pk_offset=0,
+            inline=True,
+        )
+
+        s = DocketDocument.search().query(Q("match", docket_child="docket"))
+        self.assertEqual(s.count(), 2, msg="Wrong number of Dockets returned.")
+        for docket_id, rds_count in [
+            (self.de.docket.pk, 2),
+            (self.de_1.docket.pk, 1),
+        ]:
+            s = DocketDocument.search().query(
+                "parent_id", type="recap_document", id=docket_id
+            )
+            self.assertEqual(
+                s.count(),
+                rds_count,
+                msg="Wrong number of RECAPDocuments returned.",
+            )
+
+    def test_cl_index_parent_and_child_docs_shards(self):
+        """Confirm the command can index Dockets and their RECAPDocuments
+        split into shards handed out to workers."""
+
+        self.addCleanup(delete_index_shards, SEARCH_TYPES.RECAP)
+        call_command(
+            "cl_index_parent_and_child_docs",
+            search_type=SEARCH_TYPES.RECAP,
+            queue="celery",
+            pk_offset=0,
+            shards=2,
+            chunk_size=1,
+        )
+
+        shards = get_index_shards(SEARCH_TYPES.RECAP)
+        self.assertEqual(len(shards), 2)
+        self.assertTrue(all(shard.done for shard in shards))
+        s = DocketDocument.search().query(Q("match", docket_child="docket"))
+        self.assertEqual(s.count(), 2, msg="Wrong number of Dockets returned.")
+        s = DocketDocument.search().query(
+            Q("match", docket_child="recap_document")
+        )
+        self.assertEqual(
+            s.count(), 3, msg="Wrong number of RECAPDocuments returned."
+        )
+
+    def test_reclaim_abandoned_index_shard(self):
+        """Can a shard abandoned by a crashed worker be claimed by another
+        worker and resumed from its checkpoint?"""
+
+        self.addCleanup(delete_index_shards, SEARCH_TYPES.RECAP)
+        create_index_shards(SEARCH_TYPES.RECAP, 1)
+        shard = claim_index_shard(SEARCH_TYPES.RECAP, "worker_1")
+        self.assertEqual(shard.shard_id, 0)
+        self.assertTrue(
+            checkpoint_index_shard(SEARCH_TYPES.RECAP, shard, shard.start)
+        )
+        # The shard is leased, no other worker can claim it.
+        self.assertIsNone(claim_index_shard(SEARCH_TYPES.RECAP, "worker_2"))
+
+        # Simulate the lease expiring after worker_1 crashed.
+        self.r.delete(compose_shards_key(SEARCH_TYPES.RECAP, "lease:0"))
+        reclaimed_shard = claim_index_shard(SEARCH_TYPES.RECAP, "worker_2")
+        self.assertEqual(reclaimed_shard.owner, "worker_2")
+        self.assertEqual(reclaimed_shard.checkpoint, shard.start)
+        # worker_1 can't checkpoint the shard anymore.
+        self.assertFalse(
+            checkpoint_index_shard(SEARCH_TYPES.RECAP, shard, shard.end)
+        )
+
+    def test_index_shard_does_not_checkpoint_failed_documents(self):
+        """Is the shard checkpoint kept before a chunk whose documents failed
+        to be indexed, so they're indexed again when the shard is resumed?"""
+
+        self.addCleanup(delete_index_shards, SEARCH_TYPES.RECAP)
+        create_index_shards(SEARCH_TYPES.RECAP, 1)
+        shard = claim_index_shard(SEARCH_TYPES.RECAP, "worker_1")
+        start_checkpoint = shard.checkpoint
+
+        def fail_first_action(client, actions, **kwargs):
+            for i, action in enumerate(actions):
+                yield i > 0, {"index": {"_id": action["_id"]}}
+
+        with mock.patch(
+            "cl.search.tasks.streaming_bulk", side_effect=fail_first_action
+        ):
+            stats = index_shard(
+                shard, SEARCH_TYPES.RECAP, chunk_size=10, testing_mode=True
+            )
+        self.assertEqual(stats.failed, 1)
+        (stored_shard,) = get_index_shards(SEARCH_TYPES.RECAP)
+        self.assertEqual(stored_shard.checkpoint, start_checkpoint)
+        self.assertFalse(stored_shard.done)
+
+    def test_checkpoint_after_parents_are_indexed(self):
+        """Is the last parent reported only once ES confirms its documents
+        were indexed, and never past a failed document?"""
+        parent_ids = sorted([self.de.docket.pk, self.de_1.docket.pk])
+
+        checkpoints = []
+        index_parent_and_child_docs_in_bulk(
+            parent_ids,
+            SEARCH_TYPES.RECAP,
+            testing_mode=True,
+            on_parent_indexed=checkpoints.append,
+        )
+        self.assertEqual(checkpoints, [parent_ids[-1]])
+
+        def fail_first_action(client, actions, **kwargs):
+            for i, action in enumerate(actions):
+                yield i > 0, {"index": {"_id": action["_id"]}}
+
+        checkpoints = []
+        with mock.patch(
+            "cl.search.tasks.streaming_bulk", side_effect=fail_first_action
+        ):
+            stats = index_parent_and_child_docs_in_bulk(
+                parent_ids,
+                SEARCH_TYPES.RECAP,
+                testing_mode=True,
+                on_parent_indexed=checkpoints.append,
+            )
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(checkpoints, [])
+
+    def test_bulk_indexing_generator_prepares_children_in_bulk(self):
+        """Confirm RECAPDocuments prepared in bulk match the ones prepared
+        one by one, without performing queries per child document."""
+
+        OpinionsCitedByRECAPDocument.objects.create(
+            citing_document=self.rd,
+            cited_opinion=OpinionWithParentsFactory.create(),
+            depth=1,
+        )
+        rds = RECAPDocument.objects.filter(
+            docket_entry__docket=self.de.docket
+        ).order_by("pk")
+        base_doc = {
+            "_op_type": "index",
+            "_index": DocketDocument._index._name,
+        }
+        # One query for the RECAPDocuments and their parents, and one to
+        # fetch their citations.
+        with self.assertNumQueries(2):
+            bulk_docs = list(
+                bulk_indexing_generator(
+                    rds,
+                    ESRECAPDocument,
+                    base_doc,
+                    child_id_property="RECAP",
+                    parent_id=self.de.docket.pk,
+                )
+            )
+
+        self.assertEqual(len(bulk_docs), 2)
+        for bulk_doc, rd in zip(bulk_docs, rds):
+            expected_doc = ESRECAPDocument().prepare(rd)
+            for field, value in expected_doc.items():
+                if field == "timestamp":
+                    continue
+                self.assertEqual(bulk_doc[field], value, msg=field)
+            self.assertEqual(bulk_doc["_id"], ES_CHILD_ID(rd.pk).RECAP)
+            self.assertEqual(bulk_doc["_routing"], str(self.de.docket.pk))
+
     def test_log_and_get_last_document_id(self):
         """Can we log and get the last docket indexed to/from redis?"""
 
@@ -3144,7 +3385,7 @@ class RECAPIndexingTest(
     def _test_main_es_query(self, cd, parent_expected, field_name):
         search_query = DocketDocument.search()
         (s, child_docs_count_query, *_) = build_es_main_query(search_query, cd)
-        hits, _, _, total_query_results, child_total = fetch_es_results(
+        hits, _, _, total_query_results, child_total, _ = fetch_es_results(
             cd,
             s,
             child_docs_count_query,
@@ -4112,6 +4353,7 @@ class RECAPIndexingTest(
                 False,
                 total_results,
                 1000,
+                (False, False),
             ),
         ):
             r = self.client.get(
@@ -4132,6 +4374,7 @@ class RECAPIndexingTest(
                 False,
                 total_results,
                 1000,
+                (False, False),
             ),
         ):
             r = self.client.get(
@@ -4152,6 +4395,7 @@ class RECAPIndexingTest(
                 False,
                 total_results,
                 1000,
+                (False, False),
             ),
         ):
             r = self.client.get(
@@ -4593,3 +4837,84 @@ class RECAPHistoryTablesIndexingTest(
         )
         if keys:
             self.r.delete(*keys)
+
+
+class ESUpdateBufferTest(ESIndexTestCase, TestCase):
+    """Tests for the ES update buffer flush."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rebuild_index("search.Docket")
+        court = CourtFactory(id="canb", jurisdiction="FB")
+        cls.docket = DocketFactory(
+            court=court, case_name="Lorem v. Ipsum", source=Docket.RECAP
+        )
+        cls.docket_2 = DocketFactory(
+            court=court, case_name="Dolor v. Amet", source=Docket.RECAP
+        )
+        call_command(
+            "cl_index_parent_and_child_docs",
+            search_type=SEARCH_TYPES.RECAP,
+            queue="celery",
+            pk_offset=0,
+            testing_mode=True,
+        )
+
+    def setUp(self) -> None:
+        self.r = make_redis_interface("CACHE")
+        self.r.delete(
+            ES_UPDATE_BUFFER_KEY,
+            f"{ES_UPDATE_BUFFER_KEY}:stats",
+            f"{ES_UPDATE_BUFFER_KEY}:scheduled",
+        )
+
+    @override_settings(ELASTICSEARCH_UPDATE_BUFFER_WINDOW=30)
+    def test_flush_es_update_buffer(self) -> None:
+        """Are buffered updates coalesced and applied to ES when the buffer
+        is flushed, and are updates to missing documents dropped?"""
+        DocketDocument.get(id=self.docket_2.pk).delete(refresh=True)
+        Docket.objects.filter(pk=self.docket.pk).update(
+            case_name="Lorem v. Ipsum Updated", docket_number="21-1234"
+        )
+        Docket.objects.filter(pk=self.docket_2.pk).update(
+            case_name="Dolor v. Amet Updated"
+        )
+
+        with mock.patch(
+            "cl.search.tasks.flush_es_update_buffer.apply_async"
+        ) as mock_schedule:
+            for fields in (["caseName"], ["docketNumber"], ["caseName"]):
+                buffer_es_document_update(
+                    "DocketDocument", fields, ("search.Docket", self.docket.pk)
+                )
+            buffer_es_document_update(
+                "DocketDocument",
+                ["caseName"],
+                ("search.Docket", self.docket_2.pk),
+            )
+        # The flush is scheduled only once.
+        self.assertEqual(mock_schedule.call_count, 1)
+        # Nothing was sent to ES yet.
+        doc = DocketDocument.get(id=self.docket.pk)
+        self.assertEqual(doc.caseName, "Lorem v. Ipsum")
+
+        flush_es_update_buffer()
+
+        doc = DocketDocument.get(id=self.docket.pk)
+        self.assertEqual(doc.caseName, "Lorem v. Ipsum Updated")
+        self.assertEqual(doc.docketNumber, "21-1234")
+        # Like update_es_document, the missing document isn't indexed.
+        self.assertFalse(DocketDocument.exists(id=self.docket_2.pk))
+
+        self.assertEqual(self.r.llen(ES_UPDATE_BUFFER_KEY), 0)
+        self.assertEqual(
+            get_es_update_buffer_stats(),
+            {
+                "buffered": 4,
+                "flushed": 4,
+                "documents_updated": 1,
+                "bulk_requests": 1,
+                "documents_missing": 1,
+                "children_updates": 0,
+            },
+        )
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from enum import StrEnum
 from typing import Any, Literal, Type, Union
 
@@ -106,3 +107,57 @@ class EventTable(StrEnum):
     DOCKET_ENTRY = "search.DocketEntry"
     RECAP_DOCUMENT = "search.RECAPDocument"
     UNDEFINED = ""
+
+
+@dataclass
+class BulkIndexingStats:
+    """Counters collected while indexing parent and child documents in
+    bulk."""
+
+    parents: int = 0
+    documents: int = 0
+    failed: int = 0
+    es_requests: int = 0
+    elapsed: float = 0.0
+
+    def merge(self, other: "BulkIndexingStats") -> None:
+        self.parents += other.parents
+        self.documents += other.documents
+        self.failed += other.failed
+        self.es_requests += other.es_requests
+        self.elapsed += other.elapsed
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def requests_per_parent(self) -> float:
+        return self.es_requests / self.parents if self.parents else 0.0
+
+
+@dataclass
+class IndexShard:
+    """A contiguous range of parent document PKs indexed by a single worker
+    at a time."""
+
+    shard_id: int
+    start: int
+    end: int
+    # The last parent PK processed in the shard.
+    checkpoint: int
+    done: bool = False
+    # The ID of the worker holding the shard lease, if any.
+    owner: str | None = None
+
+
+@dataclass
+class BufferedDocumentUpdate:
+    """The partial update of an ES document, coalesced from the updates
+    buffered for it."""
+
+    es_document_name: str
+    main_instance_data: tuple[str, int]
+    related_instance_data: tuple[str, int] | None
+    fields_map: dict | None
+    fields_to_update: set[str]
@@ -1,6 +1,6 @@
 import logging
 import traceback
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, timedelta
 from urllib.parse import quote
 
 import waffle
@@ -8,17 +8,14 @@ from asgiref.sync import async_to_sync
 from cache_memoize import cache_memoize
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
-from django.db.models import Count, Sum
 from django.http import HttpRequest, HttpResponse
 from django.http.request import QueryDict
 from django.shortcuts import HttpResponseRedirect, get_object_or_404, render
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils.timezone import make_aware
 from django.views.decorators.cache import never_cache
 from django_elasticsearch_dsl.search import Search
 from requests import RequestException, Session
@@ -27,7 +24,6 @@ from waffle.decorators import waffle_flag
 
 from cl.alerts.forms import CreateAlertForm
 from cl.alerts.models import Alert
-from cl.audio.models import Audio
 from cl.custom_filters.templatetags.text_filters import naturalduration
 from cl.lib.bot_detector import is_bot
 from cl.lib.elasticsearch_utils import (
@@ -43,7 +39,7 @@ from cl.lib.elasticsearch_utils import (
     set_results_highlights,
 )
 from cl.lib.paginators import ESPaginator
-from cl.lib.redis_utils import make_redis_interface
+from cl.lib.redis_utils import create_redis_semaphore
 from cl.lib.search_utils import (
     add_depth_counts,
     build_main_query,
@@ -73,8 +69,14 @@ from cl.search.exception import (
     UnbalancedQuotesQuery,
 )
 from cl.search.forms import SearchForm, _clean_form
-from cl.search.models import SEARCH_TYPES, Court, Opinion, OpinionCluster
-from cl.stats.models import Stat
+from cl.search.models import SEARCH_TYPES, Court, OpinionCluster
+from cl.stats.homepage import (
+    HOMEPAGE_STATS_KEY,
+    get_homepage_stats_age,
+    get_stored_homepage_stats,
+    update_homepage_stats,
+)
+from cl.stats.tasks import refresh_homepage_stats
 from cl.stats.utils import tally_stat
 from cl.visualizations.models import SCOTUSMap
 
@@ -269,54 +271,42 @@ def do_search(
 def get_homepage_stats():
     """Get any stats that are displayed on the homepage and return them as a
     dict
+
+    The stats are computed in the background and stored in Redis. They're
+    refreshed once they're older than HOMEPAGE_STATS_REFRESH_INTERVAL, and
+    they're only computed here if they're missing or older than
+    HOMEPAGE_STATS_MAX_AGE.
     """
-    r = make_redis_interface("STATS")
-    ten_days_ago = make_aware(
-        datetime.today() - timedelta(days=10), timezone.utc
-    )
-    last_ten_days = [
-        f"api:v3.d:{(date.today() - timedelta(days=x)).isoformat()}.count"
-        for x in range(0, 10)
-    ]
+    stats = get_stored_homepage_stats()
+    if stats is None or get_homepage_stats_age(stats) > timedelta(
+        seconds=settings.HOMEPAGE_STATS_MAX_AGE
+    ):
+        stats = update_homepage_stats()
+    elif get_homepage_stats_age(stats) > timedelta(
+        seconds=settings.HOMEPAGE_STATS_REFRESH_INTERVAL
+    ) and create_redis_semaphore(
+        "CACHE",
+        f"{HOMEPAGE_STATS_KEY}:scheduled",
+        ttl=settings.HOMEPAGE_STATS_MAX_AGE,
+    ):
+        refresh_homepage_stats.delay()
+
     homepage_data = {
-        "alerts_in_last_ten": Stat.objects.filter(
-            name__contains="alerts.sent", date_logged__gte=ten_days_ago
-        ).aggregate(Sum("count"))["count__sum"],
-        "queries_in_last_ten": Stat.objects.filter(
-            name="search.results", date_logged__gte=ten_days_ago
-        ).aggregate(Sum("count"))["count__sum"],
-        "opinions_in_last_ten": Opinion.objects.filter(
-            date_created__gte=ten_days_ago
-        ).count(),
-        "oral_arguments_in_last_ten": Audio.objects.filter(
-            date_created__gte=ten_days_ago
-        ).count(),
-        "api_in_last_ten": sum(
-            [
-                int(result)
-                for result in r.mget(*last_ten_days)
-                if result is not None
-            ]
-        ),
-        "users_in_last_ten": User.objects.filter(
-            date_joined__gte=ten_days_ago
-        ).count(),
-        "days_of_oa": naturalduration(
-            Audio.objects.aggregate(Sum("duration"))["duration__sum"],
-            as_dict=True,
-        )["d"],
-        "viz_in_last_ten": SCOTUSMap.objects.filter(
-            date_published__gte=ten_days_ago, published=True
-        ).count(),
+        "alerts_in_last_ten": stats["alerts_in_last_ten"],
+        "queries_in_last_ten": stats["queries_in_last_ten"],
+        "opinions_in_last_ten": stats["opinions_in_last_ten"],
+        "oral_arguments_in_last_ten": stats["oral_arguments_in_last_ten"],
+        "api_in_last_ten": stats["api_in_last_ten"],
+        "users_in_last_ten": stats["users_in_last_ten"],
+        "days_of_oa": naturalduration(stats["audio_duration"], as_dict=True)[
+            "d"
+        ],
+        "viz_in_last_ten": stats["viz_in_last_ten"],
+        # The stats can be an hour old, make sure the visualization wasn't
+        # unpublished or deleted since.
         "visualizations": SCOTUSMap.objects.filter(
-            published=True, deleted=False
-        )
-        .annotate(Count("clusters"))
-        .filter(
-            # Ensures that we only show good stuff on homepage
-            clusters__count__gt=10,
-        )
-        .order_by("-date_published", "-date_modified", "-date_created")[:1],
+            pk__in=stats["visualization_ids"], published=True, deleted=False
+        ),
         "private": False,  # VERY IMPORTANT!
     }
     return homepage_data
@@ -694,6 +684,7 @@ def do_es_search(
     error_message = ""
     suggested_query = ""
     total_child_results = 0
+    approximate_totals = (False, False)
     related_cluster = None
     cited_cluster = None
     query_citation = None
@@ -732,6 +723,7 @@ def do_es_search(
                 error,
                 total_query_results,
                 total_child_results,
+                approximate_totals,
             ) = fetch_and_paginate_results(
                 get_params,
                 s,
@@ -796,6 +788,7 @@ def do_es_search(
         total_query_results,
         top_hits_limit,
         total_child_results,
+        *approximate_totals,
     ]
 
     return {
@@ -823,7 +816,7 @@ def fetch_and_paginate_results(
     child_docs_count_query: Search | None,
     rows_per_page: int = settings.SEARCH_PAGE_SIZE,
     cache_key: str = None,
-) -> tuple[Page | list, int, bool, int | None, int | None]:
+) -> tuple[Page | list, int, bool, int | None, int | None, tuple[bool, bool]]:
     """Fetch and paginate elasticsearch results.
 
     :param get_params: The user get params.
@@ -832,16 +825,17 @@ def fetch_and_paginate_results(
     child documents if required, otherwise None.
     :param rows_per_page: Number of records wanted per page
     :param cache_key: The cache key to use.
-    :return: A five-tuple: the paginated results, the ES query time, whether
-    there was an error, the total number of hits for the main document, and
-    the total number of hits for the child document.
+    :return: A six-tuple: the paginated results, the ES query time, whether
+    there was an error, the total number of hits for the main document, the
+    total number of hits for the child document, and whether each total is a
+    lower bound.
     """
 
     # Run the query and set up pagination
     if cache_key is not None:
         results = cache.get(cache_key)
         if results is not None:
-            return results, 0, False, None, None
+            return results, 0, False, None, None, (False, False)
 
     try:
         page = int(get_params.get("page", 1))
@@ -852,12 +846,26 @@ def fetch_and_paginate_results(
     check_pagination_depth(page)
 
     # Fetch results from ES
-    hits, query_time, error, main_total, child_total = fetch_es_results(
+    (
+        hits,
+        query_time,
+        error,
+        main_total,
+        child_total,
+        approximate_totals,
+    ) = fetch_es_results(
         get_params, search_query, child_docs_count_query, page, rows_per_page
     )
 
     if error:
-        return [], query_time, error, main_total, child_total
+        return (
+            [],
+            query_time,
+            error,
+            main_total,
+            child_total,
+            approximate_totals,
+        )
     paginator = ESPaginator(main_total, hits, rows_per_page)
     try:
         results = paginator.page(page)
@@ -876,4 +884,11 @@ def fetch_and_paginate_results(
 
     if cache_key is not None:
         cache.set(cache_key, results, settings.QUERY_RESULTS_CACHE)
-    return results, query_time, error, main_total, child_total
+    return (
+        results,
+        query_time,
+        error,
+        main_total,
+        child_total,
+        approximate_totals,
+    )
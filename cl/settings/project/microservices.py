@@ -4,6 +4,11 @@ env = environ.FileAwareEnv()
 
 DISCLOSURE_HOST = env("DISCLOSURE_HOST", default="http://cl-disclosures:5050")
 DOCTOR_HOST = env("DOCTOR_HOST", default="http://cl-doctor:5050")
+# The maximum number of concurrent requests a process makes to a service,
+# unless the service sets its own max_concurrency.
+MICROSERVICE_MAX_CONCURRENCY = env.int(
+    "MICROSERVICE_MAX_CONCURRENCY", default=8
+)
 
 MICROSERVICE_URLS = {
     # DOCTOR Endpoints
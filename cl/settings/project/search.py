@@ -7,6 +7,7 @@ env = environ.FileAwareEnv()
 SOLR_HOST = env("SOLR_HOST", default="http://cl-solr:8983")
 SOLR_RECAP_HOST = env("SOLR_RECAP_HOST", default="http://cl-solr:8983")
 SOLR_PAGERANK_DEST_DIR = env("SOLR_PAGERANK_DEST_DIR", default="/tmp/")
+CITATION_GRAPH_DIR = env("CITATION_GRAPH_DIR", default="/tmp/citation_graph/")
 
 ########
 # Solr #
@@ -62,6 +63,26 @@ RELATED_MLT_MAXWL = 0
 RELATED_FILTER_BY_STATUS = "Precedential"
 QUERY_RESULTS_CACHE = 60 * 60 * 6
 
+##################
+# Homepage stats #
+##################
+# The homepage stats are refreshed in the background when they're older than
+# the refresh interval, and computed while loading the homepage only when
+# they're older than the max age, in seconds.
+HOMEPAGE_STATS_REFRESH_INTERVAL = env.int(
+    "HOMEPAGE_STATS_REFRESH_INTERVAL", default=60 * 5
+)
+HOMEPAGE_STATS_MAX_AGE = env.int("HOMEPAGE_STATS_MAX_AGE", default=60 * 60)
+
+##################
+# Visualizations #
+##################
+# How often, in seconds, the in-memory SCOTUS citation index used to build
+# visualizations is checked for new citations.
+SCOTUS_CITATION_INDEX_TTL = env.int(
+    "SCOTUS_CITATION_INDEX_TTL", default=60 * 60
+)
+
 #####################
 # Search pagination #
 #####################
@@ -16,6 +16,15 @@ ALLOWED_HOSTS: list[str] = env(
 EGRESS_PROXY_HOST = env(
     "EGRESS_PROXY_HOST", default="http://cl-webhook-sentry:9090"
 )
+# Send batches of webhook events concurrently, with a pool of connections
+# per host and a cap on the concurrent requests to each webhook.
+WEBHOOK_ASYNC_DELIVERY = env.bool("WEBHOOK_ASYNC_DELIVERY", default=False)
+WEBHOOK_MAX_CONNECTIONS_PER_HOST = env.int(
+    "WEBHOOK_MAX_CONNECTIONS_PER_HOST", default=10
+)
+WEBHOOK_MAX_CONCURRENCY_PER_WEBHOOK = env.int(
+    "WEBHOOK_MAX_CONCURRENCY_PER_WEBHOOK", default=4
+)
 
 SECURE_HSTS_SECONDS = 63_072_000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
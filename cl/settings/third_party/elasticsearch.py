@@ -213,6 +213,44 @@ ELASTICSEARCH_DSL_AUTO_REFRESH = env(
 #############################################################
 ELASTICSEARCH_PAGINATION_BATCH_SIZE = 100
 
+##################################################################
+# Percolator batching. When the window is greater than 0, newly  #
+# indexed documents are buffered for that many seconds and then #
+# percolated together, up to the batch size per request.         #
+##################################################################
+ELASTICSEARCH_PERCOLATOR_BATCH_WINDOW = env.int(
+    "ELASTICSEARCH_PERCOLATOR_BATCH_WINDOW", default=0
+)
+ELASTICSEARCH_PERCOLATOR_BATCH_SIZE = env.int(
+    "ELASTICSEARCH_PERCOLATOR_BATCH_SIZE", default=50
+)
+
+##################################################################
+# Search totals. When the timeout is greater than 0, the totals of #
+# a search are cached for that many seconds, so paginating it      #
+# doesn't run the count queries again. When the threshold is       #
+# greater than 0, hits are only counted up to it and the totals    #
+# are shown as "threshold+".                                       #
+##################################################################
+ELASTICSEARCH_COUNT_CACHE_TIMEOUT = env.int(
+    "ELASTICSEARCH_COUNT_CACHE_TIMEOUT", default=0
+)
+ELASTICSEARCH_APPROXIMATE_COUNT_THRESHOLD = env.int(
+    "ELASTICSEARCH_APPROXIMATE_COUNT_THRESHOLD", default=0
+)
+
+##################################################################
+# ES update buffering. When the window is greater than 0, partial #
+# document updates are buffered for that many seconds, merged by  #
+# target document and sent in bulk, up to the batch size each.    #
+##################################################################
+ELASTICSEARCH_UPDATE_BUFFER_WINDOW = env.int(
+    "ELASTICSEARCH_UPDATE_BUFFER_WINDOW", default=0
+)
+ELASTICSEARCH_UPDATE_BUFFER_BATCH_SIZE = env.int(
+    "ELASTICSEARCH_UPDATE_BUFFER_BATCH_SIZE", default=500
+)
+
 ###################################################
 # The maximum number of scheduled hits per alert. #
 ###################################################
@@ -102,3 +102,16 @@ REST_FRAMEWORK = {
 
 if DEVELOPMENT:
     REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]["anon"] = "10000/day"  # type: ignore
+
+# API usage stats are aggregated in each process and written to Redis every
+# API_USAGE_FLUSH_REQUESTS requests or API_USAGE_FLUSH_INTERVAL milliseconds,
+# whichever comes first.
+API_USAGE_FLUSH_REQUESTS = env.int("API_USAGE_FLUSH_REQUESTS", default=1)
+API_USAGE_FLUSH_INTERVAL = env.int("API_USAGE_FLUSH_INTERVAL", default=1000)
+
+# List endpoints don't count querysets the planner estimates at or above this
+# number of rows, and report the estimate instead, unless count=exact is
+# requested. 0 always counts them.
+API_COUNT_ESTIMATE_THRESHOLD = env.int(
+    "API_COUNT_ESTIMATE_THRESHOLD", default=0
+)
@@ -0,0 +1,131 @@
+import json
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db.models import Count, Sum
+from django.utils.timezone import now
+
+from cl.audio.models import Audio
+from cl.lib.redis_utils import make_redis_interface
+from cl.search.models import Opinion
+from cl.stats.models import Stat
+from cl.visualizations.models import SCOTUSMap
+
+HOMEPAGE_STATS_KEY = "homepage-stats"
+# The total duration of the oral arguments is shown in days, so it's
+# recomputed only once a day.
+AUDIO_DURATION_REFRESH = timedelta(days=1)
+
+
+def compute_homepage_stats(
+    previous_stats: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Compute the stats displayed on the homepage.
+
+    All the queries are bounded to the last ten days, except the total
+    duration of the oral arguments, which is reused from the previous stats
+    if it was computed less than a day ago.
+
+    :param previous_stats: The last stats computed, if any.
+    :return: A dict with the stats and the time they were computed.
+    """
+    date_computed = now()
+    ten_days_ago = date_computed - timedelta(days=10)
+    r = make_redis_interface("STATS")
+    last_ten_days = [
+        f"api:v3.d:{(date.today() - timedelta(days=x)).isoformat()}.count"
+        for x in range(0, 10)
+    ]
+
+    if (
+        previous_stats
+        and date_computed
+        - datetime.fromisoformat(
+            previous_stats["date_audio_duration_computed"]
+        )
+        < AUDIO_DURATION_REFRESH
+    ):
+        audio_duration = previous_stats["audio_duration"]
+        date_audio_duration_computed = previous_stats[
+            "date_audio_duration_computed"
+        ]
+    else:
+        audio_duration = Audio.objects.aggregate(Sum("duration"))[
+            "duration__sum"
+        ]
+        date_audio_duration_computed = date_computed.isoformat()
+
+    return {
+        "alerts_in_last_ten": Stat.objects.filter(
+            name__contains="alerts.sent", date_logged__gte=ten_days_ago
+        ).aggregate(Sum("count"))["count__sum"],
+        "queries_in_last_ten": Stat.objects.filter(
+            name="search.results", date_logged__gte=ten_days_ago
+        ).aggregate(Sum("count"))["count__sum"],
+        "opinions_in_last_ten": Opinion.objects.filter(
+            date_created__gte=ten_days_ago
+        ).count(),
+        "oral_arguments_in_last_ten": Audio.objects.filter(
+            date_created__gte=ten_days_ago
+        ).count(),
+        "api_in_last_ten": sum(
+            [
+                int(result)
+                for result in r.mget(*last_ten_days)
+                if result is not None
+            ]
+        ),
+        "users_in_last_ten": User.objects.filter(
+            date_joined__gte=ten_days_ago
+        ).count(),
+        "audio_duration": audio_duration,
+        "date_audio_duration_computed": date_audio_duration_computed,
+        "viz_in_last_ten": SCOTUSMap.objects.filter(
+            date_published__gte=ten_days_ago, published=True
+        ).count(),
+        "visualization_ids": list(
+            SCOTUSMap.objects.filter(published=True, deleted=False)
+            .annotate(Count("clusters"))
+            .filter(
+                # Ensures that we only show good stuff on homepage
+                clusters__count__gt=10,
+            )
+            .order_by("-date_published", "-date_modified", "-date_created")
+            .values_list("pk", flat=True)[:1]
+        ),
+        "date_computed": date_computed.isoformat(),
+    }
+
+
+def get_stored_homepage_stats() -> dict[str, Any] | None:
+    """Get the last homepage stats stored in Redis.
+
+    :return: A dict with the stats, or None if they haven't been computed.
+    """
+    r = make_redis_interface("STATS")
+    stats = r.get(HOMEPAGE_STATS_KEY)
+    if stats is None:
+        return None
+    return json.loads(stats)
+
+
+def update_homepage_stats() -> dict[str, Any]:
+    """Compute the homepage stats and store them in Redis, where the homepage
+    reads them from.
+
+    :return: A dict with the stats computed.
+    """
+    stats = compute_homepage_stats(get_stored_homepage_stats())
+    r = make_redis_interface("STATS")
+    r.set(HOMEPAGE_STATS_KEY, json.dumps(stats))
+    return stats
+
+
+def get_homepage_stats_age(stats: dict[str, Any]) -> timedelta:
+    """Get how long ago some homepage stats were computed.
+
+    :param stats: A dict with the homepage stats.
+    :return: The age of the stats.
+    """
+    return now() - datetime.fromisoformat(stats["date_computed"])
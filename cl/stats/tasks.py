@@ -0,0 +1,15 @@
+from cl.celery_init import app
+from cl.lib.redis_utils import delete_redis_semaphore
+from cl.stats.homepage import HOMEPAGE_STATS_KEY, update_homepage_stats
+
+
+@app.task(ignore_result=True)
+def refresh_homepage_stats() -> None:
+    """Recompute the homepage stats in the background.
+
+    :return: None
+    """
+    try:
+        update_homepage_stats()
+    finally:
+        delete_redis_semaphore("CACHE", f"{HOMEPAGE_STATS_KEY}:scheduled")
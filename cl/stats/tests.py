@@ -1,6 +1,16 @@
+from datetime import timedelta
+
 import pytest
+import time_machine
 from asgiref.sync import async_to_sync
+from django.utils.timezone import now
 
+from cl.lib.redis_utils import make_redis_interface
+from cl.stats.homepage import (
+    HOMEPAGE_STATS_KEY,
+    get_stored_homepage_stats,
+    update_homepage_stats,
+)
 from cl.stats.models import Stat
 from cl.stats.utils import get_milestone_range, tally_stat
 from cl.tests.cases import TestCase
@@ -36,3 +46,32 @@ class StatTests(TestCase):
         self.assertEqual(count, 2)
         count = async_to_sync(tally_stat)("test3", inc=2)
         self.assertEqual(count, 4)
+
+
+class HomepageStatsTests(TestCase):
+    def setUp(self) -> None:
+        make_redis_interface("STATS").delete(HOMEPAGE_STATS_KEY)
+
+    def tearDown(self) -> None:
+        make_redis_interface("STATS").delete(HOMEPAGE_STATS_KEY)
+
+    def test_update_homepage_stats(self) -> None:
+        """Are the homepage stats stored, and is the total duration of the
+        oral arguments reused until it's a day old?
+        """
+        self.assertIsNone(get_stored_homepage_stats())
+        async_to_sync(tally_stat)("search.results", inc=3)
+        stats = update_homepage_stats()
+        self.assertEqual(stats["queries_in_last_ten"], 3)
+        self.assertEqual(get_stored_homepage_stats(), stats)
+
+        with self.assertNumQueries(7):
+            new_stats = update_homepage_stats()
+        self.assertEqual(
+            new_stats["date_audio_duration_computed"],
+            stats["date_audio_duration_computed"],
+        )
+
+        with time_machine.travel(now() + timedelta(days=2), tick=False):
+            with self.assertNumQueries(8):
+                update_homepage_stats()
@@ -1,6 +1,7 @@
 import json
 
 import networkx
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 from django.db import models
 from django.urls import reverse
@@ -12,6 +13,7 @@ from cl.lib.string_utils import trunc
 from cl.search.models import OpinionCluster
 from cl.visualizations.exceptions import TooManyNodes
 from cl.visualizations.network_utils import (
+    get_scotus_citation_index,
     graphs_intersect,
     set_shortest_path_to_end,
     within_max_hops,
@@ -118,7 +120,8 @@ class SCOTUSMap(AbstractDateTimeModel):
         hops_taken=0,
         max_nodes=70,
     ):
-        """Recursively build a networkx graph
+        """Build a networkx graph by recursively traversing the in-memory
+        SCOTUS citation index, see find_authority_paths.
 
         Process is:
          - Work backwards through the authorities for self.cluster_end and all
@@ -182,92 +185,130 @@ class SCOTUSMap(AbstractDateTimeModel):
         :param max_hops: The maximum degree of separation for the network.
         :param max_nodes: The maximum number of nodes a network can contain.
         """
-        g = networkx.DiGraph()
         if len(good_nodes) == 0:
             # Add the beginning and end.
             good_nodes = {
                 self.cluster_start_id: {"shortest_path": 0},
             }
 
+        citation_index = await sync_to_async(get_scotus_citation_index)()
+        edges = self.find_authority_paths(
+            citation_index,
+            parent_id=parent_authority.pk,
+            start_date=self.cluster_start.date_filed,
+            visited_nodes=visited_nodes,
+            good_nodes=good_nodes,
+            max_hops=max_hops,
+            hops_taken=hops_taken,
+            max_nodes=max_nodes,
+        )
+        g = networkx.DiGraph()
+        g.add_edges_from(edges)
+        return g
+
+    def find_authority_paths(
+        self,
+        citation_index,
+        parent_id,
+        start_date,
+        visited_nodes,
+        good_nodes,
+        max_hops,
+        hops_taken,
+        max_nodes,
+    ):
+        """Recursively find the citations between parent_id and the start
+        cluster, following the algorithm described in build_nx_digraph.
+
+        This runs entirely over the in-memory SCOTUS citation index.
+
+        :param citation_index: The SCOTUSCitationIndex to traverse.
+        :param parent_id: The cluster ID to start the recursion from.
+        :param start_date: The date_filed of self.cluster_start.
+        :param visited_nodes: A dict of nodes that have already been visited.
+        :param good_nodes: A dict of nodes that have been identified as good.
+        :param max_hops: The maximum degree of separation for the network.
+        :param hops_taken: The number of hops taken so far, from
+        self.cluster_end
+        :param max_nodes: The maximum number of nodes a network can contain.
+        :return: A set of (citing_id, cited_id) edges.
+        """
+        edges = set()
+        nodes = set()
         is_already_handled_with_shorter_path = (
-            parent_authority.pk in visited_nodes
-            and visited_nodes[parent_authority.pk]["hops_taken"] < hops_taken
+            parent_id in visited_nodes
+            and visited_nodes[parent_id]["hops_taken"] < hops_taken
         )
         has_no_more_hops_remaining = hops_taken == max_hops
-        blocking_conditions = [
-            is_already_handled_with_shorter_path,
-            has_no_more_hops_remaining,
-        ]
-        if not any(blocking_conditions):
-            visited_nodes[parent_authority.pk] = {"hops_taken": hops_taken}
-            hops_taken += 1
-            authorities = await parent_authority.aauthorities()
-            async for child_authority in authorities.filter(
-                docket__court="scotus",
-                date_filed__gte=self.cluster_start.date_filed,
-            ).order_by("date_filed"):
-                # Combine our present graph with the result of the next
-                # recursion
-                sub_graph = networkx.DiGraph()
-                if child_authority == self.cluster_start:
-                    # Parent links to the starting point. Add an edge. No need
-                    # to check distance here because we're already at the start
-                    # node.
-                    g.add_edge(parent_authority.pk, child_authority.pk)
-                    _ = set_shortest_path_to_end(
-                        good_nodes,
-                        node_id=parent_authority.pk,
-                        target_id=child_authority.pk,
+        if is_already_handled_with_shorter_path or has_no_more_hops_remaining:
+            return edges
+
+        visited_nodes[parent_id] = {"hops_taken": hops_taken}
+        hops_taken += 1
+        for child_id in citation_index.authorities_filed_after(
+            parent_id, start_date
+        ):
+            # Combine our present graph with the result of the next recursion
+            sub_edges = set()
+            if child_id == self.cluster_start_id:
+                # Parent links to the starting point. Add an edge. No need to
+                # check distance here because we're already at the start node.
+                edges.add((parent_id, child_id))
+                nodes.update((parent_id, child_id))
+                _ = set_shortest_path_to_end(
+                    good_nodes, node_id=parent_id, target_id=child_id
+                )
+            elif child_id in good_nodes:
+                # Parent links to a node already in the network. Check if we
+                # could make it to the end in max_dod hops. Set shortest_path
+                # for the child.
+                if within_max_hops(good_nodes, child_id, hops_taken, max_hops):
+                    edges.add((parent_id, child_id))
+                    nodes.update((parent_id, child_id))
+                    is_shorter = set_shortest_path_to_end(
+                        good_nodes, node_id=parent_id, target_id=child_id
                     )
-                elif child_authority.pk in good_nodes:
-                    # Parent links to a node already in the network. Check if
-                    # we could make it to the end in max_dod hops. Set
-                    # shortest_path for the child_authority
-                    if within_max_hops(
-                        good_nodes, child_authority.pk, hops_taken, max_hops
-                    ):
-                        g.add_edge(parent_authority.pk, child_authority.pk)
-                        is_shorter = set_shortest_path_to_end(
-                            good_nodes,
-                            node_id=parent_authority.pk,
-                            target_id=child_authority.pk,
+                    if is_shorter:
+                        # New route to a node that's shorter than the old
+                        # route. Thus, we must re-recurse its children.
+                        sub_edges = self.find_authority_paths(
+                            citation_index,
+                            parent_id=child_id,
+                            start_date=start_date,
+                            visited_nodes=visited_nodes,
+                            good_nodes=good_nodes,
+                            max_hops=max_hops,
+                            hops_taken=hops_taken,
+                            max_nodes=max_nodes,
                         )
-                        if is_shorter:
-                            # New route to a node that's shorter than the old
-                            # route. Thus, we must re-recurse its children.
-                            sub_graph = await self.build_nx_digraph(
-                                parent_authority=child_authority,
-                                visited_nodes=visited_nodes,
-                                good_nodes=good_nodes,
-                                max_hops=max_hops,
-                                hops_taken=hops_taken,
-                                max_nodes=max_nodes,
-                            )
-                else:
-                    # No easy shortcuts. Recurse.
-                    sub_graph = await self.build_nx_digraph(
-                        parent_authority=child_authority,
-                        visited_nodes=visited_nodes,
-                        good_nodes=good_nodes,
-                        max_hops=max_hops,
-                        hops_taken=hops_taken,
-                        max_nodes=max_nodes,
-                    )
-
-                if graphs_intersect(good_nodes, g, sub_graph):
-                    # The graphs intersect. Merge them.
-                    g.add_edge(parent_authority.pk, child_authority.pk)
-                    _ = set_shortest_path_to_end(
-                        good_nodes,
-                        node_id=parent_authority.pk,
-                        target_id=child_authority.pk,
-                    )
-                    g = networkx.compose(g, sub_graph)
-
-                if len(g) > max_nodes:
-                    raise TooManyNodes()
-
-        return g
+            else:
+                # No easy shortcuts. Recurse.
+                sub_edges = self.find_authority_paths(
+                    citation_index,
+                    parent_id=child_id,
+                    start_date=start_date,
+                    visited_nodes=visited_nodes,
+                    good_nodes=good_nodes,
+                    max_hops=max_hops,
+                    hops_taken=hops_taken,
+                    max_nodes=max_nodes,
+                )
+
+            sub_nodes = {node for edge in sub_edges for node in edge}
+            if graphs_intersect(good_nodes, nodes, sub_nodes):
+                # The graphs intersect. Merge them.
+                edges.add((parent_id, child_id))
+                nodes.update((parent_id, child_id))
+                _ = set_shortest_path_to_end(
+                    good_nodes, node_id=parent_id, target_id=child_id
+                )
+                edges |= sub_edges
+                nodes |= sub_nodes
+
+            if len(nodes) > max_nodes:
+                raise TooManyNodes()
+
+        return edges
 
     async def add_clusters(self, g):
         """Add clusters to the model using an existing nx graph."""
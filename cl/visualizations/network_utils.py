@@ -1,3 +1,107 @@
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Max
+
+from cl.search.models import OpinionsCited
+
+
+@dataclass
+class SCOTUSCitationIndex:
+    """An in-memory index of the citations between SCOTUS clusters.
+
+    authorities maps the ID of a citing cluster to the clusters it cites, as
+    a list of (date_filed, cluster_id) tuples sorted by date_filed.
+    """
+
+    authorities: dict[int, list[tuple[date, int]]] = field(
+        default_factory=dict
+    )
+    last_citation_id: int = 0
+    loaded_at: float = 0.0
+
+    def authorities_filed_after(
+        self, cluster_id: int, date_filed: date
+    ) -> list[int]:
+        """Get the clusters cited by a cluster that were filed on or after a
+        date, sorted by date_filed.
+
+        :param cluster_id: The citing cluster ID.
+        :param date_filed: The earliest date_filed of the cited clusters.
+        :return: A list of cited cluster IDs.
+        """
+        authorities = self.authorities.get(cluster_id, [])
+        first = bisect_left(authorities, (date_filed,))
+        return [cited_id for _, cited_id in authorities[first:]]
+
+
+_scotus_citation_index = SCOTUSCitationIndex()
+
+
+def add_scotus_citations(
+    index: SCOTUSCitationIndex, last_citation_id: int
+) -> None:
+    """Add the citations between SCOTUS clusters created after the last
+    citation in the index, in a single query.
+
+    Only the OpinionsCited rows after the last one in the index are read, so
+    refreshing the index doesn't scan the whole table again, the way the
+    citation graph is updated. Deleted citations are only dropped when the
+    index is loaded from scratch.
+
+    :param index: The SCOTUSCitationIndex to update.
+    :param last_citation_id: The ID of the last OpinionsCited row to add.
+    :return: None
+    """
+    citations = OpinionsCited.objects.filter(
+        pk__gt=index.last_citation_id,
+        pk__lte=last_citation_id,
+        citing_opinion__cluster__docket__court_id="scotus",
+        cited_opinion__cluster__docket__court_id="scotus",
+    ).values_list(
+        "citing_opinion__cluster_id",
+        "cited_opinion__cluster__date_filed",
+        "cited_opinion__cluster_id",
+    )
+    for citing_id, date_filed, cited_id in citations.iterator():
+        authorities = index.authorities.setdefault(citing_id, [])
+        # Clusters with many opinions cite the same cluster more than once.
+        authority = (date_filed, cited_id)
+        position = bisect_left(authorities, authority)
+        if authorities[position : position + 1] != [authority]:
+            authorities.insert(position, authority)
+    index.last_citation_id = last_citation_id
+
+
+def get_scotus_citation_index() -> SCOTUSCitationIndex:
+    """Get the SCOTUS citation index of this process.
+
+    The index is loaded on first use. After SCOTUS_CITATION_INDEX_TTL seconds
+    the citations created since are added to it.
+
+    :return: The SCOTUSCitationIndex.
+    """
+    global _scotus_citation_index
+    index = _scotus_citation_index
+    age = time.monotonic() - index.loaded_at
+    if index.loaded_at and age < settings.SCOTUS_CITATION_INDEX_TTL:
+        return index
+
+    max_citation_id = (
+        OpinionsCited.objects.aggregate(max_id=Max("pk"))["max_id"] or 0
+    )
+    if index.last_citation_id > max_citation_id:
+        # The latest citations were deleted. Start over.
+        index = _scotus_citation_index = SCOTUSCitationIndex()
+    if index.last_citation_id < max_citation_id:
+        add_scotus_citations(index, max_citation_id)
+    index.loaded_at = time.monotonic()
+    return index
+
+
 def new_title_for_viz(referer):
     """Check if a visualization already has a referer with a given title."""
     from cl.visualizations.models import Referer
@@ -31,14 +135,14 @@ def within_max_hops(good_nodes, child_authority_id, hops_taken, max_hops):
     return True
 
 
-def graphs_intersect(good_nodes, main_graph, sub_graph):
+def graphs_intersect(good_nodes, main_nodes, sub_nodes):
     """Test if two graphs have common nodes.
 
     First check if it's in the main graph, then check if it's in good_nodes,
     indicating a second path to the start node.
     """
-    return any((node in main_graph) for node in sub_graph.nodes()) or any(
-        (node in good_nodes) for node in sub_graph.nodes()
+    return any((node in main_nodes) for node in sub_nodes) or any(
+        (node in good_nodes) for node in sub_nodes
     )
 
 
@@ -4,11 +4,11 @@ Unit tests for Visualizations
 
 from typing import Any, Callable, Dict
 
-from asgiref.sync import sync_to_async
+from asgiref.sync import async_to_sync, sync_to_async
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Permission, User
 from django.core.handlers.asgi import ASGIRequest
-from django.test import AsyncRequestFactory
+from django.test import AsyncRequestFactory, override_settings
 from django.urls import reverse
 from httplib2 import Response
 from rest_framework.status import (
@@ -19,7 +19,7 @@ from rest_framework.status import (
     HTTP_404_NOT_FOUND,
 )
 
-from cl.search.models import OpinionCluster
+from cl.search.models import OpinionCluster, OpinionsCited
 from cl.tests.cases import APITestCase, TestCase
 from cl.tests.utils import make_client
 from cl.users.factories import (
@@ -30,7 +30,10 @@ from cl.visualizations import views
 from cl.visualizations.factories import VisualizationFactory
 from cl.visualizations.forms import VizForm
 from cl.visualizations.models import JSONVersion, SCOTUSMap
-from cl.visualizations.network_utils import reverse_endpoints_if_needed
+from cl.visualizations.network_utils import (
+    get_scotus_citation_index,
+    reverse_endpoints_if_needed,
+)
 
 
 class TestVizUtils(TestCase):
@@ -103,6 +106,65 @@ class TestVizModels(TestCase):
         g = await viz.build_nx_digraph(**build_kwargs)
         self.assertTrue(len(g.edges()) > 0)
 
+    @override_settings(SCOTUS_CITATION_INDEX_TTL=0)
+    def test_SCOTUSMap_builds_nx_digraph_in_memory(self) -> None:
+        """Does build_nx_digraph traverse the citation index without querying
+        the DB for every node?
+        """
+        start = OpinionCluster.objects.get(case_name="Marsh v. Chambers")
+        end = OpinionCluster.objects.get(
+            case_name="Town of Greece v. Galloway"
+        )
+        viz = VisualizationFactory.create(
+            cluster_start=start,
+            cluster_end=end,
+            title="Test SCOTUSMap",
+            notes="Test Notes",
+        )
+        build_nx_digraph = async_to_sync(viz.build_nx_digraph)
+        g = build_nx_digraph(
+            parent_authority=end, visited_nodes={}, good_nodes={}, max_hops=3
+        )
+        self.assertTrue(len(g.edges()) > 0)
+
+        # Only the citation index freshness check is run.
+        with self.assertNumQueries(1):
+            g_again = build_nx_digraph(
+                parent_authority=end,
+                visited_nodes={},
+                good_nodes={},
+                max_hops=3,
+            )
+        self.assertEqual(set(g.edges()), set(g_again.edges()))
+
+    @override_settings(SCOTUS_CITATION_INDEX_TTL=0)
+    def test_scotus_citation_index_adds_new_citations(self) -> None:
+        """Are the citations created since the index was loaded added to it,
+        without loading it from scratch?
+        """
+        marsh = OpinionCluster.objects.get(case_name="Marsh v. Chambers")
+        greece = OpinionCluster.objects.get(
+            case_name="Town of Greece v. Galloway"
+        )
+        index = get_scotus_citation_index()
+        self.assertNotIn(
+            greece.pk,
+            index.authorities_filed_after(marsh.pk, greece.date_filed),
+        )
+
+        OpinionsCited.objects.create(
+            citing_opinion=marsh.sub_opinions.first(),
+            cited_opinion=greece.sub_opinions.first(),
+        )
+        # The freshness check and the new citations.
+        with self.assertNumQueries(2):
+            new_index = get_scotus_citation_index()
+        self.assertIs(new_index, index)
+        self.assertIn(
+            greece.pk,
+            index.authorities_filed_after(marsh.pk, greece.date_filed),
+        )
+
     def test_SCOTUSMap_deletes_cascade(self) -> None:
         """
         Make sure we delete JSONVersion instances when deleted SCOTUSMaps